@@ -0,0 +1,175 @@
+"""
+Gerenciador unificado de recursos gráficos
+Responsabilidade: Manter em um único cache LRU (limitado por orçamento de memória) todas as
+surfaces do jogo — backgrounds, sprites, botões e painéis da interface — com fixação dos
+recursos em tela e estatísticas de uso
+"""
+
+import time
+import pygame
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+
+class AssetManager:
+    """
+    Cache LRU de surfaces compartilhado pelos gerenciadores.
+    As chaves são tuplas cujo primeiro elemento é o tipo do recurso ('background', 'sprite', 'button', ...).
+    """
+
+    def __init__(self, budget_bytes: int = 128 * 1024 * 1024):
+        """
+        Inicializa o gerenciador
+
+        Args:
+            budget_bytes: Memória máxima (em bytes de pixels) ocupada pelos recursos em cache
+        """
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()  # chave -> (valor, bytes)
+        self._pins: Dict[str, frozenset] = {}  # grupo -> chaves fixadas
+        self._pinned = frozenset()  # União das chaves de todos os grupos
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.decode_time = 0.0  # Segundos gastos carregando/escalando recursos
+
+    @staticmethod
+    def surface_bytes(value: Any) -> int:
+        """
+        Calcula quantos bytes de pixels um valor em cache ocupa
+
+        Args:
+            value: Surface ou tupla contendo surfaces (ex: (surface, posição))
+
+        Returns:
+            Tamanho em bytes
+        """
+        if isinstance(value, pygame.Surface):
+            return value.get_pitch() * value.get_height()
+        if isinstance(value, tuple):
+            return sum(AssetManager.surface_bytes(item) for item in value)
+        return 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retorna o recurso em cache (ou None), marcando-o como usado recentemente"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, decode_time: float = 0.0):
+        """
+        Guarda um recurso, descartando os menos usados (e não fixados) se o orçamento for excedido
+
+        Args:
+            key: Chave do recurso
+            value: Surface ou tupla contendo surfaces
+            decode_time: Tempo (s) gasto para produzir o recurso, somado às estatísticas
+        """
+        if key in self._entries:
+            self.used_bytes -= self._entries.pop(key)[1]
+        size = self.surface_bytes(value)
+        self._entries[key] = (value, size)
+        self.used_bytes += size
+        self.decode_time += decode_time
+        self._evict(keep=key)
+
+    def load(self, key: Hashable, loader: Callable[[], Any]) -> Optional[Any]:
+        """
+        Retorna o recurso em cache ou o produz com `loader` (medindo o tempo) e guarda
+
+        Args:
+            key: Chave do recurso
+            loader: Função sem argumentos que produz o recurso (ou None se falhar)
+
+        Returns:
+            Recurso ou None se o loader falhar
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        start = time.perf_counter()
+        value = loader()
+        if value is not None:
+            self.put(key, value, time.perf_counter() - start)
+        return value
+
+    def _evict(self, keep: Hashable = None):
+        """Descarta os recursos menos usados até caber no orçamento (fixados e `keep` são preservados)"""
+        if self.used_bytes <= self.budget_bytes:
+            return
+        for key in list(self._entries):
+            if self.used_bytes <= self.budget_bytes:
+                break
+            if key == keep or key in self._pinned:
+                continue
+            self.used_bytes -= self._entries.pop(key)[1]
+            self.evictions += 1
+
+    def pin(self, group: str, keys: Iterable[Hashable]):
+        """
+        Fixa um conjunto de recursos (ex: os que estão em tela), substituindo o que o grupo fixava antes
+
+        Args:
+            group: Nome do grupo ('background', 'sprites', ...)
+            keys: Chaves a manter fixadas enquanto o grupo não mudar
+        """
+        keys = frozenset(keys)
+        if self._pins.get(group) == keys:
+            return
+        self._pins[group] = keys
+        self._pinned = frozenset().union(*self._pins.values())
+        self._evict()
+
+    def unpin(self, group: str):
+        """Libera os recursos fixados por um grupo"""
+        if self._pins.pop(group, None) is not None:
+            self._pinned = frozenset().union(*self._pins.values())
+            self._evict()
+
+    def set_budget(self, budget_bytes: int):
+        """Altera o orçamento de memória, descartando recursos se necessário"""
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas de uso do cache
+
+        Returns:
+            Dicionário com 'entries', 'pinned', 'used_bytes', 'budget_bytes', 'hits', 'misses',
+            'hit_rate', 'evictions' e 'decode_time_ms'
+        """
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'pinned': sum(1 for key in self._pinned if key in self._entries),
+            'used_bytes': self.used_bytes,
+            'budget_bytes': self.budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'decode_time_ms': round(self.decode_time * 1000, 1)
+        }
+
+    def clear(self, kind: str = None):
+        """
+        Remove recursos do cache
+
+        Args:
+            kind: Tipo de recurso a remover (primeiro elemento da chave); None remove todos
+        """
+        if kind is None:
+            self._entries.clear()
+            self.used_bytes = 0
+            return
+        for key in [k for k in self._entries if isinstance(k, tuple) and k and k[0] == kind]:
+            self.used_bytes -= self._entries.pop(key)[1]
@@ -0,0 +1,250 @@
+"""
+Pré-carregador preditivo de imagens
+Responsabilidade: Decodificar em segundo plano os backgrounds e sprites das próximas cenas possíveis
+e entregá-los prontos ao BackgroundManager e ao SpriteManager
+"""
+
+import os
+import time
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from .name_index import NameIndex
+from .scene_order import SceneOrder
+from .script_compiler import compiled_line
+from .sprite_manager import Sprite
+from .ui_manager import UIManager
+
+# Postado quando um trabalho em segundo plano termina, para acordar o loop ocioso do Game
+PREFETCH_DONE_EVENT = pygame.event.custom_type()
+
+
+def _post_done(_future):
+    """Callback dos Futures (roda na thread que terminou o trabalho): acorda pygame.event.wait"""
+    try:
+        pygame.event.post(pygame.event.Event(PREFETCH_DONE_EVENT))
+    except pygame.error:
+        pass  # Sistema de eventos já encerrado (jogo fechando)
+
+
+class AssetPrefetcher:
+    """Prevê as próximas cenas a partir do grafo de cenas e decodifica suas imagens em uma thread"""
+
+    def __init__(self, background_manager, sprite_manager, characters: Dict[str, Dict],
+                 data_loader=None, is_room_reference: Optional[Callable[[str], bool]] = None,
+                 name_index: Optional[NameIndex] = None):
+        """
+        Inicializa o pré-carregador
+
+        Args:
+            background_manager: BackgroundManager que recebe os backgrounds prontos
+            sprite_manager: SpriteManager que recebe as imagens de sprite prontas
+            characters: Dicionário com dados dos personagens (para achar a imagem de cada um)
+            data_loader: DataLoader usado para ler cômodos referenciados pelas opções
+            is_room_reference: Função que diz se um id de cena é, na verdade, um cômodo
+            name_index: Índice de nomes compartilhado (só consultado na thread principal; personagens
+                novos são indexados na própria consulta); um próprio é criado se omitido
+        """
+        self.background_manager = background_manager
+        self.sprite_manager = sprite_manager
+        self.characters = characters
+        self.data_loader = data_loader
+        self.is_room_reference = is_room_reference or (lambda scene_id: False)
+        self.name_index = name_index or NameIndex(characters)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='asset_prefetch')
+        self._pending = {}  # chave do recurso -> Future
+        self._waiting_rooms = set()  # Cômodos previstos cuja leitura (DataLoader) ainda não terminou
+
+    def successor_ids(self, scene: dict, scenes_order: List[str]) -> List[str]:
+        """
+        Lista os ids das cenas que podem vir depois da cena atual
+
+        Args:
+            scene: Cena atual
+            scenes_order: Ordem das cenas no arquivo
+
+        Returns:
+            Lista de ids (sem repetição, na ordem de probabilidade aproximada)
+        """
+        ids = []
+        if scene.get('x_x'):
+            ids.append(scene['x_x'])
+        for option in scene.get('opcoes', []) or []:
+            target = UIManager.get_option_target(option)
+            if target:
+                ids.append(target)
+        conditions = scene.get('condicao')
+        if isinstance(conditions, list):
+            for condition in conditions:
+                if isinstance(condition, dict) and condition.get('proximo_id'):
+                    ids.append(condition['proximo_id'])
+        next_id = self._next_in_order(scene.get('id'), scenes_order)
+        if next_id:
+            ids.append(next_id)
+        return list(dict.fromkeys(ids))
+
+    @staticmethod
+    def _next_in_order(scene_id, scenes_order) -> Optional[str]:
+        """Retorna o id da cena seguinte no arquivo (ou None)"""
+        return SceneOrder.of(scenes_order).successor(scene_id)
+
+    def schedule(self, scene: dict, scenes: dict, scenes_order: List[str]):
+        """
+        Agenda a decodificação das imagens das cenas sucessoras da cena atual.
+        Pedidos antigos que ainda não começaram são cancelados.
+
+        Args:
+            scene: Cena atual
+            scenes: Dicionário de cenas carregadas (id -> cena)
+            scenes_order: Ordem das cenas no arquivo
+        """
+        wanted = {}
+        self._waiting_rooms = set()
+        for scene_id in self.successor_ids(scene, scenes_order):
+            if scene_id in scenes:
+                self._collect_scene_jobs(scenes[scene_id], wanted)
+            elif self.data_loader and self.is_room_reference(scene_id) and self.data_loader.room_exists(scene_id):
+                # A leitura do cômodo fica com o DataLoader; as imagens são agendadas quando ela terminar
+                room = self.data_loader.peek_room(scene_id)
+                if room is None:
+                    future = self.data_loader.preload_room(scene_id)
+                    if future is not None:
+                        future.add_done_callback(_post_done)
+                    self._waiting_rooms.add(scene_id)
+                else:
+                    self._collect_room_jobs(room, wanted)
+
+        # Cancela o que não é mais previsto
+        for key, future in list(self._pending.items()):
+            if key not in wanted and future.cancel():
+                del self._pending[key]
+
+        for key, (job, args) in wanted.items():
+            if key not in self._pending:
+                future = self._executor.submit(job, *args)
+                future.add_done_callback(_post_done)
+                self._pending[key] = future
+
+    def _collect_scene_jobs(self, scene: dict, jobs: dict):
+        """Adiciona a `jobs` as imagens de uma cena que ainda não estão em cache"""
+        filename = scene.get('img_fundo')
+        if filename and not self.background_manager.has_scaled(filename, 'fit'):
+            jobs[('background', filename)] = (self._decode_background, (filename,))
+
+        for sprite in self._scene_sprites(scene):
+            full_path = sprite.resolve_image_path(self.sprite_manager.base_image_path)
+            key = sprite.cache_key(full_path, self.sprite_manager.screen_width, self.sprite_manager.screen_height)
+            if key not in self.sprite_manager.assets:
+                jobs[('sprite', key)] = (self._decode_sprite, (sprite, full_path, key))
+
+    def _collect_room_jobs(self, room: tuple, jobs: dict):
+        """Adiciona a `jobs` as imagens da primeira cena de um cômodo já lido"""
+        room_scenes, room_order = room
+        if room_scenes and room_order:
+            self._collect_scene_jobs(room_scenes[room_order[0]], jobs)
+
+    def _scene_sprites(self, scene: dict) -> List[Sprite]:
+        """Cria (sem carregar) os sprites adicionados pelos comandos {sprite...} da cena"""
+        sprites = []
+        for index in range(len(scene.get('texto', []))):
+            for command, params in compiled_line(scene, index).commands:
+                if command != 'add':
+                    continue
+                char_data = self._find_character(params['character'])
+                if char_data and char_data.get('img'):
+                    sprites.append(Sprite(params['character'], char_data['img'],
+                                          params['position'], params.get('expression', '')))
+        return sprites
+
+    def _find_character(self, name: str) -> Optional[dict]:
+        """Busca um personagem por nome (case-insensitive) no índice compartilhado"""
+        char_name = self.name_index.find(name)
+        return self.characters.get(char_name) if char_name is not None else None
+
+    # ----- Executado na thread de pré-carregamento -----
+
+    def _decode_background(self, filename: str) -> list:
+        """Decodifica e escala um background (sem convert, que exige a thread principal)"""
+        full_path = os.path.join(self.background_manager.images_dir, filename)
+        if not os.path.exists(full_path):
+            return []
+        start = time.perf_counter()
+        screen_size = (self.background_manager.screen_width, self.background_manager.screen_height)
+        baked = self.background_manager.load_baked(filename, 'fit')
+        if baked:
+            surface, position = baked
+        else:
+            surface, position = self.background_manager.scale_for_mode(pygame.image.load(full_path), 'fit')
+        return [('background', filename, surface, position, screen_size, time.perf_counter() - start)]
+
+    def _decode_sprite(self, sprite: Sprite, full_path: str, cache_key: tuple) -> list:
+        """Decodifica e escala a imagem de um sprite (caminho e chave resolvidos na thread principal)"""
+        if not os.path.exists(full_path):
+            return []
+        start = time.perf_counter()
+        width, height = self.sprite_manager.screen_width, self.sprite_manager.screen_height
+        baked_store = self.sprite_manager.baked_store
+        baked = baked_store.load(full_path, sprite.size_class, (width, height)) if baked_store else None
+        if baked:
+            surface = baked[0]
+        else:
+            loaded = pygame.image.load(full_path)
+            new_size = Sprite.compute_scaled_size(loaded.get_size(), sprite.size_class, width, height)
+            surface = pygame.transform.scale(loaded, new_size)
+        return [('sprite', cache_key, surface, time.perf_counter() - start)]
+
+    # ----- Thread principal -----
+
+    def pump(self):
+        """
+        Entrega aos gerenciadores as imagens já decodificadas (deve ser chamado todo frame,
+        pois a conversão de formato precisa da thread principal)
+        """
+        self._schedule_ready_rooms()
+        for key, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[key]
+            if future.cancelled():
+                continue
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"[PREFETCH] ERRO ao pré-carregar {key[1]}: {e}")
+                continue
+            for result in results:
+                if result[0] == 'background':
+                    _, filename, surface, position, screen_size, decode_time = result
+                    self.background_manager.store_scaled(filename, 'fit', surface.convert(), position,
+                                                         screen_size, decode_time)
+                    print(f"[PREFETCH] Background pronto: {filename}")
+                else:
+                    _, cache_key, surface, decode_time = result
+                    if cache_key not in self.sprite_manager.assets:
+                        self.sprite_manager.assets.put(cache_key, surface.convert_alpha(), decode_time)
+                        print(f"[PREFETCH] Sprite pronto: {os.path.basename(cache_key[1])} ({cache_key[2]})")
+
+    def _schedule_ready_rooms(self):
+        """Agenda as imagens dos cômodos previstos cuja leitura acabou de terminar"""
+        if not self._waiting_rooms:
+            return
+        jobs = {}
+        for room_name in list(self._waiting_rooms):
+            if self.data_loader.room_pending(room_name):
+                continue
+            self._waiting_rooms.discard(room_name)
+            room = self.data_loader.peek_room(room_name)
+            if room is not None:
+                self._collect_room_jobs(room, jobs)
+        for key, (job, args) in jobs.items():
+            if key not in self._pending:
+                future = self._executor.submit(job, *args)
+                future.add_done_callback(_post_done)
+                self._pending[key] = future
+
+    def shutdown(self):
+        """Encerra a thread de pré-carregamento, descartando pedidos pendentes"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+        self._waiting_rooms.clear()
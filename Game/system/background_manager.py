@@ -7,11 +7,14 @@ import pygame
 import os
 from typing import Optional, Tuple
 
+from .asset_manager import AssetManager
+
 
 class BackgroundManager:
     """Gerencia renderização de imagens de fundo"""
     
-    def __init__(self, screen_width: int, screen_height: int, images_dir: str = None):
+    def __init__(self, screen_width: int, screen_height: int, images_dir: str = None,
+                 assets: Optional[AssetManager] = None, baked_store=None):
         """
         Inicializa o gerenciador de backgrounds
         
@@ -19,11 +22,17 @@ class BackgroundManager:
             screen_width: Largura da tela em pixels
             screen_height: Altura da tela em pixels
             images_dir: Diretório base onde estão as imagens de fundo
+            assets: AssetManager compartilhado onde ficam as imagens carregadas e escaladas
+            baked_store: BakedAssetStore com variantes pré-escaladas (opcional)
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.images_dir = images_dir or os.path.join('Game', 'data', 'script', 'imgs')
-        self._cache = {}  # Cache de imagens carregadas {filename: surface}
+        # Cache compartilhado: ('background_source', filename) -> surface original e
+        # ('background', filename, fit_mode, (w, h)) -> (surface escalada, posição)
+        self.assets = assets or AssetManager()
+        self.baked_store = baked_store
+        self.last_rect: Optional[pygame.Rect] = None  # Área ocupada pelo último background desenhado
         
     def load_background(self, filename: str) -> Optional[pygame.Surface]:
         """
@@ -38,11 +47,11 @@ class BackgroundManager:
         if not filename:
             return None
             
-        # Verifica cache primeiro
-        if filename in self._cache:
-            return self._cache[filename]
-            
-        # Carrega do disco
+        # Verifica cache primeiro, senão carrega do disco
+        return self.assets.load(('background_source', filename), lambda: self._read_background(filename))
+        
+    def _read_background(self, filename: str) -> Optional[pygame.Surface]:
+        """Lê e converte uma imagem de fundo do disco (sem cache)"""
         full_path = os.path.join(self.images_dir, filename)
         if not os.path.exists(full_path):
             
@@ -50,7 +59,6 @@ class BackgroundManager:
             
         try:
             surface = pygame.image.load(full_path).convert()
-            self._cache[filename] = surface
             print(f"[BACKGROUND_MANAGER] Imagem carregada: {filename}")
             return surface
         except Exception as e:
@@ -70,25 +78,38 @@ class BackgroundManager:
         if not surface:
             return None, (0, 0)
             
-        original_w, original_h = surface.get_size()
+        new_size, position = self.compute_fit_size(surface.get_size(), (self.screen_width, self.screen_height))
+        
+        # Escala a imagem
+        scaled_surface = pygame.transform.scale(surface, new_size)
+        
+        return scaled_surface, position
+        
+    @staticmethod
+    def compute_fit_size(image_size: Tuple[int, int],
+                         screen_size: Tuple[int, int]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """
+        Calcula o tamanho e a posição de uma imagem ajustada à tela mantendo aspect ratio
+        
+        Args:
+            image_size: Tamanho original (largura, altura)
+            screen_size: Tamanho da tela (largura, altura)
+            
+        Returns:
+            Tupla ((nova_largura, nova_altura), (x, y)) onde posição é para centralizar
+        """
+        original_w, original_h = image_size
+        screen_w, screen_h = screen_size
         
         # Calcula fator de escala para caber mantendo proporção
-        scale_w = self.screen_width / original_w
-        scale_h = self.screen_height / original_h
-        scale = min(scale_w, scale_h)
+        scale = min(screen_w / original_w, screen_h / original_h)
         
         # Novas dimensões
         new_w = int(original_w * scale)
         new_h = int(original_h * scale)
         
-        # Escala a imagem
-        scaled_surface = pygame.transform.scale(surface, (new_w, new_h))
-        
         # Calcula posição para centralizar
-        x = (self.screen_width - new_w) // 2
-        y = (self.screen_height - new_h) // 2
-        
-        return scaled_surface, (x, y)
+        return (new_w, new_h), ((screen_w - new_w) // 2, (screen_h - new_h) // 2)
         
     def scale_to_fill(self, surface: pygame.Surface) -> pygame.Surface:
         """
@@ -140,27 +161,130 @@ class BackgroundManager:
         Returns:
             True se renderizou com sucesso, False caso contrário
         """
+        self.last_rect = None
         if not filename:
+            self.assets.unpin('background')
             return False
             
+        scaled, position = self.get_scaled_background(filename, fit_mode)
+        if not scaled:
+            return False
+            
+        self.last_rect = screen.blit(scaled, position)
+        return True
+        
+    def get_scaled_background(self, filename: str, 
+                              fit_mode: str = 'fit') -> Tuple[Optional[pygame.Surface], Tuple[int, int]]:
+        """
+        Retorna o background já escalado para a resolução atual, escalando apenas
+        na primeira vez (cache por arquivo, modo de ajuste e resolução). O background
+        devolvido fica fixado no cache até ser trocado por outro.
+        
+        Args:
+            filename: Nome do arquivo de imagem
+            fit_mode: 'fit' (ajusta mantendo proporção) ou 'fill' (preenche cortando)
+            
+        Returns:
+            Tupla (surface_escalada, posição_xy) ou (None, (0, 0)) se falhar
+        """
+        key = self._scaled_key(filename, fit_mode)
+        entry = self.assets.load(key, lambda: self._build_scaled(filename, fit_mode))
+        if not entry:
+            return None, (0, 0)
+        self.assets.pin('background', (key,))
+        return entry
+        
+    def _build_scaled(self, filename: str, fit_mode: str) -> Optional[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """Produz o background escalado (variante pré-escalada ou PNG escalado agora)"""
+        # Variante pré-escalada (tools/bake_assets.py), se houver
+        baked = self.load_baked(filename, fit_mode)
+        if baked:
+            return baked[0].convert(), baked[1]
+            
         # Carrega a imagem
         bg_surface = self.load_background(filename)
         if not bg_surface:
-            return False
+            return None
             
-        # Escala e renderiza
-        if fit_mode == 'fill':
-            scaled = self.scale_to_fill(bg_surface)
-            screen.blit(scaled, (0, 0))
-        else:  # fit (padrão)
-            scaled, position = self.scale_to_fit(bg_surface)
-            screen.blit(scaled, position)
+        # Escala
+        return self.scale_for_mode(bg_surface, fit_mode)
+        
+    def _scaled_key(self, filename: str, fit_mode: str, screen_size: Tuple[int, int] = None) -> tuple:
+        """Chave do background escalado no AssetManager"""
+        return ('background', filename, fit_mode, screen_size or (self.screen_width, self.screen_height))
+        
+    def load_baked(self, filename: str, fit_mode: str = 'fit') -> Optional[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """
+        Carrega a variante pré-escalada do background para a resolução atual (sem convert)
+        
+        Returns:
+            Tupla (surface, posição_xy) ou None se não houver variante válida
+        """
+        if not self.baked_store:
+            return None
+        full_path = os.path.join(self.images_dir, filename)
+        return self.baked_store.load(full_path, fit_mode, (self.screen_width, self.screen_height))
+        
+    def scale_for_mode(self, surface: pygame.Surface,
+                       fit_mode: str = 'fit') -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """
+        Escala uma surface conforme o modo de ajuste
+        
+        Args:
+            surface: Surface original
+            fit_mode: 'fit' (ajusta mantendo proporção) ou 'fill' (preenche cortando)
             
-        return True
+        Returns:
+            Tupla (surface_escalada, posição_xy)
+        """
+        if fit_mode == 'fill':
+            return self.scale_to_fill(surface), (0, 0)
+        return self.scale_to_fit(surface)
+        
+    def has_scaled(self, filename: str, fit_mode: str = 'fit') -> bool:
+        """Verifica se o background já está escalado em cache para a resolução atual"""
+        return self._scaled_key(filename, fit_mode) in self.assets
+        
+    def store_scaled(self, filename: str, fit_mode: str, surface: pygame.Surface,
+                     position: Tuple[int, int], screen_size: Tuple[int, int] = None,
+                     decode_time: float = 0.0):
+        """
+        Insere no cache um background já escalado (ex: decodificado em segundo plano)
+        
+        Args:
+            filename: Nome do arquivo de imagem
+            fit_mode: Modo de ajuste usado na escala
+            surface: Surface já escalada
+            position: Posição de blit
+            screen_size: Resolução para a qual foi escalado (padrão: a atual)
+            decode_time: Tempo (s) gasto decodificando e escalando
+        """
+        screen_size = screen_size or (self.screen_width, self.screen_height)
+        if screen_size != (self.screen_width, self.screen_height):
+            return  # Resolução mudou enquanto a imagem era preparada
+        self.assets.put(self._scaled_key(filename, fit_mode, screen_size), (surface, position), decode_time)
+        
+    def set_resolution(self, screen_width: int, screen_height: int):
+        """
+        Atualiza a resolução da tela, invalidando os backgrounds já escalados
+        
+        Args:
+            screen_width: Nova largura da tela em pixels
+            screen_height: Nova altura da tela em pixels
+        """
+        if (screen_width, screen_height) == (self.screen_width, self.screen_height):
+            return
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.assets.unpin('background')
+        self.assets.clear('background')
+        print(f"[BACKGROUND_MANAGER] Resolução alterada para {screen_width}x{screen_height}")
         
     def clear_cache(self):
-        """Limpa o cache de imagens carregadas"""
-        self._cache.clear()
+        """Limpa o cache de imagens carregadas e escaladas"""
+        self.assets.unpin('background')
+        self.assets.clear('background_source')
+        self.assets.clear('background')
         print(f"[BACKGROUND_MANAGER] Cache limpo")
         
     def preload_backgrounds(self, filenames: list):
@@ -171,6 +295,6 @@ class BackgroundManager:
             filenames: Lista de nomes de arquivos a pré-carregar
         """
         for filename in filenames:
-            if filename and filename not in self._cache:
+            if filename and ('background_source', filename) not in self.assets:
                 self.load_background(filename)
         print(f"[BACKGROUND_MANAGER] {len(filenames)} backgrounds pré-carregados")
@@ -0,0 +1,102 @@
+"""
+Repositório de imagens pré-escaladas ("baked")
+Responsabilidade: Localizar e carregar as variantes de imagens geradas por tools/bake_assets.py
+(pixels crus já na resolução final), com fallback para o PNG original quando não houver variante válida
+"""
+
+import json
+import os
+import pygame
+from typing import Optional, Tuple
+
+BAKED_DIR = os.path.join('Game', 'data', 'baked')
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+def normalize_source(path: str) -> str:
+    """Normaliza o caminho de uma imagem de origem para uso como chave do manifesto"""
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+def make_key(source_path: str, variant: str, screen_size: Tuple[int, int]) -> str:
+    """
+    Monta a chave de uma variante no manifesto
+
+    Args:
+        source_path: Caminho da imagem original (ex: Game/data/script/imgs/NPC/yuno.png)
+        variant: Modo de ajuste do background ('fit') ou classe de tamanho do sprite ('center'/'side')
+        screen_size: Resolução alvo (largura, altura)
+
+    Returns:
+        Chave no formato 'caminho|variante|LxA'
+    """
+    return f"{normalize_source(source_path)}|{variant}|{screen_size[0]}x{screen_size[1]}"
+
+
+class BakedAssetStore:
+    """Consulta o manifesto de imagens pré-escaladas e carrega os pixels crus"""
+
+    def __init__(self, baked_dir: str = None):
+        """
+        Inicializa o repositório (o manifesto é lido apenas no primeiro uso)
+
+        Args:
+            baked_dir: Diretório onde estão o manifesto e os arquivos .raw
+        """
+        self.baked_dir = baked_dir or BAKED_DIR
+        self._entries = None
+
+    def _load_manifest(self) -> dict:
+        """Lê o manifesto (uma única vez); retorna dicionário vazio se não existir ou for inválido"""
+        if self._entries is None:
+            self._entries = {}
+            manifest_path = os.path.join(self.baked_dir, MANIFEST_NAME)
+            if os.path.exists(manifest_path):
+                try:
+                    with open(manifest_path, 'r', encoding='utf-8') as f:
+                        manifest = json.load(f)
+                    if manifest.get('version') == MANIFEST_VERSION:
+                        self._entries = manifest.get('entries', {})
+                        print(f"[BAKED_ASSETS] Manifesto carregado: {len(self._entries)} variantes")
+                except Exception as e:
+                    print(f"[BAKED_ASSETS] ERRO ao ler manifesto: {e}")
+        return self._entries
+
+    def load(self, source_path: str, variant: str,
+             screen_size: Tuple[int, int]) -> Optional[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """
+        Carrega a variante pré-escalada de uma imagem, se existir e estiver atualizada.
+        A surface retornada ainda não foi convertida (convert/convert_alpha cabe a quem chama).
+
+        Args:
+            source_path: Caminho da imagem original
+            variant: Modo de ajuste ('fit') ou classe de tamanho ('center'/'side')
+            screen_size: Resolução alvo
+
+        Returns:
+            Tupla (surface, posição_xy) ou None para usar o caminho normal (PNG)
+        """
+        entries = self._load_manifest()
+        if not entries:
+            return None
+        entry = entries.get(make_key(source_path, variant, screen_size))
+        if not entry:
+            return None
+
+        # Variante desatualizada se o PNG original mudou depois do bake
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+        if stat.st_mtime_ns != entry['source_mtime_ns'] or stat.st_size != entry['source_size']:
+            return None
+
+        try:
+            with open(os.path.join(self.baked_dir, entry['file']), 'rb') as f:
+                data = f.read()
+            surface = pygame.image.frombytes(data, tuple(entry['size']), entry['format'])
+        except Exception as e:
+            print(f"[BAKED_ASSETS] ERRO ao carregar variante de {source_path}: {e}")
+            return None
+        return surface, tuple(entry.get('position', (0, 0)))
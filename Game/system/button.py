@@ -15,7 +15,8 @@ class Button:
                  normal_color: tuple = (139, 69, 19),
                  hover_color: tuple = (160, 82, 45),
                  border_color: tuple = (218, 165, 32),
-                 border_width: int = 3):
+                 border_width: int = 3,
+                 assets=None):
         """
         Cria um botão estilo vitoriano
         
@@ -30,6 +31,7 @@ class Button:
             hover_color: Cor de fundo ao passar mouse (marrom claro)
             border_color: Cor da borda (dourado)
             border_width: Espessura da borda em pixels
+            assets: AssetManager onde a aparência pronta do botão é guardada (opcional)
         """
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
@@ -39,28 +41,54 @@ class Button:
         self.border_color = border_color
         self.border_width = border_width
         self.hovered = False
+        self.assets = assets
         
-    def draw(self, screen: pygame.Surface):
+    def draw(self, screen: pygame.Surface) -> pygame.Rect:
         """
         Renderiza o botão na tela
         
         Args:
             screen: Surface da tela onde desenhar
+            
+        Returns:
+            Retângulo da tela ocupado pelo botão
         """
+        if self.assets is None:
+            self._draw_chrome(screen, self.rect)
+        else:
+            # Borda, fundo e texto são compostos uma única vez por aparência
+            chrome = self.assets.load(self._chrome_key(), self._render_chrome)
+            screen.blit(chrome, self.rect.topleft)
+        return self.rect
+        
+    def _draw_chrome(self, screen: pygame.Surface, rect: pygame.Rect):
+        """Desenha borda, fundo e texto do botão no retângulo indicado"""
         # Desenha borda dourada
-        pygame.draw.rect(screen, self.border_color, self.rect, self.border_width)
+        pygame.draw.rect(screen, self.border_color, rect, self.border_width)
         
         # Desenha fundo (cor depende do hover)
-        inner_rect = self.rect.inflate(-self.border_width * 2, -self.border_width * 2)
+        inner_rect = rect.inflate(-self.border_width * 2, -self.border_width * 2)
         color = self.hover_color if self.hovered else self.normal_color
         pygame.draw.rect(screen, color, inner_rect)
         
         # Desenha texto centralizado
         text_surf = self.text_style.render(self.text)
-        text_x = self.rect.x + (self.rect.width - text_surf.get_width()) // 2
-        text_y = self.rect.y + (self.rect.height - text_surf.get_height()) // 2
+        text_x = rect.x + (rect.width - text_surf.get_width()) // 2
+        text_y = rect.y + (rect.height - text_surf.get_height()) // 2
         screen.blit(text_surf, (text_x, text_y))
         
+    def _render_chrome(self) -> pygame.Surface:
+        """Compõe a aparência atual do botão em uma surface própria (opaca)"""
+        surface = pygame.Surface(self.rect.size)
+        self._draw_chrome(surface, surface.get_rect())
+        return surface
+        
+    def _chrome_key(self) -> tuple:
+        """Chave da aparência atual do botão no AssetManager"""
+        style = self.text_style
+        return ('button', self.rect.size, self.text, style.size, tuple(style.color), style.bold, style.italic,
+                self.border_color, self.border_width, self.hover_color if self.hovered else self.normal_color)
+        
     def update_hover(self, mouse_pos: tuple):
         """
         Atualiza estado de hover baseado na posição do mouse
@@ -0,0 +1,248 @@
+"""
+Índice de personagens
+Responsabilidade: Manter um manifesto dos JSON de personagens (nome normalizado -> arquivo, cor
+e imagem) e reler do disco apenas os arquivos que mudaram desde a última leitura. O conteúdo
+dos personagens não é copiado para o manifesto: é sempre lido do próprio arquivo
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .script_compiler import CACHE_DIR
+
+BASE_DIR = os.path.join('Game', 'data', 'script', 'Base')
+MANIFEST_VERSION = 2
+
+
+def normalize_name(name: str) -> str:
+    """Forma usada para comparar nomes de personagens (sem espaços nas pontas, minúsculas)"""
+    return name.strip().lower()
+
+
+class CharacterEntry(NamedTuple):
+    """Um arquivo de personagem do manifesto"""
+    name: str  # Campo 'nome'
+    path: str
+    color: Tuple[int, ...]  # Campo 'cor' já convertido
+    img: Optional[str]
+    mtime_ns: int
+    size: int
+
+
+class CharacterIndex:
+    """Manifesto dos personagens em Game/data/script/Base, compartilhado entre loader, status e condições"""
+
+    def __init__(self, base_dir: Optional[str] = None, cache_dir: str = CACHE_DIR):
+        """
+        Args:
+            base_dir: Diretório com os JSON de personagens (pastas 'config' são ignoradas)
+            cache_dir: Diretório onde o manifesto é gravado
+        """
+        self.base_dir = base_dir or BASE_DIR
+        self.manifest_path = os.path.join(cache_dir, 'characters.index.json')
+        self._entries: List[CharacterEntry] = []  # Na ordem da varredura do diretório
+        self._by_name: Dict[str, CharacterEntry] = {}  # nome normalizado -> entrada
+        self._dirs: Dict[str, int] = {}  # diretório -> mtime_ns (detecta arquivos novos/removidos)
+        self._parsed: Dict[str, dict] = {}  # Conteúdo lido por refresh(), entregue uma vez por read_data()
+        self._loaded = False
+
+    def entries(self) -> List[CharacterEntry]:
+        """Entradas do manifesto (sincronizado com o disco na primeira chamada)"""
+        self._ensure_loaded()
+        return list(self._entries)
+
+    def find(self, name: str) -> Optional[CharacterEntry]:
+        """Entrada do personagem pelo nome (case-insensitive) ou None"""
+        self._ensure_loaded()
+        return self._by_name.get(normalize_name(name))
+
+    def path_for(self, name: str) -> Optional[str]:
+        """Caminho do JSON do personagem ou None"""
+        entry = self.find(name)
+        return entry.path if entry else None
+
+    def name_for(self, name: str) -> Optional[str]:
+        """Nome do personagem como está no arquivo (chave usada em `characters`) ou None"""
+        entry = self.find(name)
+        return entry.name if entry else None
+
+    def read_data(self, entry: CharacterEntry) -> dict:
+        """
+        Conteúdo do arquivo de um personagem (atributos, inventário, IDs aplicados...)
+
+        Args:
+            entry: Entrada do manifesto
+
+        Returns:
+            Dicionário novo, lido do arquivo (ou o que refresh() acabou de ler, sem reler)
+
+        Raises:
+            OSError, ValueError: Se o arquivo não puder ser lido
+        """
+        data = self._parsed.pop(entry.path, None)
+        if data is None:
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        return data
+
+    def load_characters(self) -> Tuple[Dict[str, dict], List[Tuple[CharacterEntry, dict]]]:
+        """
+        Monta o dicionário de personagens usado pelo jogo, lendo cada arquivo
+
+        Returns:
+            Tupla ({nome: dados com 'color' em tupla}, [(entrada, conteúdo do arquivo)] na ordem do manifesto)
+        """
+        characters = {}
+        loaded = []
+        for entry in self.entries():
+            try:
+                data = self.read_data(entry)
+            except (OSError, ValueError) as e:
+                print(f"[CHARACTER_INDEX] ERRO ao ler personagem {entry.path}: {e}")
+                continue
+            characters[entry.name] = data.copy()
+            characters[entry.name]['color'] = entry.color  # Substitui a string 'cor' pela tupla
+            loaded.append((entry, data))
+        return characters, loaded
+
+    def record(self, path: str, data: dict):
+        """
+        Atualiza a entrada de um arquivo que acabou de ser gravado (ex: pelo StatusManager),
+        para que as buscas por nome reflitam o nome, a cor e a imagem novos
+
+        Args:
+            path: Caminho do JSON gravado
+            data: Conteúdo gravado
+        """
+        self._ensure_loaded()
+        self._parsed.pop(path, None)
+        try:
+            entry = self._make_entry(path, data, os.stat(path))
+        except (OSError, KeyError, ValueError, AttributeError) as e:
+            print(f"[CHARACTER_INDEX] AVISO: não foi possível atualizar {path}: {e}")
+            return
+        self._entries = [entry if item.path == path else item for item in self._entries]
+        if all(item.path != path for item in self._entries):
+            self._entries.append(entry)
+        self._rebuild_names()
+
+    def refresh(self) -> bool:
+        """
+        Sincroniza o manifesto com o disco, relendo só arquivos novos ou alterados
+
+        Returns:
+            True se algum arquivo mudou desde a última leitura
+        """
+        if not self._loaded:
+            self._read_manifest()
+            self._loaded = True
+
+        known = {entry.path: entry for entry in self._entries}
+        if self._dirs and self._dirs_unchanged():
+            paths, dirs = list(known), self._dirs
+        else:
+            paths, dirs = self._scan()
+
+        changed = dirs != self._dirs or len(paths) != len(known)
+        reparsed = 0
+        entries = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                changed = True
+                continue
+            entry = known.get(path)
+            if entry is None or (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    entry = self._make_entry(path, data, stat)
+                    self._parsed[path] = data  # Evita reler o arquivo em read_data()
+                except (OSError, KeyError, ValueError, AttributeError) as e:
+                    print(f"[CHARACTER_INDEX] ERRO ao ler personagem {path}: {e}")
+                    changed = True
+                    continue
+                reparsed += 1
+                changed = True
+            entries.append(entry)
+
+        self._entries = entries
+        self._dirs = dirs
+        self._rebuild_names()
+        if changed:
+            print(f"[CHARACTER_INDEX] Manifesto atualizado: {len(entries)} personagens ({reparsed} arquivos relidos)")
+            self._write_manifest()
+        return changed
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.refresh()
+
+    def _dirs_unchanged(self) -> bool:
+        """Nenhum arquivo foi criado, removido ou renomeado nos diretórios conhecidos"""
+        for directory, mtime_ns in self._dirs.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _scan(self) -> Tuple[List[str], Dict[str, int]]:
+        """Lista os JSON de personagens e o mtime de cada diretório visitado"""
+        paths = []
+        dirs = {}
+        if not os.path.exists(self.base_dir):
+            return paths, dirs
+        for root, subdirs, files in os.walk(self.base_dir):
+            # Pula diretórios de configuração
+            subdirs[:] = [d for d in subdirs if d != 'config']
+            dirs[root] = os.stat(root).st_mtime_ns
+            for file in files:
+                if file.endswith('.json'):
+                    paths.append(os.path.join(root, file))
+        return paths, dirs
+
+    @staticmethod
+    def _make_entry(path: str, data: dict, stat: os.stat_result) -> CharacterEntry:
+        color = tuple(map(int, data['cor'].split(',')))
+        return CharacterEntry(data['nome'], path, color, data.get('img'), stat.st_mtime_ns, stat.st_size)
+
+    def _rebuild_names(self):
+        # Mesma regra do dicionário de personagens: o último arquivo com o nome prevalece
+        self._by_name = {normalize_name(entry.name): entry for entry in self._entries}
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != MANIFEST_VERSION or manifest.get('base_dir') != self.base_dir:
+                return
+            self._entries = [
+                CharacterEntry(item['name'], item['path'], tuple(item['color']), item['img'],
+                               item['mtime_ns'], item['size'])
+                for item in manifest['characters']
+            ]
+            self._dirs = dict(manifest['dirs'])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._entries, self._dirs = [], {}
+
+    def _write_manifest(self):
+        characters = [
+            {'name': entry.name, 'normalized': normalize_name(entry.name), 'path': entry.path,
+             'color': list(entry.color), 'img': entry.img, 'mtime_ns': entry.mtime_ns,
+             'size': entry.size}
+            for entry in self._entries
+        ]
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            tmp_path = f'{self.manifest_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'base_dir': self.base_dir, 'dirs': self._dirs,
+                           'characters': characters}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            print(f"[CHARACTER_INDEX] AVISO: não foi possível gravar o manifesto {self.manifest_path}: {e}")
@@ -3,23 +3,262 @@ Avaliador de condições para exibição dinâmica de diálogos e opções
 Responsabilidade: Avaliar condições baseadas em status de personagens e variáveis do jogo
 """
 
-import re
-from typing import Dict, Any, List, Optional
+import operator
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Union
+
+from .character_index import CharacterIndex, normalize_name
+from .player_state import PlayerState
+from .script_compiler import compile_condition
+
+# Operadores de comparação das condições compiladas (ver script_compiler.compile_expected)
+_COMPARATORS = {'le': operator.le, 'ge': operator.ge, 'lt': operator.lt, 'gt': operator.gt}
+
+OPTION_CACHE_SIZE = 128  # Listas de opções filtradas guardadas (uma por cena visitada)
+PREDICATES_KEY = '_predicates'  # Campo da cena onde ficam os predicados montados (ao lado de '_compiled')
+
+
+class CharacterRef:
+    """Referência a um personagem resolvida uma única vez (nome -> chave em `characters`)"""
+    
+    __slots__ = ('characters', 'name', 'key', '_size', '_character_index')
+    
+    def __init__(self, characters: Dict[str, Dict], name: str, character_index: Optional[CharacterIndex] = None):
+        self.characters = characters
+        self.name = name
+        self.key = None
+        self._size = -1
+        self._character_index = character_index
+        
+    def get(self) -> Optional[Dict[str, Any]]:
+        """
+        Dados atuais do personagem (o StatusManager troca o dicionário do personagem a cada
+        atualização, então só a chave é guardada) ou None se ele não existir
+        """
+        if self.key is None and len(self.characters) != self._size:
+            # Personagens só são adicionados: tenta de novo apenas quando surgir um novo
+            self._size = len(self.characters)
+            self.key = self._resolve()
+        return self.characters.get(self.key) if self.key is not None else None
+        
+    def _resolve(self) -> Optional[str]:
+        if self._character_index is not None:
+            char_name = self._character_index.name_for(self.name)
+            if char_name in self.characters:
+                return char_name
+        name_lower = self.name.lower()
+        for char_name in self.characters:
+            if char_name.lower() == name_lower:
+                return char_name
+        return None
+
+
+def make_comparison(expected: tuple):
+    """
+    Cria a função que compara o valor atual com um valor esperado já compilado
+    
+    Args:
+        expected: Tupla (operador, operando...) de script_compiler.compile_expected
+        
+    Returns:
+        Função valor_atual -> bool (o valor atual nunca é None)
+    """
+    op = expected[0]
+    if op in _COMPARATORS:
+        compare, operand = _COMPARATORS[op], expected[1]
+        if operand is None:
+            return lambda current: False
+        
+        def compare_number(current):
+            try:
+                return compare(float(current), operand)
+            except (ValueError, TypeError):
+                return False
+        return compare_number
+        
+    if op == 'num':
+        number = expected[1]
+        
+        def equals_number(current):
+            try:
+                return float(current) == number
+            except (ValueError, TypeError):
+                return False
+        return equals_number
+        
+    if op == 'eq':
+        value = expected[1]
+        return lambda current: current == value
+        
+    # 'range' e 'str': comparação de texto sem diferenciar maiúsculas (a faixa só vale para números)
+    normalized = expected[3] if op == 'range' else expected[1]
+    
+    def equals_text(current):
+        return str(current).strip().lower() == normalized
+    
+    if op != 'range':
+        return equals_text
+    min_val, max_val = expected[1], expected[2]
+    
+    def in_range(current):
+        try:
+            return min_val <= float(current) <= max_val
+        except (ValueError, TypeError):
+            return equals_text(current)
+    return in_range
+
+
+class MembershipPredicate:
+    """Verificação 'flag'/'memoria' (com ! para negação)"""
+    
+    __slots__ = ('values', 'key', 'name', 'negated')
+    
+    def __init__(self, values, key: str, name: str, negated: bool):
+        self.values = values  # Visão do conjunto em PlayerState (flags ou memorias)
+        self.key = key  # 'flags' ou 'memorias'
+        self.name = name
+        self.negated = negated
+        
+    @property
+    def dependencies(self) -> tuple:
+        """Chaves de estado lidas pela verificação"""
+        return ((self.key, self.name),)
+        
+    def __call__(self) -> bool:
+        return (self.name in self.values) != self.negated
+
+
+class FieldPredicate:
+    """Verificação de um atributo de personagem (ex: yuno_afeto) ou do jogador"""
+    
+    __slots__ = ('character', 'player_data', 'attribute', 'compare')
+    
+    def __init__(self, character: Optional[CharacterRef], player_data: PlayerState, attribute: str, compare):
+        self.character = character  # None para atributos do jogador
+        self.player_data = player_data
+        self.attribute = attribute
+        self.compare = compare
+        
+    @property
+    def dependencies(self) -> tuple:
+        """Chaves de estado lidas pela verificação"""
+        if self.character is None:
+            return (('player', self.attribute),)
+        return (('character', normalize_name(self.character.name), self.attribute),)
+        
+    def __call__(self) -> bool:
+        if self.character is None:
+            data = self.player_data
+        else:
+            data = self.character.get()
+            if data is None:
+                print(f"[CONDITION] Personagem '{self.character.name}' não encontrado")
+                return False
+        current = data.get(self.attribute)
+        if current is None:
+            print(f"[CONDITION] Campo '{self.attribute}' não existe")
+            return False
+        return self.compare(current)
+
+
+class ConditionPredicate:
+    """Condição inteira: atendida quando todas as verificações são atendidas"""
+    
+    __slots__ = ('checks',)
+    
+    def __init__(self, checks: tuple):
+        self.checks = checks
+        
+    @property
+    def dependencies(self) -> tuple:
+        """Chaves de estado lidas pelas verificações"""
+        return tuple(key for check in self.checks for key in check.dependencies)
+        
+    def __call__(self) -> bool:
+        for check in self.checks:
+            if not check():
+                return False
+        return True
+
+
+class ScenePredicates(NamedTuple):
+    """Predicados de uma cena, guardados em scene['_predicates'] (descartados junto com a cena)"""
+    evaluator: 'ConditionEvaluator'  # Avaliador que montou os predicados (ligados ao seu estado)
+    conditions: tuple  # Um ConditionPredicate por item de 'condicao' (lista)
+    options: tuple  # Por opção: ConditionPredicate ou None (sem condição válida)
+    generation: int  # Geração do avaliador (ver ConditionEvaluator.invalidate)
 
 
 class ConditionEvaluator:
     """Avalia condições para determinar qual cena/opção exibir"""
     
-    def __init__(self, characters: Dict[str, Dict], player_data: Dict):
+    def __init__(self, characters: Dict[str, Dict], player_data: Union[PlayerState, Dict],
+                 character_index: Optional[CharacterIndex] = None):
         """
         Inicializa o avaliador de condições
         
         Args:
             characters: Dicionário com dados dos personagens
-            player_data: Dados do jogador
+            player_data: Estado do jogador (um dicionário no formato do player.json é convertido)
+            character_index: Manifesto dos personagens para busca por nome (opcional)
         """
         self.characters = characters
-        self.player_data = player_data
+        self.player_data = PlayerState.from_dict(player_data)
+        self.character_index = character_index
+        self._character_refs: Dict[str, CharacterRef] = {}  # personagem (minúsculo) -> referência
+        self._generation = 0  # Incrementada por invalidate() (predicados antigos nas cenas deixam de valer)
+        
+        # Opções filtradas por cena, válidas enquanto as chaves de estado lidas não mudarem
+        self._versions: Dict[tuple, int] = {}  # chave de estado -> versão
+        self._option_cache = OrderedDict()  # id(opções) -> (opções, [(chave, versão)], filtradas)
+        self.option_cache_hits = 0
+        self.option_cache_misses = 0
+        # Mudanças de flags, memórias e atributos do jogador chegam direto do PlayerState
+        self.player_data.subscribe(self.state_changed)
+        
+    def invalidate(self):
+        """Descarta os predicados (necessário se `characters` ou `player_data` forem trocados)"""
+        self._character_refs.clear()
+        self._generation += 1
+        self._option_cache.clear()
+        
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do cache de opções filtradas
+        
+        Returns:
+            Dicionário com 'entries', 'hits', 'misses' e 'hit_rate'
+        """
+        total = self.option_cache_hits + self.option_cache_misses
+        return {
+            'entries': len(self._option_cache),
+            'hits': self.option_cache_hits,
+            'misses': self.option_cache_misses,
+            'hit_rate': self.option_cache_hits / total if total else 0.0
+        }
+        
+    def state_changed(self, keys: Iterable[tuple]):
+        """
+        Registra mudanças no estado lido pelas condições (invalida só as opções que dependem delas)
+        
+        Args:
+            keys: Chaves alteradas: ('flags', nome), ('memorias', nome), ('player', atributo)
+                  ou ('character', nome, atributo)
+        """
+        versions = self._versions
+        for key in keys:
+            versions[key] = versions.get(key, 0) + 1
+            
+    def character_changed(self, name: str, attributes: Iterable[str]):
+        """
+        Registra atributos alterados de um personagem (callback do StatusManager)
+        
+        Args:
+            name: Nome do personagem
+            attributes: Atributos que mudaram
+        """
+        norm = normalize_name(name)
+        self.state_changed(('character', norm, attribute) for attribute in attributes)
         
     def evaluate_scene_conditions(self, scene: Dict[str, Any]) -> Optional[str]:
         """
@@ -38,9 +277,10 @@ class ConditionEvaluator:
         if not isinstance(conditions, list):
             return None
             
-        # Avalia cada condição em ordem
-        for condition in conditions:
-            if self._evaluate_condition(condition):
+        # Avalia cada condição em ordem (predicados montados uma vez por cena)
+        predicates = self.scene_predicates(scene).conditions
+        for condition, predicate in zip(conditions, predicates):
+            if predicate():
                 next_id = condition.get('proximo_id')
                 print(f"[CONDITION] Condição atendida: {condition.get('dev', 'N/A')} -> {next_id}")
                 return next_id
@@ -48,28 +288,49 @@ class ConditionEvaluator:
         print(f"[CONDITION] Nenhuma condição atendida")
         return None
         
-    def filter_options_by_conditions(self, options: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def filter_options_by_conditions(self, options: List[Dict[str, Any]],
+                                     compiled_conditions: Optional[tuple] = None,
+                                     scene: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Filtra opções baseado em condições
         
         Args:
             options: Lista de opções, cada uma podendo ter campo 'condicao'
+            compiled_conditions: Verificações compiladas de cada opção (CompiledScene.option_conditions)
+            scene: Cena dona das opções; se passada, os predicados ficam guardados nela
             
         Returns:
             Lista de opções que atendem às condições
         """
+        # Mesma lista de opções e nenhuma chave lida mudou: reaproveita o resultado anterior
+        entry = self._option_cache.get(id(options))
+        if entry is not None and entry[0] is options:
+            versions = self._versions
+            if all(versions.get(key, 0) == version for key, version in entry[1]):
+                self._option_cache.move_to_end(id(options))
+                self.option_cache_hits += 1
+                return list(entry[2])
+        self.option_cache_misses += 1
+        
+        if scene is not None and scene.get('opcoes') is options:
+            predicates = self.scene_predicates(scene).options
+        else:
+            predicates = self._option_predicates(options, compiled_conditions)
+        
         filtered = []
+        dependencies = {}
         
-        for option in options:
+        for option, predicate in zip(options, predicates):
             # Se não tem condição, sempre inclui
             if 'condicao' not in option:
                 filtered.append(option)
                 continue
                 
             # Avalia a condição
-            condition = option['condicao']
-            if isinstance(condition, dict):
-                if self._evaluate_condition(condition):
+            if predicate is not None:
+                for key in predicate.dependencies:
+                    dependencies[key] = self._versions.get(key, 0)
+                if predicate():
                     print(f"[CONDITION] Opção '{option.get('texto', 'N/A')}' disponível")
                     filtered.append(option)
                 else:
@@ -78,193 +339,94 @@ class ConditionEvaluator:
                 # Se condição inválida, inclui por segurança
                 filtered.append(option)
                 
+        self._option_cache[id(options)] = (options, tuple(dependencies.items()), tuple(filtered))
+        while len(self._option_cache) > OPTION_CACHE_SIZE:
+            self._option_cache.popitem(last=False)
         return filtered
         
-    def _evaluate_condition(self, condition: Dict[str, Any]) -> bool:
+    def scene_predicates(self, scene: Dict[str, Any]) -> ScenePredicates:
         """
-        Avalia uma condição individual
+        Predicados das condições e opções de uma cena, montados na primeira avaliação e guardados
+        na própria cena (scene['_predicates']), então somem quando a cena é descartada
         
         Args:
-            condition: Dicionário com campos de condição (afeto, humor, etc)
+            scene: Cena (compilada ou não)
             
         Returns:
-            True se todas as condições são atendidas, False caso contrário
+            ScenePredicates
         """
-        # Remove campos que não são condições
-        non_condition_fields = {'dev', 'proximo_id', 'texto', 'cena'}
+        entry = scene.get(PREDICATES_KEY)
+        if entry is not None and entry.evaluator is self and entry.generation == self._generation:
+            return entry
+        compiled = scene.get('_compiled')
         
-        all_met = True
-        
-        for key, value in condition.items():
-            if key in non_condition_fields:
-                continue
-                
-            # Processa a condição baseado no formato
-            if not self._check_condition(key, value):
-                all_met = False
-                break
-                
-        return all_met
-        
-    def _check_condition(self, field: str, expected_value: Any) -> bool:
-        """
-        Verifica uma condição específica
-        
-        Args:
-            field: Nome do campo a verificar (ex: 'afeto', 'yuno_humor', 'mestre_yuno_forca', 'flag', 'memoria')
-            expected_value: Valor esperado (pode ser número, string, range, ou flag com !)
-            
-        Returns:
-            True se a condição é atendida
-        """
-        # Verifica se é uma condição de flag
-        if field.lower() == 'flag':
-            return self._check_flag_condition(expected_value)
+        conditions = scene.get('condicao')
+        condition_predicates = ()
+        if isinstance(conditions, list):
+            if compiled is not None and compiled.conditions is not None:
+                condition_predicates = tuple(self.predicate(checks) for checks in compiled.conditions)
+            else:
+                condition_predicates = tuple(self.condition_predicate(c) if isinstance(c, dict) else ConditionPredicate(())
+                                             for c in conditions)
         
-        # Verifica se é uma condição de memoria
-        if field.lower() == 'memoria':
-            return self._check_memoria_condition(expected_value)
+        option_predicates = self._option_predicates(scene.get('opcoes', []) or [],
+                                                    compiled.option_conditions if compiled is not None else None)
+        predicates = ScenePredicates(self, condition_predicates, option_predicates, self._generation)
+        scene[PREDICATES_KEY] = predicates
+        return predicates
         
-        # Separa o nome do personagem se necessário (ex: yuno_humor -> yuno, humor)
-        parts = field.split('_', 1)
+    def _option_predicates(self, options: List[Dict[str, Any]], compiled_conditions: Optional[tuple]) -> tuple:
+        """Predicado de cada opção (None se a opção não tiver uma condição em dicionário)"""
+        predicates = []
+        for i, option in enumerate(options):
+            condition = option.get('condicao') if isinstance(option, dict) else None
+            if not isinstance(condition, dict):
+                predicates.append(None)
+            elif compiled_conditions is not None:
+                predicates.append(self.predicate(compiled_conditions[i]))
+            else:
+                predicates.append(self.condition_predicate(condition))
+        return tuple(predicates)
         
-        if len(parts) == 2:
-            # Condição de personagem específico (ex: yuno_afeto, mestre_yuno_humor)
-            char_key = parts[0].lower()
-            attribute = parts[1]
-            
-            # Busca o personagem usando lowercase
-            char_data = self._find_character(char_key)
-            if not char_data:
-                print(f"[CONDITION] Personagem '{char_key}' não encontrado")
-                return False
-                
-            current_value = char_data.get(attribute)
-        else:
-            # Condição global ou do player
-            attribute = field
-            current_value = self.player_data.get(attribute)
-            
-        # Avalia baseado no tipo de valor esperado
-        return self._compare_values(current_value, expected_value, attribute)
-    
-    def _check_flag_condition(self, flag_value: str) -> bool:
+    def predicate(self, checks: tuple) -> ConditionPredicate:
         """
-        Verifica uma condição de flag
+        Monta o predicado de uma condição compilada (ver script_compiler.compile_condition)
         
         Args:
-            flag_value: Nome da flag, pode começar com ! para negação
+            checks: Tupla de verificações compiladas
             
         Returns:
-            True se a condição de flag é atendida
+            ConditionPredicate (chamar sem argumentos para avaliar)
         """
-        player_flags = self.player_data.get('flags', [])
-        
-        # Verifica se é negação (!flag)
-        if flag_value.startswith('!'):
-            flag_name = flag_value[1:]
-            result = flag_name not in player_flags
-            print(f"[CONDITION] Flag '{flag_name}' NOT set = {result}")
-            return result
-        else:
-            result = flag_value in player_flags
-            print(f"[CONDITION] Flag '{flag_value}' set = {result}")
-            return result
-    
-    def _check_memoria_condition(self, memoria_value: str) -> bool:
+        return ConditionPredicate(tuple(self._build_check(check) for check in checks))
+        
+    def condition_predicate(self, condition: Dict[str, Any]) -> ConditionPredicate:
         """
-        Verifica uma condição de memoria
+        Monta o predicado de uma condição que não passou pelo ScriptCompiler
         
         Args:
-            memoria_value: Nome da memoria, pode começar com ! para negação
-            
-        Returns:
-            True se a condição de memoria é atendida
+            condition: Dicionário com campos de condição (afeto, humor, etc)
         """
-        player_memorias = self.player_data.get('memorias', [])
-        
-        # Verifica se é negação (!memoria)
-        if memoria_value.startswith('!'):
-            memoria_name = memoria_value[1:]
-            result = memoria_name not in player_memorias
-            print(f"[CONDITION] Memoria '{memoria_name}' NOT set = {result}")
-            return result
-        else:
-            result = memoria_value in player_memorias
-            print(f"[CONDITION] Memoria '{memoria_value}' set = {result}")
-            return result
+        return self.predicate(compile_condition(condition))
         
-    def _compare_values(self, current: Any, expected: Any, field_name: str) -> bool:
-        """
-        Compara valores atual vs esperado
+    def _build_check(self, check: tuple):
+        """Transforma uma verificação compilada em predicado"""
+        kind = check[0]
+        if kind == 'flag' or kind == 'memoria':
+            _, name, negated = check
+            key = 'flags' if kind == 'flag' else 'memorias'
+            return MembershipPredicate(self.player_data.get_set(key), key, name, negated)
+        _, char_key, attribute, expected = check
+        character = self._character_ref(char_key) if char_key is not None else None
+        return FieldPredicate(character, self.player_data, attribute, make_comparison(expected))
         
-        Args:
-            current: Valor atual
-            expected: Valor esperado (pode incluir operadores: <=, >=, <, >, range)
-            field_name: Nome do campo para debug
-            
-        Returns:
-            True se os valores correspondem
-        """
-        # Se o valor atual não existe, falha
-        if current is None:
-            print(f"[CONDITION] Campo '{field_name}' não existe")
-            return False
-            
-        # String comparison
-        if isinstance(expected, str):
-            # Check for comparison operators
-            if expected.startswith('<='):
-                try:
-                    return float(current) <= float(expected[2:])
-                except (ValueError, TypeError):
-                    return False
-                    
-            elif expected.startswith('>='):
-                try:
-                    return float(current) >= float(expected[2:])
-                except (ValueError, TypeError):
-                    return False
-                    
-            elif expected.startswith('<'):
-                try:
-                    return float(current) < float(expected[1:])
-                except (ValueError, TypeError):
-                    return False
-                    
-            elif expected.startswith('>'):
-                try:
-                    return float(current) > float(expected[1:])
-                except (ValueError, TypeError):
-                    return False
-                    
-            # Check for range (ex: "1-5", "6-10")
-            elif '-' in expected and expected[0].isdigit():
-                try:
-                    min_val, max_val = expected.split('-')
-                    min_val = float(min_val)
-                    max_val = float(max_val)
-                    current_num = float(current)
-                    result = min_val <= current_num <= max_val
-                    print(f"[CONDITION] {field_name}: {current} in range [{min_val}-{max_val}] = {result}")
-                    return result
-                except (ValueError, TypeError):
-                    pass
-                    
-            # Direct string comparison (case insensitive)
-            result = str(current).strip().lower() == expected.strip().lower()
-            print(f"[CONDITION] {field_name}: '{current}' == '{expected}' = {result}")
-            return result
-            
-        # Numeric comparison
-        elif isinstance(expected, (int, float)):
-            try:
-                return float(current) == float(expected)
-            except (ValueError, TypeError):
-                return False
-                
-        # Direct comparison as fallback
-        return current == expected
+    def _character_ref(self, name: str) -> CharacterRef:
+        """Referência compartilhada por todas as verificações do mesmo personagem"""
+        ref = self._character_refs.get(name)
+        if ref is None:
+            ref = CharacterRef(self.characters, name, self.character_index)
+            self._character_refs[name] = ref
+        return ref
         
     def _find_character(self, name: str) -> Optional[Dict[str, Any]]:
         """
@@ -276,8 +438,4 @@ class ConditionEvaluator:
         Returns:
             Dados do personagem ou None
         """
-        name_lower = name.lower()
-        for char_name, char_data in self.characters.items():
-            if char_name.lower() == name_lower:
-                return char_data
-        return None
+        return self._character_ref(name.lower()).get()
@@ -1,30 +1,68 @@
-import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .episode_index import LazySceneTable, load_episode_index
+from .scene_order import SceneOrder
+from .script_compiler import ScriptCompiler
 
 class DataLoader:
-    def __init__(self):
+    def __init__(self, preload_distance=5, compiler=None, lazy_threshold_bytes=2 * 1024 * 1024):
+        """
+        Args:
+            preload_distance: Quantas cenas antes do fim do episódio o próximo começa a ser lido em segundo plano
+            compiler: ScriptCompiler usado para ler os roteiros já compilados (cache em disco)
+            lazy_threshold_bytes: Episódios a partir deste tamanho são carregados de forma indexada
+                (cenas lidas sob demanda); None desativa
+        """
         self.current_episode = 1
         self.current_chapter = 1
         self.room_stack = []  # Stack para rastrear salas visitadas
+        self.preload_distance = preload_distance
+        self.compiler = compiler or ScriptCompiler()
+        self.lazy_threshold_bytes = lazy_threshold_bytes
+        self._executor = None  # Criado no primeiro pré-carregamento
+        self._next_episode = None  # (caminho, Future) do episódio sendo lido em segundo plano
+        self._room_cache = {}  # caminho do cômodo -> (mtime_ns, tamanho, cenas, ordem)
+        self._room_futures = {}  # caminho do cômodo -> Future da leitura em segundo plano
         
     def load_scenes(self, path):
         """Carrega cenas de um episódio específico"""
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        scenes, order, episode, chapter = self._parse_episode(path)
+        if episode is not None:
+            self.current_episode = episode
+        if chapter is not None:
+            self.current_chapter = chapter
+        return scenes, order
         
+    def _parse_episode(self, path):
+        """
+        Lê (já compilado) e indexa um arquivo de episódio sem alterar o estado do loader (seguro em outra thread).
+        Episódios grandes viram uma LazySceneTable: só o índice de posições é lido agora.
+        
+        Returns:
+            Tupla (cenas, ordem, número_do_episódio, número_do_capítulo)
+        """
         # Extrai número do episódio do caminho
         ep_match = re.search(r'EP_(\d+)', path)
-        if ep_match:
-            self.current_episode = int(ep_match.group(1))
+        episode = int(ep_match.group(1)) if ep_match else None
         
         # Extrai número do capítulo do caminho
         cap_match = re.search(r'Cap_(\d+)', path)
-        if cap_match:
-            self.current_chapter = int(cap_match.group(1))
+        chapter = int(cap_match.group(1)) if cap_match else None
             
         # Identifica a chave do episódio
-        ep_key = f'EP_{self.current_episode}'
+        ep_key = f'EP_{episode if episode is not None else self.current_episode}'
+        
+        if self.lazy_threshold_bytes is not None and os.path.getsize(path) >= self.lazy_threshold_bytes:
+            index = load_episode_index(path, ep_key, self.compiler.cache_dir)
+            if index is None:
+                raise ValueError(f"Episódio '{ep_key}' não encontrado em {path}")
+            order, spans = SceneOrder(index[0]), index[1]
+            print(f"[DATA_LOADER] Episódio indexado (carregamento sob demanda): {path} ({len(order)} cenas)")
+            return LazySceneTable(path, order, spans), order, episode, chapter
+        
+        data = self.compiler.load(path)
         if ep_key not in data:
             raise ValueError(f"Episódio '{ep_key}' não encontrado em {path}")
             
@@ -33,20 +71,100 @@ class DataLoader:
         for scene in data[ep_key]:
             scenes[scene['id']] = scene
             order.append(scene['id'])
-        return scenes, order
+        return scenes, SceneOrder(order), episode, chapter
     
-    def load_room(self, room_name):
-        """Carrega cenas de um cômodo/sala específico"""
+    def get_room_path(self, room_name):
+        """Retorna o caminho do arquivo de um cômodo do capítulo atual"""
         base_path = f'Game/data/script/Cap/Cap_{self.current_chapter}/Comodos'
-        room_path = os.path.join(base_path, f'{room_name}.json')
+        return os.path.join(base_path, f'{room_name}.json')
+    
+    def load_room(self, room_name):
+        """
+        Carrega cenas de um cômodo/sala específico. O resultado fica em memória e é
+        reaproveitado até o arquivo mudar no disco.
+        """
+        room_path = self.get_room_path(room_name)
+        
+        # Leitura em segundo plano já agendada: espera por ela (ela preenche o cache)
+        future = self._room_futures.pop(room_path, None)
+        if future is not None:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"[DATA_LOADER] ERRO no pré-carregamento do cômodo '{room_name}': {e}")
         
+        cached = self._cached_room(room_path)
+        if cached:
+            scenes, order = cached
+            print(f"[DATA_LOADER] Cômodo '{room_name}' reaproveitado da memória ({len(scenes)} cenas)")
+            return scenes, order
+        return self._read_room(room_name, room_path)
+    
+    def preload_room(self, room_name):
+        """
+        Agenda a leitura de um cômodo em uma thread, se ainda não estiver em memória
+        
+        Returns:
+            Future da leitura (a recém-agendada ou a que já estava em andamento) ou None
+        """
+        room_path = self.get_room_path(room_name)
+        if room_path in self._room_futures:
+            return self._room_futures[room_path]
+        if not os.path.exists(room_path) or self._cached_room(room_path):
+            return None
+        future = self._submit(self._read_room, room_name, room_path)
+        self._room_futures[room_path] = future
+        return future
+    
+    def room_exists(self, room_name):
+        """Verifica se o arquivo do cômodo existe no capítulo atual"""
+        return os.path.exists(self.get_room_path(room_name))
+    
+    def room_pending(self, room_name):
+        """Verifica se a leitura do cômodo em segundo plano ainda não terminou"""
+        future = self._room_futures.get(self.get_room_path(room_name))
+        return future is not None and not future.done()
+    
+    def peek_room(self, room_name):
+        """
+        Retorna (cenas, ordem) do cômodo se ele já estiver em memória, sem ler o arquivo nem
+        esperar leituras em andamento (usar na thread principal)
+        
+        Returns:
+            Tupla (cenas, ordem) ou None
+        """
+        room_path = self.get_room_path(room_name)
+        future = self._room_futures.get(room_path)
+        if future is not None:
+            if not future.done():
+                return None
+            del self._room_futures[room_path]
+            if not future.cancelled() and future.exception() is not None:
+                print(f"[DATA_LOADER] ERRO no pré-carregamento do cômodo '{room_name}': {future.exception()}")
+        return self._cached_room(room_path)
+    
+    def _cached_room(self, room_path):
+        """Retorna (cenas, ordem) do cache se o arquivo não mudou desde a leitura (ou None)"""
+        cached = self._room_cache.get(room_path)
+        if not cached:
+            return None
+        try:
+            stat = os.stat(room_path)
+        except OSError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) != cached[:2]:
+            return None
+        return cached[2], cached[3]
+    
+    def _read_room(self, room_name, room_path):
+        """Lê um cômodo do disco e guarda no cache em memória (seguro em outra thread)"""
         if not os.path.exists(room_path):
             print(f"[DATA_LOADER] ERRO: Cômodo '{room_name}' não encontrado em {room_path}")
             return None, None
             
         try:
-            with open(room_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            stat = os.stat(room_path)
+            data = self.compiler.load(room_path)
             
             # Identifica a chave do cômodo
             if room_name not in data:
@@ -58,7 +176,9 @@ class DataLoader:
             for scene in data[room_name]:
                 scenes[scene['id']] = scene
                 order.append(scene['id'])
+            order = SceneOrder(order)
             
+            self._room_cache[room_path] = (stat.st_mtime_ns, stat.st_size, scenes, order)
             print(f"[DATA_LOADER] Cômodo '{room_name}' carregado com {len(scenes)} cenas")
             return scenes, order
             
@@ -76,10 +196,59 @@ class DataLoader:
             return next_path
         return None
     
+    def maybe_preload_next_episode(self, scene_id, scenes_order):
+        """
+        Começa a ler o próximo episódio em segundo plano se a cena atual estiver
+        a até `preload_distance` cenas do fim do episódio
+        
+        Args:
+            scene_id: Id da cena atual
+            scenes_order: Ordem das cenas do episódio atual
+        """
+        remaining = SceneOrder.of(scenes_order).remaining_after(scene_id)
+        if remaining is not None and remaining <= self.preload_distance:
+            self.preload_next_episode()
+    
+    def preload_next_episode(self):
+        """Agenda a leitura do próximo episódio em uma thread (se existir e ainda não agendado)"""
+        next_path = self.get_next_episode_path()
+        if not next_path or (self._next_episode and self._next_episode[0] == next_path):
+            return
+        print(f"[DATA_LOADER] Pré-carregando próximo episódio: {next_path}")
+        self._next_episode = (next_path, self._submit(self._parse_episode, next_path))
+    
+    def _submit(self, fn, *args):
+        """Executa `fn` na thread de pré-carregamento (criada no primeiro uso)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='data_preload')
+        return self._executor.submit(fn, *args)
+    
     def load_next_episode(self):
-        """Carrega o próximo episódio se existir"""
+        """Carrega o próximo episódio se existir (usando o resultado do pré-carregamento, se houver)"""
         next_path = self.get_next_episode_path()
-        if next_path:
-            print(f"[DATA_LOADER] Carregando próximo episódio: {next_path}")
-            return self.load_scenes(next_path)
-        return None, None
\ No newline at end of file
+        if not next_path:
+            return None, None
+            
+        preloaded, self._next_episode = self._next_episode, None
+        if preloaded and preloaded[0] == next_path:
+            try:
+                scenes, order, episode, chapter = preloaded[1].result()
+                if episode is not None:
+                    self.current_episode = episode
+                if chapter is not None:
+                    self.current_chapter = chapter
+                print(f"[DATA_LOADER] Próximo episódio pronto (pré-carregado): {next_path}")
+                return scenes, order
+            except Exception as e:
+                print(f"[DATA_LOADER] ERRO no pré-carregamento de {next_path}: {e}")
+                
+        print(f"[DATA_LOADER] Carregando próximo episódio: {next_path}")
+        return self.load_scenes(next_path)
+    
+    def shutdown(self):
+        """Encerra a thread de pré-carregamento de episódios e cômodos"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._next_episode = None
+        self._room_futures.clear()
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Carregamento indexado de episódios grandes
+Responsabilidade: Indexar a posição (em bytes) de cada cena dentro do EP_N.json e decodificar
+apenas as cenas usadas, mantendo as mais recentes em um LRU
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Tuple
+
+from .script_compiler import compile_scene
+
+INDEX_VERSION = 1
+
+# Strings JSON inteiras (com escapes) ou caracteres estruturais
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{},]')
+
+
+def scan_scene_spans(raw: bytes, key: str) -> Optional[List[Tuple[int, int]]]:
+    """
+    Localiza, sem decodificar o documento, os objetos do array `key` do nível superior
+
+    Args:
+        raw: Conteúdo do arquivo JSON
+        key: Chave do array de cenas (ex: 'EP_3')
+
+    Returns:
+        Lista de (início, fim) em bytes de cada cena, ou None se a chave não existir
+    """
+    depth = 0
+    expect_key = False
+    current_key = None
+    in_target = False
+    start = None
+    spans = []
+    for match in _TOKEN.finditer(raw):
+        token = match.group()
+        char = token[:1]
+        if char == b'"':
+            # Chaves do objeto raiz: string logo após '{' ou ',' no nível 1
+            if depth == 1 and expect_key:
+                current_key = json.loads(token)
+                expect_key = False
+        elif char == b'{' or char == b'[':
+            if char == b'[' and depth == 1 and current_key == key:
+                in_target = True
+            elif in_target and depth == 2 and char == b'{':
+                start = match.start()
+            depth += 1
+            if depth == 1:
+                expect_key = True
+        elif char == b'}' or char == b']':
+            depth -= 1
+            if in_target:
+                if depth == 2 and char == b'}':
+                    spans.append((start, match.end()))
+                elif depth == 1:
+                    return spans
+        elif depth == 1:  # ',' entre membros do objeto raiz
+            expect_key = True
+            current_key = None
+    return None
+
+
+def load_episode_index(path: str, key: str, cache_dir: str) -> Optional[Tuple[List[str], Dict[str, Tuple[int, int]]]]:
+    """
+    Retorna o índice (ordem das cenas e posição de cada uma) de um episódio, reaproveitando
+    o índice gravado em disco enquanto o arquivo não mudar
+
+    Args:
+        path: Caminho do EP_N.json
+        key: Chave do array de cenas
+        cache_dir: Diretório onde o índice é gravado
+
+    Returns:
+        Tupla (ordem, {id: (início, fim)}) ou None se a chave não existir no arquivo
+    """
+    stat = os.stat(path)
+    name = os.path.normpath(path).replace(os.sep, '_').replace(':', '_')
+    index_path = os.path.join(cache_dir, f'{name}.index.json')
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if (index.get('version') == INDEX_VERSION and index.get('key') == key
+                and index.get('source_mtime_ns') == stat.st_mtime_ns and index.get('source_size') == stat.st_size):
+            order = [entry[0] for entry in index['entries']]
+            return order, {entry[0]: (entry[1], entry[2]) for entry in index['entries']}
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    spans = scan_scene_spans(raw, key)
+    if spans is None:
+        return None
+    entries = [[json.loads(raw[start:end])['id'], start, end] for start, end in spans]
+    print(f"[EPISODE_INDEX] Índice criado: {path} ({len(entries)} cenas)")
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f'{index_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'key': key, 'source_mtime_ns': stat.st_mtime_ns,
+                       'source_size': stat.st_size, 'entries': entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        print(f"[EPISODE_INDEX] AVISO: não foi possível gravar o índice {index_path}: {e}")
+
+    order = [entry[0] for entry in entries]
+    return order, {entry[0]: (entry[1], entry[2]) for entry in entries}
+
+
+class LazySceneTable(Mapping):
+    """Tabela id -> cena (compilada) que lê cada cena do disco só quando é acessada"""
+
+    def __init__(self, path: str, order: List[str], spans: Dict[str, Tuple[int, int]], max_cached: int = 128):
+        """
+        Args:
+            path: Caminho do EP_N.json
+            order: Ids das cenas na ordem do arquivo
+            spans: Posição em bytes (início, fim) de cada cena
+            max_cached: Quantidade de cenas decodificadas mantidas em memória (LRU)
+        """
+        self.path = path
+        self.order = order
+        self._spans = spans
+        self.max_cached = max_cached
+        self._scenes = OrderedDict()  # id -> cena compilada
+        self._lock = threading.Lock()
+
+    def __getitem__(self, scene_id):
+        with self._lock:
+            scene = self._scenes.get(scene_id)
+            if scene is not None:
+                self._scenes.move_to_end(scene_id)
+                return scene
+        start, end = self._spans[scene_id]  # KeyError se a cena não existir
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            raw = f.read(end - start)
+        scene = json.loads(raw)
+        if scene.get('id') != scene_id:
+            raise RuntimeError(f"Índice desatualizado para {self.path}: esperado '{scene_id}'")
+        scene = compile_scene(scene)
+        with self._lock:
+            self._scenes[scene_id] = scene
+            while len(self._scenes) > self.max_cached:
+                self._scenes.popitem(last=False)
+        return scene
+
+    def __contains__(self, scene_id):
+        return scene_id in self._spans
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def __len__(self):
+        return len(self._spans)
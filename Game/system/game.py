@@ -5,36 +5,50 @@ Responsabilidade: Gerenciar o loop de jogo, eventos de input e progressão de ce
 
 import pygame
 import sys
-import re
 import os
 
-from .sprite_command_parser import SpriteCommandParser
+from .scene_order import SceneOrder
+from .script_compiler import compiled_line
 from .save_manager import SaveManager
+from .character_index import CharacterIndex
+from .name_index import NameIndex
 from .status_manager import StatusManager
 from .item_notification_manager import ItemNotificationManager
 from .condition_evaluator import ConditionEvaluator
+from .player_state import PlayerState
+from .asset_prefetcher import AssetPrefetcher
 
 
 class Game:
-    def __init__(self, scenes, scenes_order, characters, player_name, player_data, renderer, clock, data_loader=None):
+    def __init__(self, scenes, scenes_order, characters, player_name, player_data, renderer, clock, data_loader=None,
+                 character_index=None):
         self.scenes = scenes
-        self.scenes_order = scenes_order
+        self.scenes_order = SceneOrder.of(scenes_order)
         self.characters = characters
         print(f"[DEBUG INIT] Personagens carregados: {list(characters.keys())}")
         for name, data in characters.items():
             print(f"[DEBUG INIT] {name}: img={data.get('img', 'N/A')}")
         self.player_name = player_name
-        self.player_data = player_data
+        # Flags e memórias em conjuntos, inventário indexado e avisos de mudança (caches, save)
+        self.player_data = PlayerState.from_dict(player_data)
         self.renderer = renderer
         self.clock = clock
         self.data_loader = data_loader  # Referência ao DataLoader para transição entre episódios
+        self.character_index = character_index or CharacterIndex()  # Manifesto dos arquivos de personagens
+        # Índice de nomes compartilhado com o TextProcessor (falantes, [Nome] e comandos de sprite)
+        text_processor = getattr(renderer, 'text_processor', None)
+        self.name_index = text_processor.name_index if text_processor is not None else NameIndex()
+        self.name_index.bind(self.characters, self.player_name)
         self.current_scene_id = "1"
         self.current_text_index = 1
-        self.inventory = self.player_data.get('inventario', [])
+        self.inventory = self.player_data.inventory
         
         # Flag para controle de transição de cena
         self.scene_transitioning = False
         
+        # Modo ocioso: sem animações pendentes, o loop bloqueia esperando eventos
+        self.idle_timeout_ms = 500
+        
         # Stack para gerenciar entrada/saída de cômodos
         self.room_stack = []  # [(scenes, scenes_order, scene_id, text_index), ...]
         self.in_room = False
@@ -42,9 +56,19 @@ class Game:
         # Managers especializados
         self.sprite_manager = renderer.sprite_manager
         self.save_manager = SaveManager()
-        self.status_manager = StatusManager(self.characters)
+        self.save_manager.track(self.player_data)
         self.notification_manager = ItemNotificationManager(duration=180, fps=60)
-        self.condition_evaluator = ConditionEvaluator(self.characters, self.player_data)
+        self.condition_evaluator = ConditionEvaluator(self.characters, self.player_data, self.character_index)
+        self.status_manager = StatusManager(self.characters, character_index=self.character_index,
+                                            on_change=self.condition_evaluator.character_changed)
+        self.prefetcher = AssetPrefetcher(
+            renderer.background_manager,
+            self.sprite_manager,
+            self.characters,
+            self.data_loader,
+            self._is_room_reference,
+            self.name_index
+        )
         
         # Carrega estado inicial
         self._load_initial_state()
@@ -72,7 +96,11 @@ class Game:
         buttons = None
         last_scene_id = None
         skip_pressed = False  # Flag para detectar quando usuário pulou texto
+        frame_dirty = True  # Força o desenho do primeiro frame
         while running:
+            # Recebe imagens pré-carregadas em segundo plano
+            self.prefetcher.pump()
+
             scene = self.scenes.get(self.current_scene_id)
             if not scene:
                 print("Scene not found:", self.current_scene_id)
@@ -80,6 +108,7 @@ class Game:
                 continue
             # Reset buttons when scene changes
             if last_scene_id != self.current_scene_id:
+                frame_dirty = True
                 buttons = None
                 last_scene_id = self.current_scene_id
                 skip_pressed = False  # Reset skip flag em nova cena
@@ -127,39 +156,24 @@ class Game:
                 if 'add_item' in scene:
                     item = scene['add_item']
                     # Normalizar item para dicionário se for string
-                    if isinstance(item, str):
-                        item_dict = {'nome': item, 'quantidade': 1}
-                        self.player_data['inventario'].append(item_dict)
-                        self.notification_manager.show_notification(item_dict)
-                    else:
-                        self.player_data['inventario'].append(item)
-                        self.notification_manager.show_notification(item)
+                    self.notification_manager.show_notification(self.player_data.add_item(item))
                 
                 # Handle set_flag para marcar ações realizadas
                 if 'set_flag' in scene:
                     flag = scene['set_flag']
-                    if 'flags' not in self.player_data:
-                        self.player_data['flags'] = []
-                    if flag not in self.player_data['flags']:
-                        self.player_data['flags'].append(flag)
+                    if self.player_data.add_flag(flag):
                         print(f"[GAME] Flag definida: {flag}")
                 
                 # Handle set_flag2 (segunda flag)
                 if 'set_flag2' in scene:
                     flag = scene['set_flag2']
-                    if 'flags' not in self.player_data:
-                        self.player_data['flags'] = []
-                    if flag not in self.player_data['flags']:
-                        self.player_data['flags'].append(flag)
+                    if self.player_data.add_flag(flag):
                         print(f"[GAME] Flag definida: {flag}")
                 
                 # Handle set_memoria para marcar memórias do jogador
                 if 'set_memoria' in scene:
                     memoria = scene['set_memoria']
-                    if 'memorias' not in self.player_data:
-                        self.player_data['memorias'] = []
-                    if memoria not in self.player_data['memorias']:
-                        self.player_data['memorias'].append(memoria)
+                    if self.player_data.add_memoria(memoria):
                         print(f"[GAME] Memoria definida: {memoria}")
                 
                 # Aplicar status_infor usando StatusManager
@@ -171,9 +185,27 @@ class Game:
                 
                 # Auto-pular linhas iniciais que sejam apenas comandos ou vazias
                 self._auto_skip_command_lines(scene)
+                
+                # Pré-carrega as imagens das próximas cenas possíveis
+                self.prefetcher.schedule(scene, self.scenes, self.scenes_order)
+                
+                # Perto do fim do episódio: começa a ler o próximo em segundo plano
+                if self.data_loader and not self.room_stack:
+                    self.data_loader.maybe_preload_next_episode(self.current_scene_id, self.scenes_order)
+                
+                # Cômodos oferecidos nas opções já começam a ser lidos em segundo plano
+                self._preload_option_rooms(scene)
+
+            # Sem animação pendente e nada novo para desenhar: espera por input, timer ou o fim
+            # de um pré-carregamento (PREFETCH_DONE_EVENT); o frame segue normalmente depois
+            if frame_dirty or self._is_animating():
+                events = pygame.event.get()
+            else:
+                events = self._wait_for_events()
+            frame_dirty = False
 
             # Process events using current button objects (from previous frame)
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.MOUSEMOTION and buttons:
@@ -183,6 +215,7 @@ class Game:
                 elif event.type == pygame.KEYDOWN:
                     # "esc" para encerrar o jogo
                     if event.key == pygame.K_ESCAPE:
+                        self._shutdown()
                         pygame.quit()
                         sys.exit()
                     elif event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
@@ -193,18 +226,15 @@ class Game:
                             
                             # Pula linhas vazias ou só com comandos automaticamente
                             while self.current_text_index <= len(scene['texto']):
-                                line = scene['texto'][self.current_text_index - 1]
-                                print(f"[DEBUG] Linha atual: {line}")
+                                line = compiled_line(scene, self.current_text_index - 1)
+                                print(f"[DEBUG] Linha atual: {line.text}")
                                 
                                 # Processa comandos de sprite
-                                commands = SpriteCommandParser.parse_sprite_command(line)
-                                for command, params in commands:
+                                for command, params in line.commands:
                                     self._process_sprite_command(command, params)
                                 
-                                # Remove comandos entre chaves e verifica se sobra texto visível
-                                stripped = re.sub(r'\{[^}]+\}', '', line).strip()
-                                
-                                if stripped == '' and self.current_text_index < len(scene['texto']):
+                                # Linha sem texto visível (só comandos entre chaves)?
+                                if line.command_only and self.current_text_index < len(scene['texto']):
                                     # Linha vazia ou só comandos - avança automaticamente
                                     print(f"[DEBUG] Auto-pulando linha vazia/comando")
                                     self.current_text_index += 1
@@ -220,30 +250,27 @@ class Game:
                                 self.current_text_index = 1
                             else:
                                 # If no options, auto-advance to the next scene in file order
-                                if not buttons:
-                                    try:
-                                        idx = self.scenes_order.index(self.current_scene_id)
-                                        if idx + 1 < len(self.scenes_order):
-                                            # Marcar que estamos em transição de cena
-                                            self.scene_transitioning = True
-                                            self.current_scene_id = self.scenes_order[idx + 1]
-                                            self.current_text_index = 1
-                                        else:
-                                            # Chegou ao fim do episódio, tenta carregar próximo
-                                            if self.data_loader:
-                                                new_scenes, new_order = self.data_loader.load_next_episode()
-                                                if new_scenes and new_order:
-                                                    print(f"[GAME] Transição para próximo episódio")
-                                                    # Marcar que estamos em transição de cena
-                                                    self.scene_transitioning = True
-                                                    self.scenes = new_scenes
-                                                    self.scenes_order = new_order
-                                                    self.current_scene_id = new_order[0] if new_order else "1"
-                                                    self.current_text_index = 1
-                                                else:
-                                                    print(f"[GAME] Fim do conteúdo - nenhum episódio seguinte encontrado")
-                                    except ValueError:
-                                        pass
+                                if not buttons and self.current_scene_id in self.scenes_order:
+                                    next_id = self.scenes_order.successor(self.current_scene_id)
+                                    if next_id is not None:
+                                        # Marcar que estamos em transição de cena
+                                        self.scene_transitioning = True
+                                        self.current_scene_id = next_id
+                                        self.current_text_index = 1
+                                    else:
+                                        # Chegou ao fim do episódio, tenta carregar próximo
+                                        if self.data_loader:
+                                            new_scenes, new_order = self.data_loader.load_next_episode()
+                                            if new_scenes and new_order:
+                                                print(f"[GAME] Transição para próximo episódio")
+                                                # Marcar que estamos em transição de cena
+                                                self.scene_transitioning = True
+                                                self.scenes = new_scenes
+                                                self.scenes_order = new_order
+                                                self.current_scene_id = new_order[0] if new_order else "1"
+                                                self.current_text_index = 1
+                                            else:
+                                                print(f"[GAME] Fim do conteúdo - nenhum episódio seguinte encontrado")
                 elif event.type == pygame.MOUSEBUTTONDOWN and buttons:
                     mouse_pos = pygame.mouse.get_pos()
                     for button, next_scene, option_data in buttons:
@@ -251,10 +278,7 @@ class Game:
                             # Processar ações da opção antes de mudar de cena
                             if 'set_memoria' in option_data:
                                 memoria = option_data['set_memoria']
-                                if 'memorias' not in self.player_data:
-                                    self.player_data['memorias'] = []
-                                if memoria not in self.player_data['memorias']:
-                                    self.player_data['memorias'].append(memoria)
+                                if self.player_data.add_memoria(memoria):
                                     print(f"[GAME] Memoria definida pela opção: {memoria}")
                             
                             # Verificar se next_scene é um cômodo
@@ -295,6 +319,35 @@ class Game:
             # Cap frame rate
             self.clock.tick(60)
 
+        self._shutdown()
+
+    def _shutdown(self):
+        """Encerra o pré-carregamento e registra as estatísticas do cache de imagens"""
+        self.prefetcher.shutdown()
+        if self.data_loader:
+            self.data_loader.shutdown()
+        print(f"[GAME] Cache de imagens: {self.renderer.assets.get_stats()}")
+        print(f"[GAME] Cache de opções: {self.condition_evaluator.get_stats()}")
+
+    def _is_animating(self) -> bool:
+        """Verifica se há alguma animação em andamento (fade de sprite, texto lento, notificação)"""
+        if self.sprite_manager and self.sprite_manager.is_animating():
+            return True
+        text_processor = self.renderer.text_processor
+        if text_processor and text_processor.is_animating():
+            return True
+        return self.notification_manager.timer > 0
+
+    def _wait_for_events(self) -> list:
+        """
+        Bloqueia até chegar um evento (input, timer ou fim de um pré-carregamento) ou até `idle_timeout_ms`.
+        Retorna a lista de eventos pendentes (vazia se o tempo esgotou).
+        """
+        event = pygame.event.wait(self.idle_timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
     def _process_sprite_command(self, command: str, params: dict):
         """Processa comandos de sprite"""
         if command == 'add':
@@ -303,12 +356,7 @@ class Game:
             expression = params.get('expression', '')
             
             # Normalizar nome do personagem (case-insensitive)
-            actual_char_name = None
-            char_lower = char_name.lower()
-            for name in self.characters.keys():
-                if name.lower() == char_lower:
-                    actual_char_name = name
-                    break
+            actual_char_name = self.name_index.bind(self.characters, self.player_name).find(char_name)
                     
             if actual_char_name and actual_char_name in self.characters:
                 char_data = self.characters[actual_char_name]
@@ -352,34 +400,23 @@ class Game:
             return
         # `self.current_text_index` é 1-based (1 = primeiro elemento em texto[0])
         while 1 <= self.current_text_index <= len(scene['texto']):
-            line = scene['texto'][self.current_text_index - 1]
-            
-            # Verificar se a linha contém comandos de texto especiais que devem ser exibidos
-            has_tex_time = '@tex_time[' in line
-            
-            # Verificar se a linha é APENAS um comando jump_text
-            jump_match = re.match(r'^\s*@jump_text\[\d+\]\s*$', line)
-            has_only_jump_text = jump_match is not None
+            line = compiled_line(scene, self.current_text_index - 1)
             
             # Se tem tex_time, nunca pular (é conteúdo de texto)
-            if has_tex_time:
+            if line.has_tex_time:
                 break
             
             # Se tem APENAS jump_text (linha inteira é o comando), pular pois será processado na renderização
-            if has_only_jump_text:
+            if line.jump_only:
                 # Avançar para próxima linha - o jump_text será processado quando usuário pular
-                print(f"[DEBUG] Linha jump_text detectada (será processada na renderização): {line}")
+                print(f"[DEBUG] Linha jump_text detectada (será processada na renderização): {line.text}")
                 self.current_text_index += 1
                 continue
             
-            # Remove comandos entre chaves e verifica se sobra texto
-            stripped = re.sub(r'\{[^}]+\}', '', line).strip()
-            
-            if stripped == '':
+            if line.command_only:
                 # Linha vazia ou só comandos - processa e pula
-                print(f"[DEBUG] Auto-pulando linha vazia/comando: {line}")
-                commands = SpriteCommandParser.parse_sprite_command(line)
-                for command, params in commands:
+                print(f"[DEBUG] Auto-pulando linha vazia/comando: {line.text}")
+                for command, params in line.commands:
                     self._process_sprite_command(command, params)
                 # Avança para a próxima linha (1-based)
                 self.current_text_index += 1
@@ -394,6 +431,15 @@ class Game:
         # Exemplos: quarto_1, cozinha, biblioteca
         return scene_id not in self.scenes and '_' in scene_id
     
+    def _preload_option_rooms(self, scene: dict):
+        """Agenda a leitura dos cômodos referenciados pelas opções da cena"""
+        if not self.data_loader:
+            return
+        for option in scene.get('opcoes', []) or []:
+            target = self.renderer.ui_manager.get_option_target(option)
+            if target and self._is_room_reference(target):
+                self.data_loader.preload_room(target)
+    
     def _enter_room(self, room_name: str):
         """Entra em um cômodo, salvando o estado atual"""
         if not self.data_loader:
@@ -0,0 +1,97 @@
+"""
+Índice de nomes de personagens
+Responsabilidade: Resolver tokens de falante, marcações [Nome] e nomes de comandos de sprite
+para o nome do personagem, com tabelas refeitas só quando o conjunto de personagens muda
+"""
+
+import re
+from typing import Dict, Optional
+
+# Tokens de falante que se referem ao jogador, ex: "{nome_player}: ..."
+PLAYER_ALIASES = ('nome_jogador', 'nome_player', 'player_name')
+
+_NON_NAME_CHARS = re.compile(r'[^a-z0-9]')
+
+
+def normalize_token(token: str) -> str:
+    """Forma normalizada (a-z0-9, demais caracteres viram _) usada para casar tokens com nomes"""
+    return _NON_NAME_CHARS.sub('_', token.lower())
+
+
+class NameIndex:
+    """Tabelas nome normalizado / minúsculo / apelido do jogador -> nome do personagem"""
+
+    def __init__(self, characters: Optional[Dict[str, dict]] = None, player_name: Optional[str] = None):
+        """
+        Args:
+            characters: Dicionário de personagens (as chaves são os nomes)
+            player_name: Nome do jogador (destino dos apelidos de PLAYER_ALIASES)
+        """
+        self.version = 0  # Incrementada a cada reconstrução (usada como chave de caches)
+        self.player_name = None
+        self._characters = None
+        self._size = -1
+        self._by_norm: Dict[str, str] = {}
+        self._by_lower: Dict[str, str] = {}
+        if characters is not None:
+            self.bind(characters, player_name)
+
+    def bind(self, characters: Dict[str, dict], player_name: Optional[str]) -> 'NameIndex':
+        """
+        Associa o índice ao dicionário de personagens e ao nome do jogador, reconstruindo as
+        tabelas apenas se algum deles mudou (personagens só são adicionados, nunca removidos)
+
+        Returns:
+            O próprio índice
+        """
+        if characters is not self._characters or len(characters) != self._size or player_name != self.player_name:
+            self._characters = characters
+            self._size = len(characters)
+            self.player_name = player_name
+            self._rebuild()
+        return self
+
+    def invalidate(self):
+        """Força a reconstrução na próxima chamada de bind()"""
+        self._characters = None
+
+    def _refresh(self):
+        """Reconstrói as tabelas se personagens foram adicionados ao dicionário associado desde o último bind"""
+        if self._characters is not None and len(self._characters) != self._size:
+            self._size = len(self._characters)
+            self._rebuild()
+
+    def _rebuild(self):
+        # Marcações [Nome]: o último personagem com o mesmo nome normalizado prevalece
+        self._by_norm = {normalize_token(name): name for name in self._characters}
+        # Comandos de sprite: o primeiro personagem com o mesmo nome em minúsculas prevalece
+        self._by_lower = {}
+        for name in self._characters:
+            self._by_lower.setdefault(name.lower(), name)
+        self.version += 1
+
+    def normalized(self, norm: str) -> Optional[str]:
+        """Nome do personagem para um token já normalizado (ou None)"""
+        self._refresh()
+        return self._by_norm.get(norm)
+
+    def find(self, name: str) -> Optional[str]:
+        """Nome do personagem ignorando maiúsculas/minúsculas (ou None)"""
+        self._refresh()
+        return self._by_lower.get(name.lower())
+
+    def speaker(self, token: str, norm: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve o token de falante de "{Token}: fala"
+
+        Args:
+            token: Token como está na linha
+            norm: Token já normalizado (evita normalizar de novo)
+
+        Returns:
+            Nome do jogador para os apelidos, nome do personagem correspondente ou None
+        """
+        if token.lower() in PLAYER_ALIASES:
+            return self.player_name
+        self._refresh()
+        return self._by_norm.get(norm if norm is not None else normalize_token(token))
@@ -0,0 +1,233 @@
+"""
+Estado do jogador
+Responsabilidade: Guardar flags, memórias, atributos e inventário do jogador com buscas O(1),
+avisar os interessados (caches, save) a cada mudança e serializar no mesmo formato do player.json
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+STATE_SETS = ('flags', 'memorias')  # Campos do JSON que são conjuntos de nomes
+
+
+def item_key(name: str) -> str:
+    """Forma usada para comparar nomes de itens (sem espaços nas pontas, minúsculas)"""
+    return str(name).strip().lower()
+
+
+class PlayerState:
+    """Dados do jogador (o conteúdo do player.json) com flags/memórias em conjuntos e inventário indexado"""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            data: Dados do jogador no formato do player.json (não são modificados)
+        """
+        data = data or {}
+        self._order: List[str] = list(data)  # Ordem original dos campos (mantida ao serializar)
+        # Conjuntos em dicionários: busca O(1) e a ordem de inserção é preservada no JSON
+        self._sets: Dict[str, Dict[str, None]] = {key: dict.fromkeys(data.get(key) or ()) for key in STATE_SETS}
+        self._stats: Dict[str, Union[int, float]] = {
+            key: value for key, value in data.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+        self._inventory: List[Any] = list(data.get('inventario') or [])
+        self._item_counts: Dict[str, int] = {}
+        for item in self._inventory:
+            self._index_item(item)
+        self._fields: Dict[str, Any] = {
+            key: value for key, value in data.items()
+            if key not in self._stats and key not in STATE_SETS and key != 'inventario'
+        }
+        self._listeners: List[Callable[[List[tuple]], None]] = []
+
+    @classmethod
+    def from_dict(cls, data: Union['PlayerState', Dict[str, Any], None]) -> 'PlayerState':
+        """Retorna `data` se já for um PlayerState, senão cria um a partir do dicionário"""
+        return data if isinstance(data, PlayerState) else cls(data)
+
+    # ----- Notificações -----
+
+    def subscribe(self, callback: Callable[[List[tuple]], None]):
+        """
+        Registra uma função chamada a cada mudança
+
+        Args:
+            callback: Recebe a lista de chaves alteradas: ('flags', nome), ('memorias', nome)
+                      ou ('player', campo) — as mesmas usadas pelo ConditionEvaluator
+        """
+        self._listeners.append(callback)
+
+    def _publish(self, keys: List[tuple]):
+        for callback in self._listeners:
+            callback(keys)
+
+    # ----- Flags e memórias -----
+
+    @property
+    def flags(self):
+        """Flags definidas (visão somente leitura, busca O(1))"""
+        return self._sets['flags'].keys()
+
+    @property
+    def memorias(self):
+        """Memórias definidas (visão somente leitura, busca O(1))"""
+        return self._sets['memorias'].keys()
+
+    def get_set(self, key: str):
+        """Visão somente leitura de 'flags' ou 'memorias'"""
+        return self._sets[key].keys()
+
+    def has_flag(self, name: str) -> bool:
+        return name in self._sets['flags']
+
+    def has_memoria(self, name: str) -> bool:
+        return name in self._sets['memorias']
+
+    def add_flag(self, name: str) -> bool:
+        """Define uma flag. Retorna True se ela ainda não estava definida"""
+        return self._add_to_set('flags', name)
+
+    def add_memoria(self, name: str) -> bool:
+        """Define uma memória. Retorna True se ela ainda não estava definida"""
+        return self._add_to_set('memorias', name)
+
+    def _add_to_set(self, key: str, name: str) -> bool:
+        values = self._sets[key]
+        if name in values:
+            return False
+        values[name] = None
+        if key not in self._order:
+            self._order.append(key)
+        self._publish([(key, name)])
+        return True
+
+    # ----- Atributos -----
+
+    @property
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Atributos numéricos (vida, forca...) — use set_stat/adjust_stat para alterar"""
+        return dict(self._stats)
+
+    def get_stat(self, name: str, default: Union[int, float, None] = None):
+        return self._stats.get(name, default)
+
+    def set_stat(self, name: str, value: Union[int, float]):
+        """
+        Altera um atributo numérico, mantendo inteiros como inteiros
+
+        Raises:
+            TypeError: Se o valor não for numérico
+        """
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"atributo '{name}' deve ser numérico, recebido {value!r}")
+        if isinstance(self._stats.get(name), int) and float(value).is_integer():
+            value = int(value)
+        if self._stats.get(name) == value and name in self._stats:
+            return
+        if name not in self._order:
+            self._order.append(name)
+        self._fields.pop(name, None)
+        self._stats[name] = value
+        self._publish([('player', name)])
+
+    def adjust_stat(self, name: str, delta: Union[int, float]):
+        """Soma `delta` a um atributo numérico (0 se ainda não existir)"""
+        self.set_stat(name, self._stats.get(name, 0) + delta)
+
+    # ----- Inventário -----
+
+    @property
+    def inventory(self) -> List[Any]:
+        """Itens na ordem em que foram obtidos (não altere diretamente: use add_item)"""
+        return self._inventory
+
+    def add_item(self, item: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Adiciona um item ao inventário
+
+        Args:
+            item: Nome do item ou dicionário com 'nome' (e 'quantidade', opcional)
+
+        Returns:
+            O item adicionado (nomes viram {'nome': nome, 'quantidade': 1})
+        """
+        if isinstance(item, str):
+            item = {'nome': item, 'quantidade': 1}
+        self._inventory.append(item)
+        self._index_item(item)
+        if 'inventario' not in self._order:
+            self._order.append('inventario')
+        self._publish([('player', 'inventario')])
+        return item
+
+    def item_count(self, name: str) -> int:
+        """Quantidade total de um item no inventário (case-insensitive)"""
+        return self._item_counts.get(item_key(name), 0)
+
+    def has_item(self, name: str) -> bool:
+        return self.item_count(name) > 0
+
+    def _index_item(self, item):
+        if isinstance(item, dict):
+            name, quantity = item.get('nome'), item.get('quantidade', 1)
+        else:
+            name, quantity = item, 1
+        if name is None:
+            return
+        if isinstance(quantity, bool) or not isinstance(quantity, (int, float)):
+            quantity = 1
+        key = item_key(name)
+        self._item_counts[key] = self._item_counts.get(key, 0) + quantity
+
+    # ----- Acesso no formato do player.json -----
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Lê um campo como no dicionário do player.json ('flags'/'memorias' retornam a visão
+        do conjunto, que só serve para consulta)
+        """
+        if key in STATE_SETS:
+            return self._sets[key].keys() if key in self._order else default
+        if key == 'inventario':
+            return self._inventory if key in self._order else default
+        if key in self._stats:
+            return self._stats[key]
+        return self._fields.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._order
+
+    def set_field(self, key: str, value: Any):
+        """Altera um campo que não é flag, memória, atributo numérico nem inventário (ex: 'estatus')"""
+        if key in STATE_SETS or key == 'inventario':
+            raise KeyError(f"'{key}' tem métodos próprios em PlayerState")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            self.set_stat(key, value)
+            return
+        if key not in self._order:
+            self._order.append(key)
+        self._stats.pop(key, None)
+        self._fields[key] = value
+        self._publish([('player', key)])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dados no formato do player.json (mesma ordem de campos do arquivo lido)"""
+        data = {}
+        for key in self._order:
+            if key in STATE_SETS:
+                data[key] = list(self._sets[key])
+            elif key == 'inventario':
+                data[key] = list(self._inventory)
+            elif key in self._stats:
+                data[key] = self._stats[key]
+            else:
+                data[key] = self._fields[key]
+        return data
+
+    def keys(self) -> Iterable[str]:
+        return list(self._order)
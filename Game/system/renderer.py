@@ -4,16 +4,19 @@ Responsabilidade: Orquestrar a renderização completa de uma cena (background,
 """
 
 import pygame
-import re
 import os
 
+from .script_compiler import compiled_line
 from .ui_manager import UIManager
 from .sprite_manager import SpriteManager
 from .background_manager import BackgroundManager
+from .baked_assets import BakedAssetStore
+from .asset_manager import AssetManager
 
 
 class Renderer:
-    def __init__(self, screen, font, title_font, screen_width, screen_height, white, black, gray):
+    def __init__(self, screen, font, title_font, screen_width, screen_height, white, black, gray, dirty_rects=False,
+                 asset_budget_bytes=128 * 1024 * 1024):
         self.screen = screen
         self.font = font
         self.title_font = title_font
@@ -22,94 +25,150 @@ class Renderer:
         self.white = white
         self.black = black
         self.gray = gray
-        self.ui_manager = UIManager(screen_width, screen_height)
+        # Cache único de imagens (backgrounds, sprites, botões e painéis) com orçamento de memória
+        self.assets = AssetManager(asset_budget_bytes)
+        self.ui_manager = UIManager(screen_width, screen_height, assets=self.assets)
         self.text_processor = None  # Will be set later
         
+        # Variantes de imagens pré-escaladas (geradas por tools/bake_assets.py)
+        self.baked_store = BakedAssetStore()
+        
         # Sistema de sprites
         sprite_base_path = os.path.join('Game', 'data', 'script', 'imgs', 'NPC')
-        self.sprite_manager = SpriteManager(screen_width, screen_height, sprite_base_path)
+        self.sprite_manager = SpriteManager(screen_width, screen_height, sprite_base_path,
+                                            assets=self.assets, baked_store=self.baked_store)
         
         # Sistema de backgrounds
-        self.background_manager = BackgroundManager(screen_width, screen_height)
+        self.background_manager = BackgroundManager(screen_width, screen_height, assets=self.assets,
+                                                    baked_store=self.baked_store)
+        
+        # Modo de regiões sujas: envia ao display apenas as áreas que mudaram
+        self.dirty_rects = dirty_rects
+        self._layer_state = {}  # camada -> (estado, retângulos) do último frame
+        self._dirty = []  # retângulos alterados no frame atual
+        self._last_scene = None
+        self._full_update = True
+        
+        # Camada estática composta (fundo + título + moldura da caixa de texto)
+        self._static_layer = None
+        self._static_key = None
+        self._text_box_inner = None
 
-    def display_scene(self, scene, player_name, text_index, characters, text_processor, buttons=None, sprite_manager=None, item_notification=None, condition_evaluator=None, skip_pressed=False):
-        # Always clear the screen with background color first
-        self.screen.fill(self.ui_manager.background_color)
+    def request_full_update(self):
+        """Força o próximo frame a atualizar a tela inteira"""
+        self._full_update = True
+
+    def _mark_layer(self, layer, rects, state):
+        """
+        Registra o que uma camada desenhou neste frame. Se o estado ou a área
+        mudaram em relação ao frame anterior, as áreas antigas e novas viram sujas.
+        """
+        rects = [pygame.Rect(r) for r in rects if r]
+        previous = self._layer_state.get(layer)
+        if previous is None or previous[0] != state or previous[1] != rects:
+            if previous is not None:
+                self._dirty.extend(previous[1])
+            self._dirty.extend(rects)
+        self._layer_state[layer] = (state, rects)
+
+    def _present(self):
+        """Envia o frame composto para o display (inteiro ou apenas regiões sujas)"""
+        if not self.dirty_rects or self._full_update:
+            pygame.display.flip()
+            self._full_update = False
+        elif self._dirty:
+            pygame.display.update(self._dirty)
+        self._dirty = []
+
+    def _build_static_layer(self, scene, title, box_x, box_y, box_width, box_height):
+        """Compõe em uma única surface as partes da cena que não mudam entre frames"""
+        if self._static_layer is None or self._static_layer.get_size() != self.screen.get_size():
+            self._static_layer = pygame.Surface(self.screen.get_size(), 0, self.screen)
+        layer = self._static_layer
+        layer.fill(self.ui_manager.background_color)
 
         # Background image usando BackgroundManager
         if 'img_fundo' in scene and scene['img_fundo']:
-            self.background_manager.render_background(
-                self.screen, 
-                scene['img_fundo'], 
-                fit_mode='fit'
-            )
-
-        # Character sprites (after background, before text box) - usando novo sistema
-        if sprite_manager:
-            sprite_manager.update()
-            sprite_manager.render(self.screen)
+            self.background_manager.render_background(layer, scene['img_fundo'], fit_mode='fit')
 
         # Title
-        title = text_processor.replace_placeholders(scene['titulo'], player_name, characters)
-        self.ui_manager.draw_title(self.screen, title)
+        self.ui_manager.draw_title(layer, title)
+
+        # Text box frame
+        self._text_box_inner = self.ui_manager.draw_text_box(layer, "", box_x, box_y, box_width, box_height)
 
-        # Text box and dialogue (responsive layout)
+    def display_scene(self, scene, player_name, text_index, characters, text_processor, buttons=None, sprite_manager=None, item_notification=None, condition_evaluator=None, skip_pressed=False):
+        # Nova cena: a tela inteira muda
+        if scene is not self._last_scene:
+            self._last_scene = scene
+            self._full_update = True
+
+        # Text box layout (responsive)
         margin_x = int(self.screen_width * 0.04)
         margin_y = int(self.screen_height * 0.03)
         box_width = self.screen_width - margin_x * 2
         box_height = max(int(self.screen_height * 0.20), 120)
         box_x = margin_x
         box_y = self.screen_height - box_height - margin_y
-        text_box_inner = self.ui_manager.draw_text_box(self.screen, "", box_x, box_y, box_width, box_height)
+
+        # Camada estática (fundo, título e moldura da caixa de texto): composta uma vez por cena
+        title = text_processor.replace_placeholders(scene['titulo'], player_name, characters)
+        static_key = (scene.get('img_fundo'), title, self.screen.get_size(), (box_x, box_y, box_width, box_height))
+        if static_key != self._static_key:
+            self._build_static_layer(scene, title, box_x, box_y, box_width, box_height)
+            self._static_key = static_key
+        self.screen.blit(self._static_layer, (0, 0))
+        self._mark_layer('static', [self.screen.get_rect()], static_key)
+        text_box_inner = self._text_box_inner
+
+        # Character sprites (dynamic layer, drawn over the static chrome)
+        if sprite_manager:
+            sprite_manager.update()
+            sprite_rects = sprite_manager.render(self.screen)
+            self._mark_layer('sprites', sprite_rects, sprite_manager.render_state())
+
+        speaker_rects = []
+        speaker_state = None
+        dialogue_state = None
         if text_index > 0:
-            line = scene['texto'][text_index - 1]
-            replaced_line = text_processor.replace_placeholders(line, player_name, characters)
-            # Detect a leading speaker token in curly braces, e.g. "{Yuno}: Hello" or "{nome_player}:..."
-            # Mas NÃO capturar comandos especiais como tex_time, jump_text, etc
-            speaker_name = None
-            speaker_color = None
-            m = re.match(r"^\{([^}=:]+)\}\s*:\s*(.*)$", replaced_line)
-            if m:
-                token = m.group(1)
-                # If token refers to player name variants, use player_name
-                if token.lower() in ('nome_jogador', 'nome_player', 'player_name'):
-                    speaker_name = player_name
-                else:
-                    # Try to map normalized token to a character name
-                    norm = re.sub(r'[^a-z0-9]', '_', token.lower())
-                    norm_map = {}
-                    for name in characters:
-                        n = re.sub(r'[^a-z0-9]', '_', name.lower())
-                        norm_map[n] = name
-                    if norm in norm_map:
-                        speaker_name = norm_map[norm]
-                # The rest of the line after the token becomes the dialogue
-                replaced_line = m.group(2)
-                if speaker_name:
-                    speaker_color = characters.get(speaker_name, {}).get('color')
-                    # Draw speaker label above text box (touching the top edge)
-                    if speaker_color:
-                        self.ui_manager.draw_speaker_label(self.screen, speaker_name, speaker_color, box_x, box_y)
+            # Linha já analisada pelo ScriptCompiler: falante ("{Yuno}: Olá", "{nome_player}: ..."),
+            # placeholders e efeitos de texto só são resolvidos, sem regex por frame
+            dialogue = text_processor.resolve_dialogue(compiled_line(scene, text_index - 1), player_name, characters)
+            speaker_name = dialogue.speaker
+            if speaker_name:
+                speaker_color = characters.get(speaker_name, {}).get('color')
+                # Draw speaker label above text box (touching the top edge)
+                if speaker_color:
+                    speaker_rects.append(self.ui_manager.draw_speaker_label(self.screen, speaker_name, speaker_color, box_x, box_y))
+                    speaker_state = (speaker_name, speaker_color)
             # Passe também a largura útil da caixa interna para que o texto quebre corretamente
             text_finished, has_slow_text = self.ui_manager.draw_dialogue(
                 self.screen,
-                replaced_line,
+                dialogue.text,
                 text_processor,
                 characters,
                 text_box_inner.x + 10,
                 text_box_inner.y + 10,
                 text_box_inner.width - 20,
-                skip_pressed
+                skip_pressed,
+                dialogue=dialogue
             )
+            dialogue_state = (dialogue, skip_pressed, text_finished, text_processor.render_state())
+        self._mark_layer('speaker', speaker_rects, speaker_state)
+        self._mark_layer('dialogue', [text_box_inner], dialogue_state)
 
         # Options as Victorian buttons
+        button_rects = []
+        button_state = None
         if 'opcoes' in scene and text_index >= len(scene['texto']):
             # Se não houver buttons passados, crie novos
             if buttons is None:
                 # Filtra opções baseado em condições
                 opcoes_filtradas = scene['opcoes']
                 if condition_evaluator:
-                    opcoes_filtradas = condition_evaluator.filter_options_by_conditions(scene['opcoes'])
+                    compiled = scene.get('_compiled')
+                    opcoes_filtradas = condition_evaluator.filter_options_by_conditions(
+                        scene['opcoes'], compiled.option_conditions if compiled is not None else None, scene=scene)
                     if len(opcoes_filtradas) < len(scene['opcoes']):
                         print(f"[RENDERER] Opções filtradas: {len(scene['opcoes'])} -> {len(opcoes_filtradas)}")
                 
@@ -122,13 +181,17 @@ class Renderer:
             # Desenha os botões atuais (se houver)
             if buttons:
                 for button, _, _ in buttons:
-                    button.draw(self.screen)
+                    button_rects.append(button.draw(self.screen))
+                button_state = tuple((button.text, button.hovered) for button, _, _ in buttons)
+        self._mark_layer('buttons', button_rects, button_state)
 
         # Desenhar notificação de item se houver
+        notification_rects = []
         if item_notification:
-            self.ui_manager.draw_item_notification(self.screen, item_notification)
+            notification_rects.append(self.ui_manager.draw_item_notification(self.screen, item_notification))
+        self._mark_layer('notification', notification_rects, id(item_notification) if item_notification else None)
 
-        pygame.display.flip()
+        self._present()
         return buttons
 
     def draw_buttons(self, buttons):
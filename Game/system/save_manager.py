@@ -6,6 +6,8 @@ Responsabilidade: Persistir e recuperar o estado do jogo (cena atual, índice de
 import json
 import os
 
+from .player_state import PlayerState
+
 
 class SaveManager:
     """Gerencia operações de save/load do jogo"""
@@ -21,6 +23,23 @@ class SaveManager:
         self.save_dir = save_dir or os.path.join('Game', 'data', 'save')
         self.save_file_path = os.path.join(self.save_dir, 'save.json')
         self.player_file_path = player_file_path or os.path.join('Game', 'data', 'script', 'Base', 'player.json')
+        self._tracked_player = None  # PlayerState observado (ver track)
+        self._player_dirty = True
+        
+    def track(self, player_state: PlayerState):
+        """
+        Observa as mudanças do estado do jogador: save_player_data só regrava o player.json
+        quando algo mudou desde a última gravação
+        
+        Args:
+            player_state: Estado do jogador (o mesmo passado depois para save_player_data)
+        """
+        self._tracked_player = player_state
+        self._player_dirty = False
+        player_state.subscribe(self._on_player_changed)
+        
+    def _on_player_changed(self, keys):
+        self._player_dirty = True
         
     def load_game_state(self, player_data: dict = None) -> dict:
         """
@@ -95,33 +114,41 @@ class SaveManager:
             print(f"[SAVE_MANAGER] ERRO ao salvar jogo: {e}")
             return False
             
-    def save_player_data(self, player_data: dict) -> bool:
+    def save_player_data(self, player_data) -> bool:
         """
         Salva os dados do jogador (inventário, status, etc)
         
         Args:
-            player_data: Dicionário com todos os dados do jogador
+            player_data: PlayerState ou dicionário com todos os dados do jogador
             
         Returns:
-            True se salvou com sucesso, False caso contrário
+            True se salvou com sucesso (ou se não havia mudanças), False caso contrário
         """
+        tracked = player_data is self._tracked_player
+        if tracked and not self._player_dirty:
+            print(f"[SAVE_MANAGER] Dados do jogador sem mudanças")
+            return True
+        if isinstance(player_data, PlayerState):
+            player_data = player_data.to_dict()
         try:
             with open(self.player_file_path, 'w', encoding='utf-8') as f:
                 json.dump(player_data, f, indent=4, ensure_ascii=False)
+            if tracked:
+                self._player_dirty = False
             print(f"[SAVE_MANAGER] Dados do jogador salvos")
             return True
         except Exception as e:
             print(f"[SAVE_MANAGER] ERRO ao salvar dados do jogador: {e}")
             return False
             
-    def save_complete(self, scene_id: str, text_index: int, player_data: dict, episode: int = 1, chapter: int = 1) -> bool:
+    def save_complete(self, scene_id: str, text_index: int, player_data, episode: int = 1, chapter: int = 1) -> bool:
         """
         Salva tanto o estado do jogo quanto os dados do jogador
         
         Args:
             scene_id: ID da cena atual
             text_index: Índice de texto atual
-            player_data: Dados completos do jogador
+            player_data: Dados completos do jogador (PlayerState ou dicionário)
             episode: Número do episódio atual
             chapter: Número do capítulo atual
             
@@ -0,0 +1,54 @@
+"""
+Ordem das cenas de um episódio ou cômodo
+Responsabilidade: Guardar a sequência de ids junto com um índice de posição e sucessor,
+para que avançar de cena não exija percorrer a lista
+"""
+
+from typing import Iterable, Optional
+
+
+class SceneOrder(tuple):
+    """
+    Ids de cena (na ordem do arquivo) com busca de posição e sucessor em O(1).
+    É imutável (tupla), então o índice de posições nunca fica desatualizado em relação à ordem.
+    """
+
+    def __new__(cls, scene_ids: Iterable[str] = ()):
+        self = super().__new__(cls, scene_ids)
+        positions = {}
+        for position, scene_id in enumerate(self):
+            positions.setdefault(scene_id, position)  # Mesma regra de list.index: primeira ocorrência
+        self._positions = positions
+        return self
+
+    @classmethod
+    def of(cls, scene_ids: Iterable[str]) -> 'SceneOrder':
+        """Retorna `scene_ids` como SceneOrder (sem copiar se já for)"""
+        return scene_ids if isinstance(scene_ids, cls) else cls(scene_ids)
+
+    def position(self, scene_id: str) -> Optional[int]:
+        """Posição da cena na ordem (ou None se não fizer parte dela)"""
+        return self._positions.get(scene_id)
+
+    def successor(self, scene_id: str) -> Optional[str]:
+        """Id da cena seguinte na ordem (ou None se for a última ou não existir)"""
+        position = self._positions.get(scene_id)
+        if position is None or position + 1 >= len(self):
+            return None
+        return self[position + 1]
+
+    def remaining_after(self, scene_id: str) -> Optional[int]:
+        """Quantas cenas vêm depois de `scene_id` (ou None se não fizer parte da ordem)"""
+        position = self._positions.get(scene_id)
+        return None if position is None else len(self) - 1 - position
+
+    def index(self, scene_id, *args):
+        if args:
+            return super().index(scene_id, *args)
+        position = self._positions.get(scene_id)
+        if position is None:
+            raise ValueError(f"{scene_id!r} is not in tuple")
+        return position
+
+    def __contains__(self, scene_id):
+        return scene_id in self._positions
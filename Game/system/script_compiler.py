@@ -0,0 +1,360 @@
+"""
+Compilador de roteiros (episódios e cômodos)
+Responsabilidade: Transformar os JSON de cenas em uma forma pré-processada — tabela de cenas,
+comandos de cada linha, falante, segmentos de texto e condições já interpretadas — guardada
+em disco e reaproveitada enquanto o arquivo de origem não mudar.
+
+O cache em disco é JSON (nunca pickle): um arquivo trocado em Game/data/cache só pode trazer
+dados, não código, e no pior caso é descartado e o roteiro é compilado de novo
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from .name_index import PLAYER_ALIASES, normalize_token
+from .script_lexer import (COMMAND, INLINE, TEXT, LexError, Token, is_hidden, lex_line, slow_text_segments,
+                           split_jump_text, sprite_actions, visible_source)
+from .text_processor import PlaceholderSlot, template_from_tokens
+
+CACHE_DIR = os.path.join('Game', 'data', 'cache')
+CACHE_VERSION = 7
+
+# Campos de uma condição que não são verificações
+NON_CONDITION_FIELDS = frozenset({'dev', 'proximo_id', 'texto', 'cena'})
+
+
+class DialogueLine(NamedTuple):
+    """Linha de 'texto' já analisada (usada por Game, Renderer e TextProcessor)"""
+    text: str  # Linha original
+    commands: Tuple[Tuple[str, dict], ...]  # Comandos de sprite (comando, parâmetros)
+    command_only: bool  # Sem texto visível depois de remover os comandos {..}
+    jump_only: bool  # A linha inteira é um @jump_text[N]
+    has_tex_time: bool  # Contém @tex_time (nunca é pulada automaticamente)
+    speaker: Optional[PlaceholderSlot]  # Falante em "{Nome}: fala" (ou None)
+    clean_body: tuple  # Texto exibido sem falante e sem @jump_text (template de compile_placeholders)
+    jump_lines: int  # N de @jump_text[N] (0 se não houver)
+    segments: Tuple[Tuple[str, tuple, float], ...]  # ('normal'/'slow', template, atraso)
+    errors: Tuple[LexError, ...]  # Problemas de sintaxe (posição na linha, mensagem)
+
+
+class CompiledScene(NamedTuple):
+    """Dados pré-processados de uma cena (guardados em scene['_compiled'])"""
+    lines: Tuple[DialogueLine, ...]
+    conditions: Optional[Tuple[tuple, ...]]  # Uma verificação compilada por item de 'condicao' (lista)
+    option_conditions: Tuple[Optional[tuple], ...]  # Por opção: verificações compiladas ou None
+
+
+def compile_line(text: str) -> DialogueLine:
+    """
+    Analisa uma linha de 'texto' uma única vez (uma passada do script_lexer)
+
+    Args:
+        text: Linha original do roteiro
+
+    Returns:
+        DialogueLine com comandos, falante, placeholders e segmentos
+    """
+    lexed = lex_line(text)
+    tokens = lexed.tokens
+
+    # Falante e corpo são extraídos do texto exibido (sem os comandos legados de sprite)
+    speaker, body = _split_speaker(_merge_text(token for token in tokens if not is_hidden(token)))
+    jump_lines, clean_body = split_jump_text(body)
+
+    significant = [token for token in tokens if token.kind != TEXT or token.source.strip()]
+    return DialogueLine(
+        text=text,
+        commands=tuple(sprite_actions(tokens)),
+        command_only=visible_source(tokens).strip() == '',
+        jump_only=len(significant) == 1 and significant[0].kind == INLINE and significant[0].name == 'jump_text',
+        has_tex_time='@tex_time[' in text,
+        speaker=speaker,
+        clean_body=template_from_tokens(clean_body),
+        jump_lines=jump_lines,
+        segments=tuple((kind, template_from_tokens(content if kind == 'normal' else lex_line(content).tokens), delay)
+                       for kind, content, delay in slow_text_segments(clean_body)),
+        errors=lexed.errors
+    )
+
+
+def _merge_text(tokens) -> list:
+    """Junta tokens de texto vizinhos (que ficam lado a lado depois de remover comandos)"""
+    merged = []
+    for token in tokens:
+        if token.kind == TEXT and merged and merged[-1].kind == TEXT:
+            previous = merged[-1]
+            merged[-1] = Token(TEXT, previous.start, token.end, previous.source + token.source)
+        else:
+            merged.append(token)
+    return merged
+
+
+def _split_speaker(tokens: list) -> Tuple[Optional[PlaceholderSlot], list]:
+    """
+    Separa o falante de "{Nome}: fala"
+
+    Returns:
+        Tupla (falante ou None, tokens da fala)
+    """
+    if len(tokens) < 2 or tokens[0].kind != COMMAND or tokens[1].kind != TEXT:
+        return None, tokens
+    name = tokens[0].source[1:-1]
+    rest = tokens[1].source.lstrip()
+    if '=' in name or ':' in name or not rest.startswith(':'):
+        return None, tokens
+    rest = rest[1:].lstrip()
+    speaker = PlaceholderSlot(name, normalize_token(name), name.lower() in PLAYER_ALIASES)
+    body = tokens[2:]
+    if rest:
+        body.insert(0, Token(TEXT, tokens[1].end - len(rest), tokens[1].end, rest))
+    return speaker, body
+
+
+def compile_expected(expected: Any) -> tuple:
+    """
+    Interpreta o valor esperado de uma verificação (operadores, faixas, texto ou número)
+
+    Returns:
+        Tupla (operador, operando...) usada por ConditionEvaluator
+    """
+    if isinstance(expected, str):
+        for prefix, op in (('<=', 'le'), ('>=', 'ge'), ('<', 'lt'), ('>', 'gt')):
+            if expected.startswith(prefix):
+                try:
+                    return (op, float(expected[len(prefix):]))
+                except ValueError:
+                    return (op, None)  # Operando inválido: a verificação nunca passa
+        if '-' in expected and expected[0].isdigit():
+            try:
+                min_val, max_val = expected.split('-')
+                return ('range', float(min_val), float(max_val), expected.strip().lower(), expected)
+            except ValueError:
+                pass
+        return ('str', expected.strip().lower(), expected)
+    if isinstance(expected, (int, float)):
+        return ('num', float(expected))
+    return ('eq', expected)
+
+
+def compile_check(field: str, expected: Any) -> tuple:
+    """
+    Compila uma verificação 'campo: valor' de uma condição
+
+    Returns:
+        ('flag', nome, negada), ('memoria', nome, negada) ou
+        ('field', personagem_ou_None, atributo, valor_esperado_compilado)
+    """
+    kind = field.lower()
+    if kind in ('flag', 'memoria'):
+        if isinstance(expected, str) and expected.startswith('!'):
+            return (kind, expected[1:], True)
+        return (kind, expected, False)
+
+    # Separa o nome do personagem se necessário (ex: yuno_humor -> yuno, humor)
+    parts = field.split('_', 1)
+    if len(parts) == 2:
+        return ('field', parts[0].lower(), parts[1], compile_expected(expected))
+    return ('field', None, field, compile_expected(expected))
+
+
+def compile_condition(condition: Dict[str, Any]) -> tuple:
+    """Compila todas as verificações de uma condição (ignorando campos como 'dev' e 'proximo_id')"""
+    return tuple(compile_check(key, value) for key, value in condition.items()
+                 if key not in NON_CONDITION_FIELDS)
+
+
+def compile_scene(scene: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Retorna uma cópia da cena com os dados pré-processados em scene['_compiled']
+
+    Args:
+        scene: Cena como está no JSON
+
+    Returns:
+        Cena compilada
+    """
+    conditions = scene.get('condicao')
+    compiled_conditions = None
+    if isinstance(conditions, list):
+        compiled_conditions = tuple(compile_condition(c) if isinstance(c, dict) else () for c in conditions)
+
+    option_conditions = tuple(
+        compile_condition(option['condicao'])
+        if isinstance(option, dict) and isinstance(option.get('condicao'), dict) else None
+        for option in scene.get('opcoes', []) or []
+    )
+
+    compiled = dict(scene)
+    compiled['_compiled'] = CompiledScene(
+        lines=tuple(compile_line(line) for line in scene.get('texto', [])),
+        conditions=compiled_conditions,
+        option_conditions=option_conditions
+    )
+    return compiled
+
+
+def compiled_line(scene: Dict[str, Any], index: int) -> DialogueLine:
+    """
+    Retorna a linha compilada `index` (0-based) de uma cena, compilando na hora se a cena
+    não tiver passado pelo compilador
+
+    Args:
+        scene: Cena (compilada ou não)
+        index: Índice em scene['texto']
+    """
+    compiled = scene.get('_compiled')
+    if compiled is not None:
+        return compiled.lines[index]
+    return compile_line(scene['texto'][index])
+
+
+# Tipos que podem aparecer nas cenas compiladas (gravados pelo nome; nenhum outro é aceito na leitura)
+_CACHED_TYPES = {cls.__name__: cls for cls in (CompiledScene, DialogueLine, PlaceholderSlot, LexError)}
+
+
+def _encode_cached(value: Any) -> Any:
+    """
+    Converte uma cena compilada para tipos JSON, marcando o que o JSON não distingue:
+    tuplas viram {"__tuple__": [...]} e os NamedTuple de _CACHED_TYPES, {"__type__": nome, "fields": [...]}
+
+    Raises:
+        TypeError: Se houver um valor de tipo não previsto
+    """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, list):
+        return [_encode_cached(item) for item in value]
+    if isinstance(value, tuple):
+        name = type(value).__name__
+        if type(value) is not tuple:
+            if _CACHED_TYPES.get(name) is not type(value):
+                raise TypeError(f"tipo não suportado no cache: {name}")
+            return {'__type__': name, 'fields': [_encode_cached(item) for item in value]}
+        return {'__tuple__': [_encode_cached(item) for item in value]}
+    if isinstance(value, dict):
+        encoded = {}
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"chave não suportada no cache: {key!r}")
+            encoded[key] = _encode_cached(item)
+        if '__tuple__' in encoded or '__type__' in encoded:
+            # Dicionário do próprio roteiro com uma chave de marcação: o arquivo fica sem cache
+            raise TypeError(f"chave reservada no roteiro: {sorted(encoded)}")
+        return encoded
+    raise TypeError(f"tipo não suportado no cache: {type(value).__name__}")
+
+
+def _decode_cached(obj: dict) -> Any:
+    """object_hook de json.load: desfaz as marcações de _encode_cached"""
+    if '__tuple__' in obj:
+        return tuple(obj['__tuple__'])
+    if '__type__' in obj:
+        cls = _CACHED_TYPES.get(obj['__type__'])
+        if cls is None:
+            raise ValueError(f"tipo desconhecido no cache: {obj['__type__']!r}")
+        return cls(*obj['fields'])
+    return obj
+
+
+class ScriptCompiler:
+    """Carrega arquivos de roteiro já compilados, usando o cache em disco quando válido"""
+
+    def __init__(self, cache_dir: str = None):
+        """
+        Inicializa o compilador
+
+        Args:
+            cache_dir: Diretório dos arquivos compilados
+        """
+        self.cache_dir = cache_dir or CACHE_DIR
+
+    def _cache_path(self, source_path: str) -> str:
+        """Caminho do arquivo compilado correspondente a um JSON"""
+        name = os.path.splitext(os.path.normpath(source_path))[0].replace(os.sep, '_').replace(':', '_')
+        return os.path.join(self.cache_dir, f'{name}.compiled.json')
+
+    def load(self, source_path: str) -> Dict[str, list]:
+        """
+        Retorna o conteúdo compilado de um JSON de roteiro ({chave: [cenas compiladas]})
+
+        Args:
+            source_path: Caminho do EP_N.json ou do cômodo
+
+        Returns:
+            Dicionário com as mesmas chaves do JSON e listas de cenas compiladas
+        """
+        stat = os.stat(source_path)
+        cache_path = self._cache_path(source_path)
+        cached = self._read_cache(cache_path)
+
+        # Mesmo mtime e tamanho: usa direto, sem ler o JSON
+        if cached and cached['source_mtime_ns'] == stat.st_mtime_ns and cached['source_size'] == stat.st_size:
+            return cached['data']
+
+        with open(source_path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+
+        if cached and cached['source_sha1'] == digest:
+            data = cached['data']  # Arquivo só foi tocado: conteúdo igual
+        else:
+            document = json.loads(raw.decode('utf-8'))
+            data = {key: [compile_scene(scene) for scene in scenes]
+                    for key, scenes in document.items() if isinstance(scenes, list)}
+            print(f"[SCRIPT_COMPILER] Compilado: {source_path}")
+            self._report_syntax_errors(source_path, data)
+
+        self._write_cache(cache_path, {
+            'version': CACHE_VERSION,
+            'source_mtime_ns': stat.st_mtime_ns,
+            'source_size': stat.st_size,
+            'source_sha1': digest,
+            'data': data
+        })
+        return data
+
+    @staticmethod
+    def _report_syntax_errors(source_path: str, data: Dict[str, list]):
+        """Avisa sobre comandos mal formados nas linhas de texto (com cena, linha e coluna)"""
+        for scenes in data.values():
+            for scene in scenes:
+                for number, line in enumerate(scene['_compiled'].lines, start=1):
+                    for error in line.errors:
+                        print(f"[SCRIPT_COMPILER] AVISO: {source_path} cena '{scene.get('id')}' "
+                              f"linha {number}, coluna {error.position + 1}: {error.message}")
+
+    @staticmethod
+    def _read_cache(cache_path: str) -> Optional[dict]:
+        """Lê um arquivo compilado (None se não existir, for de outra versão ou estiver corrompido)"""
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f, object_hook=_decode_cached)
+            if not isinstance(cached, dict) or cached.get('version') != CACHE_VERSION:
+                return None
+            if not isinstance(cached.get('data'), dict) or not all(
+                    isinstance(scene, dict) and isinstance(scene.get('_compiled'), CompiledScene)
+                    for scenes in cached['data'].values() for scene in scenes):
+                raise ValueError("conteúdo fora do formato esperado")
+            if not all(key in cached for key in ('source_mtime_ns', 'source_size', 'source_sha1')):
+                raise ValueError("cabeçalho incompleto")
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            print(f"[SCRIPT_COMPILER] Cache inválido ({cache_path}): {e}")
+            return None
+        return cached
+
+    @staticmethod
+    def _write_cache(cache_path: str, payload: dict):
+        """Grava o arquivo compilado de forma atômica (falhas apenas desativam o cache)"""
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f'{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(_encode_cached(payload), f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[SCRIPT_COMPILER] AVISO: não foi possível gravar o cache {cache_path}: {e}")
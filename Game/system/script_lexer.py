@@ -0,0 +1,352 @@
+"""
+Analisador léxico das linhas de roteiro
+Responsabilidade: Percorrer uma linha de 'texto' uma única vez e produzir tokens tipados com
+suas posições — texto, comandos {nome:args}, efeitos @nome[args] e marcações [token] — para
+sprites, falante, placeholders, @jump_text e @tex_time
+"""
+
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Tipos de token
+TEXT = 'text'
+COMMAND = 'command'  # {nome:args} (inclui falantes como {Yuno}, que não são comandos registrados)
+INLINE = 'inline'  # @nome[args] (ex: @tex_time[3: texto], @jump_text[2])
+PLACEHOLDER = 'placeholder'  # [token]
+
+_IDENTIFIER = re.compile(r'[A-Za-z_]+')
+_TEX_TIME_ARGS = re.compile(r'(\d+(?:\.\d+)?)\s*:\s*(.+)', re.DOTALL)
+_DIGITS = re.compile(r'\d+')
+
+
+class CommandSyntaxError(ValueError):
+    """Argumentos inválidos para um comando registrado"""
+
+
+class Token(NamedTuple):
+    """Trecho da linha reconhecido pelo lexer"""
+    kind: str
+    start: int  # Posição do primeiro caractere na linha
+    end: int  # Posição logo após o último caractere
+    source: str  # Trecho original
+    name: Optional[str] = None  # Nome do comando/efeito ou conteúdo do [token]
+    value: Any = None  # Resultado do parser registrado (None se não registrado ou inválido)
+
+
+class LexError(NamedTuple):
+    """Problema encontrado na linha (o trecho é mantido como texto)"""
+    position: int
+    message: str
+
+
+class LexedLine(NamedTuple):
+    """Resultado de lex_line"""
+    text: str
+    tokens: Tuple[Token, ...]
+    errors: Tuple[LexError, ...]
+
+
+class CommandSpec(NamedTuple):
+    """Comando registrado no lexer"""
+    name: str
+    parse: Callable[[Optional[str]], Any]  # Recebe os argumentos (None se não houver ':'), pode levantar CommandSyntaxError
+    hidden: bool  # Não aparece no texto exibido
+    once: bool  # Só a primeira ocorrência na linha produz ações
+
+
+# Registros de comandos {nome:args} e efeitos @nome[args]. A ordem de registro dos comandos
+# define a ordem das ações de sprite (a mesma das antigas passadas de regex).
+_COMMANDS: Dict[str, CommandSpec] = {}
+_INLINE: Dict[str, CommandSpec] = {}
+
+
+def register_command(name: str, parse: Callable[[Optional[str]], Any], hidden: bool = False, once: bool = False):
+    """
+    Registra um comando {nome:args}
+
+    Args:
+        name: Nome do comando (texto antes do primeiro ':')
+        parse: Função que recebe os argumentos e retorna uma tupla de ações (comando, parâmetros)
+        hidden: True se o comando deve ser removido do texto exibido
+        once: True se só a primeira ocorrência na linha conta
+    """
+    _COMMANDS[name] = CommandSpec(name, parse, hidden, once)
+
+
+def register_inline(name: str, parse: Callable[[Optional[str]], Any]):
+    """
+    Registra um efeito @nome[args]
+
+    Args:
+        name: Nome do efeito
+        parse: Função que recebe o conteúdo entre colchetes e retorna o valor do token
+    """
+    _INLINE[name] = CommandSpec(name, parse, False, False)
+
+
+def lex_line(text: str) -> LexedLine:
+    """
+    Divide uma linha em tokens em uma única passada
+
+    Um comando vai de '{' até o próximo '}' e uma marcação de '[' até o próximo ']'; se outro
+    '{' (ou '[') aparecer antes, o anterior é texto comum. '{}' e '[]' vazios também são texto.
+    Um efeito @nome[..] termina no ']' correspondente, então pode conter marcações [Nome].
+
+    Args:
+        text: Linha do roteiro
+
+    Returns:
+        LexedLine com os tokens (em ordem, cobrindo a linha inteira) e os erros encontrados
+    """
+    tokens: List[Token] = []
+    errors: List[LexError] = []
+    length = len(text)
+    text_start = 0
+    position = 0
+    # Depois de um '{' (ou '[') sem fechamento, nenhum outro terá: evita reescanear o resto
+    braces_closed = brackets_closed = True
+
+    def flush(end):
+        if end > text_start:
+            tokens.append(Token(TEXT, text_start, end, text[text_start:end]))
+
+    while position < length:
+        char = text[position]
+
+        if char == '{' and braces_closed:
+            close = position + 1
+            while close < length and text[close] != '}' and text[close] != '{':
+                close += 1
+            if close >= length:
+                errors.append(LexError(position, "'{' sem '}'"))
+                braces_closed = False
+                position += 1
+            elif text[close] == '{' or close == position + 1:
+                position = close if text[close] == '{' else close + 1
+            else:
+                flush(position)
+                tokens.append(_command_token(text, position, close, errors))
+                position = text_start = close + 1
+            continue
+
+        if char == '@':
+            match = _IDENTIFIER.match(text, position + 1)
+            spec = _INLINE.get(match.group()) if match else None
+            if spec is not None and match.end() < length and text[match.end()] == '[':
+                close = _matching_bracket(text, match.end()) if brackets_closed else -1
+                if close == -1:
+                    if text.find(']', match.end() + 1) == -1:
+                        brackets_closed = False
+                    errors.append(LexError(position, f"@{spec.name}[ sem ']'"))
+                else:
+                    try:
+                        value = spec.parse(text[match.end() + 1:close])
+                    except CommandSyntaxError as e:
+                        errors.append(LexError(position, f"@{spec.name}: {e}"))
+                    else:
+                        flush(position)
+                        tokens.append(Token(INLINE, position, close + 1, text[position:close + 1], spec.name, value))
+                        position = text_start = close + 1
+                        continue
+                # Efeito inválido: o nome vira texto e o '[' segue como possível marcação
+                position = match.end()
+                continue
+            position += 1
+            continue
+
+        if char == '[' and brackets_closed:
+            close = position + 1
+            while close < length and text[close] != ']' and text[close] != '[':
+                close += 1
+            if close >= length:
+                brackets_closed = False
+                position += 1
+            elif text[close] == '[' or close == position + 1:
+                position = close if text[close] == '[' else close + 1
+            else:
+                flush(position)
+                tokens.append(Token(PLACEHOLDER, position, close + 1, text[position:close + 1], text[position + 1:close]))
+                position = text_start = close + 1
+            continue
+
+        position += 1
+
+    flush(length)
+    return LexedLine(text, tuple(tokens), tuple(errors))
+
+
+def _matching_bracket(text: str, start: int) -> int:
+    """Posição do ']' que fecha o '[' em text[start], pulando marcações [..] internas (ou -1)"""
+    depth = 0
+    for position in range(start, len(text)):
+        char = text[position]
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth == 0:
+                return position
+    return -1
+
+
+def _command_token(text: str, start: int, close: int, errors: List[LexError]) -> Token:
+    """Cria o token de {corpo} (text[start] == '{', text[close] == '}')"""
+    body = text[start + 1:close]
+    name, colon, args = body.partition(':')
+    source = text[start:close + 1]
+    spec = _COMMANDS.get(name)
+    if spec is None:
+        return Token(COMMAND, start, close + 1, source, name)
+    try:
+        value = spec.parse(args if colon else None)
+    except CommandSyntaxError as e:
+        errors.append(LexError(start, f"{{{name}}}: {e}"))
+        return Token(COMMAND, start, close + 1, source, name)
+    return Token(COMMAND, start, close + 1, source, name, value)
+
+
+def is_hidden(token: Token) -> bool:
+    """O token é um comando válido que não aparece no texto exibido"""
+    if token.kind != COMMAND or token.value is None:
+        return False
+    spec = _COMMANDS.get(token.name)
+    return spec is not None and spec.hidden
+
+
+def sprite_actions(tokens) -> List[Tuple[str, dict]]:
+    """
+    Ações (comando, parâmetros) dos comandos registrados, na ordem de registro dos comandos
+    e, para cada comando, na ordem em que aparecem na linha
+    """
+    by_name: Dict[str, List[Token]] = {}
+    for token in tokens:
+        if token.kind == COMMAND and token.value is not None:
+            by_name.setdefault(token.name, []).append(token)
+    actions = []
+    for name, spec in _COMMANDS.items():
+        found = by_name.get(name)
+        if not found:
+            continue
+        for token in found[:1] if spec.once else found:
+            actions.extend(token.value)
+    return actions
+
+
+def visible_source(tokens) -> str:
+    """Texto da linha sem nenhum comando {..} (usado para saber se a linha só tem comandos)"""
+    return ''.join(token.source for token in tokens if token.kind != COMMAND)
+
+
+def split_jump_text(tokens) -> Tuple[int, List[Token]]:
+    """
+    Separa os @jump_text[N] dos demais tokens
+
+    Returns:
+        Tupla (N do primeiro @jump_text ou 0, tokens restantes)
+    """
+    lines = None
+    remaining = []
+    for token in tokens:
+        if token.kind == INLINE and token.name == 'jump_text':
+            if lines is None:
+                lines = token.value
+        else:
+            remaining.append(token)
+    return lines or 0, remaining
+
+
+def slow_text_segments(tokens) -> List[Tuple[str, Any, float]]:
+    """
+    Divide os tokens em segmentos normais e de @tex_time
+
+    Returns:
+        Lista de ('normal', [tokens], 0) e ('slow', texto, atraso). Trechos normais só com
+        espaços entre efeitos são descartados; sem efeitos, um único segmento normal.
+    """
+    segments = []
+    normal: List[Token] = []
+    has_slow = False
+    for token in tokens:
+        if token.kind == INLINE and token.name == 'tex_time':
+            has_slow = True
+            if ''.join(t.source for t in normal).strip():
+                segments.append(('normal', normal, 0))
+            normal = []
+            delay, slow_text = token.value
+            if slow_text:
+                segments.append(('slow', slow_text, delay))
+        else:
+            normal.append(token)
+    if not has_slow:
+        return [('normal', list(tokens), 0)]
+    if ''.join(t.source for t in normal).strip():
+        segments.append(('normal', normal, 0))
+    if not segments:
+        segments.append(('normal', list(tokens), 0))
+    return segments
+
+
+# Comandos padrão ---------------------------------------------------------------------------
+
+def _parse_sprite(args):
+    parts = args.split(':') if args is not None else []
+    if len(parts) not in (2, 3) or not all(parts):
+        raise CommandSyntaxError("esperado {sprite:nome:posição} ou {sprite:nome:posição:expressão}")
+    return (('add', {
+        'character': parts[0].strip(),
+        'position': parts[1].strip(),
+        'expression': parts[2].strip() if len(parts) == 3 else ''
+    }),)
+
+
+def _parse_sprite_clear(args):
+    if not args:
+        raise CommandSyntaxError("esperado {sprite_clear:posição} ou {sprite_clear:all}")
+    target = args.strip()
+    if target == 'all':
+        return (('clear_all', {}),)
+    return (('remove', {'position': target}),)
+
+
+def _parse_expr(args):
+    position, colon, expression = (args or '').partition(':')
+    if not colon or not position or not expression:
+        raise CommandSyntaxError("esperado {expr:posição:expressão}")
+    return (('expression', {'position': position.strip(), 'expression': expression.strip()}),)
+
+
+def _parse_img_esquerda(args):
+    if args is None:
+        raise CommandSyntaxError("esperado {img_esquerda:nome} ou {img_esquerda:}")
+    char_name = args.strip()
+    if char_name:
+        return (('add', {'character': char_name, 'position': 'left', 'expression': ''}),)
+    return (('clear_all', {}),)
+
+
+def _parse_img_clear(args):
+    if args is not None:
+        raise CommandSyntaxError("{img_clear} não recebe argumentos")
+    return (('clear_all', {}),)
+
+
+def _parse_tex_time(args):
+    match = _TEX_TIME_ARGS.fullmatch(args)
+    if not match:
+        raise CommandSyntaxError("esperado @tex_time[N: texto]")
+    return float(match.group(1)), match.group(2).strip()
+
+
+def _parse_jump_text(args):
+    if not _DIGITS.fullmatch(args):
+        raise CommandSyntaxError("esperado @jump_text[N]")
+    return int(args)
+
+
+register_command('sprite', _parse_sprite)
+register_command('sprite_clear', _parse_sprite_clear)
+register_command('expr', _parse_expr)
+register_command('img_esquerda', _parse_img_esquerda, hidden=True)
+register_command('img_clear', _parse_img_clear, hidden=True, once=True)
+register_inline('tex_time', _parse_tex_time)
+register_inline('jump_text', _parse_jump_text)
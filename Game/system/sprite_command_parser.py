@@ -3,9 +3,10 @@ Parser de comandos de sprite para cenas
 Responsabilidade: Analisar texto das cenas e extrair comandos de manipulação de sprites
 """
 
-import re
 from typing import List, Tuple, Dict
 
+from .script_lexer import COMMAND, lex_line, sprite_actions, visible_source
+
 
 class SpriteCommandParser:
     """Parse comandos de sprite do texto das cenas"""
@@ -36,57 +37,7 @@ class SpriteCommandParser:
             Lista de tuplas (comando, parâmetros) onde comando pode ser:
             'add', 'remove', 'clear_all', 'expression'
         """
-        commands = []
-        
-        # Novo formato: {sprite:nome:posição:expressão}
-        sprite_pattern = r'\{sprite:([^:}]+):([^:}]+)(?::([^:}]+))?\}'
-        for match in re.finditer(sprite_pattern, text):
-            char_name = match.group(1).strip()
-            position = match.group(2).strip()
-            expression = match.group(3).strip() if match.group(3) else ''
-            commands.append(('add', {
-                'character': char_name,
-                'position': position,
-                'expression': expression
-            }))
-            
-        # Comando de remoção: {sprite_clear:posição}
-        clear_pattern = r'\{sprite_clear:([^}]+)\}'
-        for match in re.finditer(clear_pattern, text):
-            target = match.group(1).strip()
-            if target == 'all':
-                commands.append(('clear_all', {}))
-            else:
-                commands.append(('remove', {'position': target}))
-                
-        # Comando de expressão: {expr:posição:expressão}
-        expr_pattern = r'\{expr:([^:}]+):([^}]+)\}'
-        for match in re.finditer(expr_pattern, text):
-            position = match.group(1).strip()
-            expression = match.group(2).strip()
-            commands.append(('expression', {
-                'position': position,
-                'expression': expression
-            }))
-            
-        # Compatibilidade: {img_esquerda:nome}
-        legacy_pattern = r'\{img_esquerda:([^}]*)\}'
-        for match in re.finditer(legacy_pattern, text):
-            char_name = match.group(1).strip()
-            if char_name:
-                commands.append(('add', {
-                    'character': char_name,
-                    'position': 'left',
-                    'expression': ''
-                }))
-            else:
-                commands.append(('clear_all', {}))
-                
-        # Compatibilidade: {img_clear}
-        if '{img_clear}' in text:
-            commands.append(('clear_all', {}))
-            
-        return commands
+        return sprite_actions(lex_line(text).tokens)
         
     @staticmethod
     def strip_commands(text: str) -> str:
@@ -100,8 +51,7 @@ class SpriteCommandParser:
             Texto sem comandos (apenas diálogo)
         """
         # Remove tudo que está entre chaves {}
-        cleaned = re.sub(r'\{[^}]+\}', '', text)
-        return cleaned.strip()
+        return visible_source(lex_line(text).tokens).strip()
         
     @staticmethod
     def has_commands(text: str) -> bool:
@@ -114,7 +64,7 @@ class SpriteCommandParser:
         Returns:
             True se contém comandos, False caso contrário
         """
-        return bool(re.search(r'\{[^}]+\}', text))
+        return any(token.kind == COMMAND for token in lex_line(text).tokens)
         
     @staticmethod
     def is_command_only(text: str) -> bool:
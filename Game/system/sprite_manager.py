@@ -5,7 +5,9 @@ Suporta múltiplos sprites, posicionamento, expressões, transições e efeitos
 
 import pygame
 import os
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+
+from .asset_manager import AssetManager
 
 
 class Sprite:
@@ -20,53 +22,105 @@ class Sprite:
         self.z_index = z_index  # Para controlar ordem de renderização
         self.surface = None
         self.rect = None
+        self.loaded_key = None  # Chave no AssetManager da imagem carregada por load_image
         self.alpha = 255  # Para efeitos de fade
         self.offset_x = 0  # Para animações de slide
         self.offset_y = 0
         self.target_alpha = 255
         self.fade_speed = 15
         
-    def load_image(self, base_path: str, screen_width: int, screen_height: int) -> bool:
-        """Carrega e escala a imagem do sprite"""
-        # Tenta carregar com expressão primeiro (ex: yuno_happy.png)
+    @property
+    def size_class(self) -> str:
+        """Classe de tamanho do sprite: 'center' (maior) ou 'side' (esquerda/direita)"""
+        return 'center' if self.position == 'center' else 'side'
+        
+    @staticmethod
+    def compute_scaled_size(image_size: Tuple[int, int], size_class: str,
+                            screen_width: int, screen_height: int) -> Tuple[int, int]:
+        """
+        Calcula o tamanho final de uma imagem de sprite para a classe de tamanho e resolução
+        
+        Args:
+            image_size: Tamanho original (largura, altura)
+            size_class: 'center' ou 'side'
+            screen_width: Largura da tela
+            screen_height: Altura da tela
+            
+        Returns:
+            Tupla (largura, altura) escalada
+        """
+        sw, sh = image_size
+        # Escala baseada na posição
+        if size_class == 'center':
+            max_width = int(screen_width * 0.35)
+            max_height = int(screen_height * 0.70)
+        else:  # left ou right
+            max_width = int(screen_width * 0.30)
+            max_height = int(screen_height * 0.60)
+            
+        scale = min(max_width / sw, max_height / sh, 1.0) if sw > 0 and sh > 0 else 1.0
+        return (int(sw * scale), int(sh * scale))
+        
+    def resolve_image_path(self, base_path: str) -> str:
+        """Retorna o caminho da imagem, preferindo a variante da expressão (ex: yuno_happy.png)"""
         if self.expression:
             expr_filename = self.image_path.replace('.png', f'_{self.expression}.png')
             expr_path = os.path.join(base_path, expr_filename)
             if os.path.exists(expr_path):
-                full_path = expr_path
-            else:
-                full_path = os.path.join(base_path, self.image_path)
+                return expr_path
+        return os.path.join(base_path, self.image_path)
+        
+    def cache_key(self, full_path: str, screen_width: int, screen_height: int) -> tuple:
+        """
+        Chave da imagem escalada deste sprite no AssetManager
+        
+        Args:
+            full_path: Caminho retornado por resolve_image_path (uma expressão sem arquivo
+                       próprio cai na imagem base e compartilha a mesma entrada)
+            screen_width: Largura da tela
+            screen_height: Altura da tela
+        """
+        return ('sprite', os.path.normpath(full_path), self.size_class, (screen_width, screen_height))
+        
+    def load_image(self, base_path: str, screen_width: int, screen_height: int,
+                   assets: Optional[AssetManager] = None, baked_store=None) -> bool:
+        """
+        Carrega e escala a imagem do sprite (reaproveitando o AssetManager e,
+        se houver, a variante pré-escalada do BakedAssetStore)
+        """
+        full_path = self.resolve_image_path(base_path)
+        
+        def read_image() -> Optional[pygame.Surface]:
+            if not os.path.exists(full_path):
+                print(f"[SPRITE_MANAGER] AVISO: Imagem não encontrada: {full_path}")
+                return None
+                
+            try:
+                baked = baked_store.load(full_path, self.size_class, (screen_width, screen_height)) if baked_store else None
+                if baked:
+                    return baked[0].convert_alpha()
+                loaded = pygame.image.load(full_path).convert_alpha()
+                new_size = self.compute_scaled_size(loaded.get_size(), self.size_class, screen_width, screen_height)
+                return pygame.transform.scale(loaded, new_size)
+            except Exception as e:
+                print(f"[SPRITE_MANAGER] ERRO ao carregar imagem: {e}")
+                return None
+                
+        key = self.cache_key(full_path, screen_width, screen_height)
+        if assets:
+            surface = assets.load(key, read_image)
         else:
-            full_path = os.path.join(base_path, self.image_path)
-            
-        if not os.path.exists(full_path):
-            print(f"[SPRITE_MANAGER] AVISO: Imagem não encontrada: {full_path}")
+            surface = read_image()
+        if surface is None:
             return False
-            
-        try:
-            self.surface = pygame.image.load(full_path).convert_alpha()
-            sw, sh = self.surface.get_size()
-            
-            # Escala baseada na posição
-            if self.position == 'center':
-                max_width = int(screen_width * 0.35)
-                max_height = int(screen_height * 0.70)
-            else:  # left ou right
-                max_width = int(screen_width * 0.30)
-                max_height = int(screen_height * 0.60)
                 
-            scale = min(max_width / sw, max_height / sh, 1.0) if sw > 0 and sh > 0 else 1.0
-            new_size = (int(sw * scale), int(sh * scale))
-            self.surface = pygame.transform.scale(self.surface, new_size)
-            self.rect = self.surface.get_rect()
-            
-            # Define posição base
-            self._set_position(screen_width, screen_height)
-            return True
-            
-        except Exception as e:
-            print(f"[SPRITE_MANAGER] ERRO ao carregar imagem: {e}")
-            return False
+        self.loaded_key = key
+        self.surface = surface
+        self.rect = self.surface.get_rect()
+        
+        # Define posição base
+        self._set_position(screen_width, screen_height)
+        return True
     
     def _set_position(self, screen_width: int, screen_height: int):
         """Define a posição do sprite na tela"""
@@ -105,29 +159,53 @@ class Sprite:
         """Verifica se o sprite está completamente invisível"""
         return self.alpha == 0
         
-    def render(self, surface: pygame.Surface):
-        """Renderiza o sprite na tela"""
+    def is_animating(self) -> bool:
+        """Verifica se o sprite ainda está em transição (fade)"""
+        return self.alpha != self.target_alpha
+        
+    def render(self, surface: pygame.Surface) -> Optional[pygame.Rect]:
+        """Renderiza o sprite na tela e retorna a área desenhada"""
         if not self.surface or not self.rect:
-            return
+            return None
             
-        # Aplica transparência se necessário
-        if self.alpha < 255:
-            temp_surface = self.surface.copy()
-            temp_surface.set_alpha(self.alpha)
-            surface.blit(temp_surface, (self.rect.x + self.offset_x, self.rect.y + self.offset_y))
-        else:
-            surface.blit(self.surface, (self.rect.x + self.offset_x, self.rect.y + self.offset_y))
+        position = (self.rect.x + self.offset_x, self.rect.y + self.offset_y)
+        if self.alpha >= 255:
+            return surface.blit(self.surface, position)
+        if self.alpha <= 0:
+            return None
+            
+        # Fade sem cópia: modula o alpha da própria surface só durante o blit
+        # (o alpha por pixel é multiplicado pelo alpha da surface) e restaura em seguida
+        self.surface.set_alpha(self.alpha)
+        try:
+            return surface.blit(self.surface, position)
+        finally:
+            self.surface.set_alpha(255)
+        
+    def render_state(self) -> tuple:
+        """Retorna o estado visual do sprite (usado para detectar mudanças entre frames)"""
+        return (self.name, self.image_path, self.expression, self.alpha,
+                self.offset_x, self.offset_y, tuple(self.rect) if self.rect else None)
 
 
 class SpriteManager:
     """Gerencia todos os sprites na tela"""
     
-    def __init__(self, screen_width: int, screen_height: int, base_image_path: str):
+    def __init__(self, screen_width: int, screen_height: int, base_image_path: str,
+                 assets: Optional[AssetManager] = None, baked_store=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.base_image_path = base_image_path
+        self.baked_store = baked_store  # Variantes pré-escaladas (tools/bake_assets.py)
         self.sprites: Dict[str, Sprite] = {}  # position -> Sprite
         self.fade_out_queue: List[str] = []  # sprites sendo removidos
+        # Imagens já escaladas (compartilhadas entre posições da mesma classe de tamanho);
+        # as dos sprites em tela ficam fixadas no grupo 'sprites'
+        self.assets = assets or AssetManager()
+        
+    def _pin_on_screen(self):
+        """Fixa no AssetManager as imagens dos sprites atualmente em tela"""
+        self.assets.pin('sprites', (sprite.loaded_key for sprite in self.sprites.values()))
         
     def add_sprite(self, character_name: str, image_filename: str, 
                    position: str = 'left', expression: str = '', 
@@ -135,7 +213,8 @@ class SpriteManager:
         """Adiciona ou substitui um sprite em uma posição"""
         sprite = Sprite(character_name, image_filename, position, expression, z_index)
         
-        if sprite.load_image(self.base_image_path, self.screen_width, self.screen_height):
+        if sprite.load_image(self.base_image_path, self.screen_width, self.screen_height,
+                                 self.assets, self.baked_store):
             # Se já existe sprite nessa posição, remove o antigo
             if position in self.sprites:
                 self.remove_sprite(position, fade_out=True)
@@ -145,6 +224,7 @@ class SpriteManager:
                 sprite.set_fade_in()
                 
             self.sprites[position] = sprite
+            self._pin_on_screen()
             print(f"[SPRITE_MANAGER] Sprite adicionado: {character_name} em {position}")
             return True
         return False
@@ -157,6 +237,7 @@ class SpriteManager:
                 self.fade_out_queue.append(position)
             else:
                 del self.sprites[position]
+                self._pin_on_screen()
             print(f"[SPRITE_MANAGER] Sprite removido de: {position}")
             
     def remove_all_sprites(self, fade_out: bool = True):
@@ -173,12 +254,21 @@ class SpriteManager:
         sprite = self.sprites[position]
         sprite.expression = new_expression
         # Recarrega a imagem com a nova expressão
-        return sprite.load_image(self.base_image_path, self.screen_width, self.screen_height)
+        loaded = sprite.load_image(self.base_image_path, self.screen_width, self.screen_height,
+                                   self.assets, self.baked_store)
+        self._pin_on_screen()
+        return loaded
         
     def has_sprite(self, position: str) -> bool:
         """Verifica se existe sprite em uma posição"""
         return position in self.sprites
         
+    def is_animating(self) -> bool:
+        """Verifica se algum sprite ainda está em transição (fade in/out)"""
+        if self.fade_out_queue:
+            return True
+        return any(sprite.is_animating() for sprite in self.sprites.values())
+        
     def update(self):
         """Atualiza todos os sprites (animações, efeitos)"""
         # Atualiza sprites ativos
@@ -187,19 +277,33 @@ class SpriteManager:
             
         # Remove sprites que completaram o fade out
         for pos in self.fade_out_queue[:]:
-            if pos in self.sprites and self.sprites[pos].is_faded_out():
+            sprite = self.sprites.get(pos)
+            if sprite is None or sprite.target_alpha != 0:
+                # Posição já liberada ou ocupada por um novo sprite: nada a remover
+                self.fade_out_queue.remove(pos)
+            elif sprite.is_faded_out():
                 del self.sprites[pos]
                 self.fade_out_queue.remove(pos)
+                self._pin_on_screen()
                 
-    def render(self, surface: pygame.Surface):
-        """Renderiza todos os sprites ordenados por z-index"""
+    def render(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Renderiza todos os sprites ordenados por z-index e retorna as áreas desenhadas"""
         # Ordena sprites por z-index (menor primeiro = mais atrás)
         sorted_sprites = sorted(self.sprites.values(), key=lambda s: s.z_index)
         
+        rects = []
         for sprite in sorted_sprites:
-            sprite.render(surface)
+            rect = sprite.render(surface)
+            if rect:
+                rects.append(rect)
+        return rects
+        
+    def render_state(self) -> tuple:
+        """Retorna o estado visual de todos os sprites (usado para detectar mudanças entre frames)"""
+        return tuple(sprite.render_state() for sprite in self.sprites.values())
             
     def clear(self):
         """Limpa todos os sprites imediatamente"""
         self.sprites.clear()
         self.fade_out_queue.clear()
+        self.assets.unpin('sprites')
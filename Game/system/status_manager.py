@@ -5,23 +5,31 @@ Responsabilidade: Aplicar e persistir mudanças nos dados dos personagens (statu
 
 import json
 import os
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterable, Optional
+
+from .character_index import CharacterIndex, normalize_name
 
 
 class StatusManager:
     """Gerencia atualizações de status dos personagens"""
     
-    def __init__(self, characters: Dict[str, Dict], base_dir: Optional[str] = None):
+    def __init__(self, characters: Dict[str, Dict], base_dir: Optional[str] = None,
+                 character_index: Optional[CharacterIndex] = None,
+                 on_change: Optional[Callable[[str, Iterable[str]], None]] = None):
         """
         Inicializa o gerenciador de status
         
         Args:
             characters: Dicionário com dados dos personagens em memória
             base_dir: Diretório base onde estão os arquivos JSON dos personagens
+            character_index: Manifesto dos personagens (o mesmo do CharacterLoader)
+            on_change: Chamada com (nome do personagem, atributos alterados) a cada atualização em memória
         """
         self.characters = characters
         self.base_dir = base_dir or os.path.join('Game', 'data', 'script', 'Base')
+        self.character_index = character_index or CharacterIndex(self.base_dir)
         self.applied_status_ids = []  # Lista para manter histórico de IDs aplicados
+        self.on_change = on_change
         
     def apply_status_infor(self, status: dict) -> bool:
         """
@@ -67,11 +75,13 @@ class StatusManager:
         target_norm = target_name.strip().lower()
         
         # Busca o personagem em memória
-        matched_key = None
-        for name in self.characters.keys():
-            if name.strip().lower() == target_norm:
-                matched_key = name
-                break
+        matched_key = self.character_index.name_for(target_norm)
+        if matched_key not in self.characters:
+            matched_key = None
+            for name in self.characters.keys():
+                if normalize_name(name) == target_norm:
+                    matched_key = name
+                    break
                 
         # Busca o arquivo JSON do personagem
         file_path = self._find_character_file(target_norm)
@@ -81,7 +91,7 @@ class StatusManager:
             # Ainda atualiza memória se existir
             if matched_key:
                 merged = self._merge_status_into_dict(self.characters[matched_key], status)
-                self.characters[matched_key] = merged
+                self._store_character(matched_key, merged, status)
                 print(f"[STATUS_MANAGER] Personagem '{matched_key}' atualizado em memória (arquivo não encontrado)")
             return False
             
@@ -114,6 +124,7 @@ class StatusManager:
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(merged_data, f, indent=4, ensure_ascii=False)
+            self.character_index.record(file_path, merged_data)
             print(f"[STATUS_MANAGER] Arquivo do personagem atualizado: {file_path}")
         except Exception as e:
             print(f"[STATUS_MANAGER] ERRO ao salvar arquivo do personagem: {e}")
@@ -122,7 +133,7 @@ class StatusManager:
         # Atualiza memória
         mem_key = matched_key or merged_data.get('nome')
         if mem_key:
-            self.characters[mem_key] = merged_data
+            self._store_character(mem_key, merged_data, status)
             print(f"[STATUS_MANAGER] Personagem '{mem_key}' atualizado em memória")
         
         # Adiciona ID ao histórico do personagem após aplicação bem-sucedida
@@ -150,6 +161,7 @@ class StatusManager:
                             # Salva de volta no arquivo
                             with open(file_path, 'w', encoding='utf-8') as f:
                                 json.dump(file_data, f, indent=4, ensure_ascii=False)
+                            self.character_index.record(file_path, file_data)
                             
                             print(f"[STATUS_MANAGER] ID '{status_id}' registrado no personagem '{target_name}'")
                     except Exception as e:
@@ -157,6 +169,29 @@ class StatusManager:
             
         return True
         
+    def _store_character(self, key: str, data: dict, status: dict):
+        """Substitui os dados do personagem em memória e avisa quais atributos mudaram"""
+        previous = self.characters.get(key) or {}
+        self.characters[key] = data
+        if self.on_change is None:
+            return
+        # Listas são estendidas no próprio objeto, então os campos do status contam sempre como alterados
+        changed = {k for k in status if k not in ('nome', 'ID')}
+        changed.update(k for k in previous.keys() | data.keys() if previous.get(k) != data.get(k))
+        self.on_change(key, changed)
+        
+    def _find_character_file(self, character_name: str) -> Optional[str]:
+        """
+        Localiza o arquivo JSON de um personagem pelo manifesto (sem varrer o diretório)
+        
+        Args:
+            character_name: Nome do personagem (qualquer caixa)
+            
+        Returns:
+            Caminho do arquivo ou None se não encontrar
+        """
+        return self.character_index.path_for(character_name)
+        
     def _load_character_config(self, character_name: str) -> Optional[Dict[str, Dict[str, int]]]:
         """
         Carrega a configuração de limites para um personagem
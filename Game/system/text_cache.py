@@ -0,0 +1,109 @@
+"""
+Cache de superfícies de texto
+Responsabilidade: Evitar rasterizar o mesmo texto (e recriar fontes em negrito) a cada frame
+"""
+
+import pygame
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+
+class FontRegistry:
+    """Mantém as variantes de fonte (negrito) criadas uma única vez por fonte base"""
+
+    def __init__(self):
+        self._bold_fonts: Dict[int, Tuple[pygame.font.Font, pygame.font.Font]] = {}  # id(font) -> (font, bold_font)
+
+    def get_bold(self, font: pygame.font.Font) -> pygame.font.Font:
+        """
+        Retorna a variante em negrito de uma fonte, criando-a apenas na primeira vez
+
+        Args:
+            font: Fonte base
+
+        Returns:
+            Fonte em negrito (ou a própria fonte se não for possível criar)
+        """
+        entry = self._bold_fonts.get(id(font))
+        if entry is not None and entry[0] is font:
+            return entry[1]
+
+        try:
+            # Cria uma fonte em negrito (usa fonte padrão do sistema)
+            bold_font = pygame.font.SysFont(None, font.get_height(), bold=True)
+        except Exception:
+            # Se falhar, usa a mesma fonte (fallback)
+            bold_font = font
+        # Guarda a fonte base junto para que o id não seja reaproveitado por outro objeto
+        self._bold_fonts[id(font)] = (font, bold_font)
+        return bold_font
+
+    def clear(self):
+        """Remove todas as variantes registradas"""
+        self._bold_fonts.clear()
+
+
+class TextSurfaceCache:
+    """Cache LRU de superfícies de texto renderizadas"""
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Inicializa o cache
+
+        Args:
+            max_entries: Quantidade máxima de superfícies mantidas antes de descartar as menos usadas
+        """
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()  # (id(font), texto, cor, negrito) -> surface
+        self._fonts = {}  # id(font) -> font (mantém a fonte viva enquanto houver entradas dela)
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: tuple,
+               bold: bool = False) -> pygame.Surface:
+        """
+        Retorna a superfície do texto, rasterizando apenas se ainda não estiver em cache
+
+        Args:
+            font: Fonte usada para renderizar (já em negrito, se for o caso)
+            text: Texto a renderizar
+            color: Cor RGB do texto
+            bold: Se o texto é negrito (faz parte da chave do cache)
+
+        Returns:
+            Surface do Pygame com o texto
+        """
+        key = (id(font), text, tuple(color), bold)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._fonts[id(font)] = font
+        self._surfaces[key] = surface
+        while len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas de uso do cache
+
+        Returns:
+            Dicionário com 'entries', 'hits', 'misses' e 'hit_rate'
+        """
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def clear(self):
+        """Limpa todas as superfícies em cache"""
+        self._surfaces.clear()
+        self._fonts.clear()
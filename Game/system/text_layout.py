@@ -0,0 +1,234 @@
+"""
+Motor de layout de parágrafos
+Responsabilidade: Quebrar texto marcado (<Nome>, **negrito**) em linhas e posicionar os trechos,
+memorizando o resultado para que cada frame apenas desenhe
+"""
+
+import pygame
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, NamedTuple, Tuple
+
+
+class GlyphRun(NamedTuple):
+    """Trecho contínuo de texto com a mesma cor e estilo, já posicionado (relativo à origem do parágrafo)"""
+    text: str
+    x: int
+    y: int
+    color: tuple
+    bold: bool
+
+
+class LaidOutParagraph(NamedTuple):
+    """Parágrafo já quebrado em linhas (imutável)"""
+    runs: Tuple[GlyphRun, ...]
+    line_count: int
+    height: int
+
+
+@lru_cache(maxsize=1024)
+def tokenize_markup(text: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Separa o texto em tokens: ('name', nome), ('bold', texto) ou ('text', pedaço).
+    Espaços viram tokens ('text', ' ') próprios para que a medição seja exata.
+
+    Args:
+        text: Texto com marcações <Nome> e **negrito**
+
+    Returns:
+        Tupla de tokens (tipo, valor)
+    """
+    tokens = []
+    i = 0
+    while i < len(text):
+        # Verifica marcadores de nome <Name>
+        if text[i] == '<':
+            end = text.find('>', i)
+            if end != -1:
+                tokens.append(('name', text[i+1:end]))
+                i = end + 1
+                # If there's an immediate space, include it as a separate text token
+                if i < len(text) and text[i] == ' ':
+                    tokens.append(('text', ' '))
+                    i += 1
+                continue
+
+        # Verifica marcadores de negrito **texto**
+        if text.startswith('**', i):
+            # Procura o ** de fechamento
+            end = text.find('**', i + 2)
+            if end != -1:
+                tokens.append(('bold', text[i+2:end]))
+                i = end + 2
+                # If there's an immediate space, include it as a separate text token
+                if i < len(text) and text[i] == ' ':
+                    tokens.append(('text', ' '))
+                    i += 1
+                continue
+
+        # Normal text until next marker (o que vier primeiro)
+        next_markers = [m for m in (text.find('<', i), text.find('**', i)) if m != -1]
+        next_marker = min(next_markers) if next_markers else len(text)
+        if next_marker == i:
+            # Marcador sem fechamento: trata como texto comum
+            next_marker = i + 1
+        chunk = text[i:next_marker]
+        i = next_marker
+        # Split chunk into words but keep spaces so measurement is accurate
+        words = chunk.split(' ')
+        for idx, w in enumerate(words):
+            if w:
+                tokens.append(('text', w))
+            if idx < len(words) - 1:
+                tokens.append(('text', ' '))
+    return tuple(tokens)
+
+
+class TextLayoutEngine:
+    """Calcula (e memoriza) o layout de parágrafos com quebra de linha"""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Inicializa o motor de layout
+
+        Args:
+            max_entries: Quantidade máxima de parágrafos memorizados (LRU)
+        """
+        self.max_entries = max_entries
+        self._layouts = OrderedDict()  # chave do parágrafo -> (fonte, fonte negrito, LaidOutParagraph)
+        self._advances: Dict[int, Tuple[pygame.font.Font, Dict[str, int]]] = {}  # id(font) -> (font, {char: avanço})
+
+    def _advances_for(self, font: pygame.font.Font, text: str) -> list:
+        """Retorna o avanço horizontal de cada caractere, consultando a fonte só para os ainda desconhecidos"""
+        entry = self._advances.get(id(font))
+        if entry is None or entry[0] is not font:
+            entry = (font, {})
+            self._advances[id(font)] = entry
+        table = entry[1]
+        missing = ''.join(sorted(set(ch for ch in text if ch not in table)))
+        if missing:
+            for ch, metrics in zip(missing, font.metrics(missing)):
+                table[ch] = metrics[4] if metrics else font.size(ch)[0]
+        return [table[ch] for ch in text]
+
+    def layout(self, text: str, font: pygame.font.Font, bold_font: pygame.font.Font,
+               max_width: int, line_height: int, default_color: tuple,
+               name_colors: dict) -> LaidOutParagraph:
+        """
+        Retorna o layout do parágrafo, calculando apenas na primeira vez para a mesma combinação
+        de texto, largura, fontes e cores dos nomes
+
+        Args:
+            text: Texto com marcações <Nome> e **negrito**
+            font: Fonte normal
+            bold_font: Fonte usada nos trechos **negrito**
+            max_width: Largura máxima de cada linha
+            line_height: Distância vertical entre linhas
+            default_color: Cor do texto comum
+            name_colors: Dicionário de personagens ({nome: {'color': cor}})
+
+        Returns:
+            LaidOutParagraph com os trechos posicionados
+        """
+        tokens = tokenize_markup(text)
+        default_color = tuple(default_color)
+        colors = tuple(
+            tuple(name_colors.get(tval, {}).get('color', default_color))
+            for ttype, tval in tokens if ttype == 'name'
+        )
+        key = (text, id(font), id(bold_font), max_width, line_height, default_color, colors)
+        # A entrada guarda as fontes: um id reaproveitado por outra fonte não devolve o layout antigo
+        entry = self._layouts.get(key)
+        if entry is not None and entry[0] is font and entry[1] is bold_font:
+            self._layouts.move_to_end(key)
+            return entry[2]
+
+        paragraph = self._break_lines(tokens, font, bold_font, max_width, line_height, default_color, iter(colors))
+        self._layouts[key] = (font, bold_font, paragraph)
+        self._layouts.move_to_end(key)
+        while len(self._layouts) > self.max_entries:
+            self._layouts.popitem(last=False)
+        return paragraph
+
+    def _break_lines(self, tokens, font, bold_font, max_width, line_height, default_color, colors) -> LaidOutParagraph:
+        """Quebra os tokens em linhas (guloso, palavra a palavra)"""
+        runs = []
+        line = []  # [(texto, largura, cor, negrito)]
+        cur_x = 0
+        cur_y = 0
+
+        def flush_line():
+            nonlocal cur_x, cur_y, line
+            draw_x = 0
+            for text, width, color, bold in line:
+                # Junta trechos vizinhos com mesmo estilo para desenhar com um único blit
+                if runs and runs[-1].y == cur_y and runs[-1].color == color and runs[-1].bold == bold \
+                        and runs[-1].x + runs[-1].text_width == draw_x:
+                    last = runs.pop()
+                    runs.append(_Run(last.text + text, last.x, cur_y, color, bold, last.text_width + width))
+                else:
+                    runs.append(_Run(text, draw_x, cur_y, color, bold, width))
+                draw_x += width
+            line = []
+            cur_x = 0
+            cur_y += line_height
+
+        for ttype, tval in tokens:
+            bold = ttype == 'bold'
+            use_font = bold_font if bold else font
+            color = next(colors) if ttype == 'name' else default_color
+            w = use_font.size(tval)[0]
+
+            # If token would overflow current line, flush first
+            if cur_x + w > max_width and line:
+                flush_line()
+
+            # If a single token is wider than max_width and line is empty, break it by character
+            if w > max_width and not line and ttype != 'name':
+                advances = self._advances_for(use_font, tval)
+                piece_start = 0
+                while piece_start < len(tval):
+                    # Estimativa linear pelos avanços dos caracteres
+                    end = piece_start
+                    estimate = 0
+                    while end < len(tval) and (end == piece_start or estimate + advances[end] <= max_width):
+                        estimate += advances[end]
+                        end += 1
+                    # Confirma com a largura real (kerning) e recua se passou do limite
+                    piece_w = use_font.size(tval[piece_start:end])[0]
+                    while piece_w > max_width and end - piece_start > 1:
+                        end -= 1
+                        piece_w = use_font.size(tval[piece_start:end])[0]
+                    line.append((tval[piece_start:end], piece_w, color, bold))
+                    if end < len(tval):
+                        flush_line()
+                    else:
+                        cur_x += piece_w
+                    piece_start = end
+                continue
+
+            # Append token to line and advance cur_x (names too long are kept whole)
+            line.append((tval, w, color, bold))
+            cur_x += w
+
+        # Flush remaining tokens
+        if line:
+            flush_line()
+
+        glyph_runs = tuple(GlyphRun(r.text, r.x, r.y, r.color, r.bold) for r in runs if r.text)
+        return LaidOutParagraph(glyph_runs, cur_y // line_height if line_height else 0, cur_y)
+
+    def clear(self):
+        """Descarta os layouts memorizados"""
+        self._layouts.clear()
+        self._advances.clear()
+
+
+class _Run(NamedTuple):
+    """Trecho em construção (guarda a largura acumulada para juntar trechos vizinhos)"""
+    text: str
+    x: int
+    y: int
+    color: tuple
+    bold: bool
+    text_width: int
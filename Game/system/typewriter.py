@@ -0,0 +1,143 @@
+"""
+Máquina de escrever do texto lento (@tex_time)
+Responsabilidade: Calcular, a partir do tempo decorrido, quantos caracteres da linha já estão visíveis,
+sem reconstruir o texto nem refazer o layout a cada frame
+"""
+
+import time
+from bisect import bisect_right
+from typing import Optional, Sequence, Tuple
+
+from .text_layout import tokenize_markup
+
+FRAMES_PER_SECOND = 60.0  # Os atrasos do @tex_time são dados em frames a 60 FPS
+
+
+def glyph_reveal_times(text: str, segments: Sequence[Tuple[str, str, float]]) -> Tuple[float, ...]:
+    """
+    Calcula o instante (em segundos desde o início da linha) em que cada caractere exibido aparece
+
+    Cada caractere lento aparece `atraso / 60` segundos depois do anterior; o texto normal aparece
+    junto com o caractere que o precede. As marcações <Nome> e **negrito** não são exibidas, então
+    os tempos seguem os caracteres na ordem em que o layout os desenha.
+
+    Args:
+        text: Texto completo da linha (concatenação dos segmentos)
+        segments: Segmentos ('normal'/'slow', texto, atraso)
+
+    Returns:
+        Tupla não decrescente com o instante de cada caractere exibido
+    """
+    source_times = []
+    elapsed = 0.0
+    for kind, segment_text, delay in segments:
+        if kind == 'slow':
+            step = delay / FRAMES_PER_SECOND
+            for _ in segment_text:
+                elapsed += step
+                source_times.append(elapsed)
+        else:
+            source_times.extend([elapsed] * len(segment_text))
+
+    # Cada token do layout está no texto logo após o cursor (só delimitadores são pulados)
+    times = []
+    cursor = 0
+    for _, value in tokenize_markup(text):
+        if not value:
+            continue
+        start = text.find(value, cursor)
+        if start == -1:
+            start = cursor
+        times.extend(source_times[min(start + i, len(source_times) - 1)] for i in range(len(value)))
+        cursor = start + len(value)
+    return tuple(times)
+
+
+class Typewriter:
+    """Estado da revelação de uma linha de texto lento"""
+
+    def __init__(self, clock=time.perf_counter):
+        """
+        Args:
+            clock: Função que retorna o tempo atual em segundos (monotônica)
+        """
+        self.clock = clock
+        self.line_id = 0  # Incrementado a cada linha nova (identifica a linha em render_state)
+        self.active = False
+        self.visible = 0  # Caracteres exibidos no último update()
+        self.total = 0
+        self._key = None
+        self._start_time = 0.0
+        self._times: Tuple[float, ...] = ()
+        self._clip = None  # (fonte, texto do trecho, caracteres, largura) do último recorte
+
+    def start(self, key, text: str, segments: Sequence[Tuple[str, str, float]]):
+        """
+        Começa a revelar uma linha, a menos que ela já seja a linha atual
+
+        Args:
+            key: Identifica a linha (os segmentos); a mesma chave continua a revelação em andamento
+            text: Texto completo da linha
+            segments: Segmentos ('normal'/'slow', texto, atraso)
+        """
+        if self.active and (key is self._key or key == self._key):
+            return
+        self.active = True
+        self.line_id += 1
+        self._key = key
+        self._start_time = self.clock()
+        self._times = glyph_reveal_times(text, segments)
+        self.total = len(self._times)
+        self.visible = 0
+
+    def update(self) -> int:
+        """
+        Atualiza e retorna a quantidade de caracteres visíveis para o tempo atual
+        (independe de quantos frames se passaram)
+        """
+        if self.visible < self.total:
+            self.visible = bisect_right(self._times, self.clock() - self._start_time, self.visible)
+        return self.visible
+
+    def finished(self) -> bool:
+        """Todos os caracteres da linha já foram revelados"""
+        return self.visible >= self.total
+
+    def reset(self):
+        """Encerra a linha atual (a próxima chamada de start() recomeça)"""
+        self.active = False
+        self._key = None
+
+    def clip_width(self, font, run_text: str, count: int) -> int:
+        """
+        Largura dos `count` primeiros caracteres de um trecho (memorizada enquanto não mudar)
+
+        Args:
+            font: Fonte do trecho
+            run_text: Texto do trecho
+            count: Caracteres visíveis do trecho
+        """
+        clip = self._clip
+        if clip is None or clip[0] is not font or clip[1] != run_text or clip[2] != count:
+            clip = (font, run_text, count, font.size(run_text[:count])[0])
+            self._clip = clip
+        return clip[3]
+
+
+def visible_runs(paragraph, visible: Optional[int]):
+    """
+    Percorre os trechos do parágrafo até `visible` caracteres
+
+    Yields:
+        (trecho, caracteres visíveis do trecho); o último pode ser parcial
+    """
+    remaining = visible
+    for run in paragraph.runs:
+        if remaining is None:
+            yield run, len(run.text)
+            continue
+        if remaining <= 0:
+            return
+        count = min(len(run.text), remaining)
+        remaining -= count
+        yield run, count
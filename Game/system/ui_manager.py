@@ -4,12 +4,13 @@ Responsabilidade: Coordenar desenho de caixas de texto, botões, títulos e diá
 """
 
 import pygame
+from .asset_manager import AssetManager
 from .text_style import TextStyle
 from .button import Button
 
 
 class UIManager:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, assets=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
         # Compute responsive sizes based on screen height/width
@@ -27,6 +28,26 @@ class UIManager:
         self.background_color = (0, 0, 0)  # Preto
         self.text_box_color = (50, 50, 50, 200)  # Cinza escuro semi-transparente (slightly more opaque)
         self.text_box_border_color = (139, 69, 19)  # Marrom
+        # Painéis semi-transparentes, botões e textos da interface ficam no AssetManager compartilhado
+        self.assets = assets or AssetManager()
+
+    def get_panel(self, size, color):
+        # Fundo semi-transparente de um tamanho/cor, criado uma única vez
+        def create():
+            panel = pygame.Surface(size, pygame.SRCALPHA)
+            panel.fill(color)
+            return panel
+        return self.assets.load(('panel', tuple(size), tuple(color)), create)
+
+    def render_label(self, font, text, color):
+        # Texto de rótulo (nome do falante, notificação) renderizado uma única vez por fonte.
+        # A fonte fica na entrada para que o id não seja reaproveitado por outro objeto.
+        key = ('label', id(font), text, tuple(color))
+        entry = self.assets.load(key, lambda: (font, font.render(text, True, color)))
+        if entry[0] is not font:
+            entry = (font, font.render(text, True, color))
+            self.assets.put(key, entry)
+        return entry[1]
 
     def draw_text_box(self, screen, text, x, y, width, height):
         # Desenha caixa de texto com borda vitoriana
@@ -35,9 +56,8 @@ class UIManager:
         border_width = max(2, int(self.screen_width * 0.003))
         pygame.draw.rect(screen, self.text_box_border_color, text_box_rect, border_width)
         inner_rect = text_box_rect.inflate(-border_width * 2, -border_width * 2)
-        # Fundo semi-transparente
-        text_box_surf = pygame.Surface((inner_rect.width, inner_rect.height), pygame.SRCALPHA)
-        text_box_surf.fill(self.text_box_color)
+        # Fundo semi-transparente (reaproveitado enquanto o tamanho não muda)
+        text_box_surf = self.get_panel((inner_rect.width, inner_rect.height), self.text_box_color)
         screen.blit(text_box_surf, inner_rect.topleft)
         return inner_rect  # Retorna retângulo interno para renderizar texto
 
@@ -55,32 +75,37 @@ class UIManager:
         for i, option in enumerate(options):
             x = (self.screen_width - button_width) // 2
             y = start_y + i * (button_height + spacing)
-            button = Button(x, y, button_width, button_height, option['texto'], self.button_style)
-            # Support multiple possible keys for the next scene id to be robust
-            next_id = (
-                option.get('cena')
-                or option.get('proximo_id')
-                or option.get('proximo')
-                or option.get('next')
-                or option.get('scene')
-                or option.get('id')
-            )
+            button = Button(x, y, button_width, button_height, option['texto'], self.button_style,
+                            assets=self.assets)
+            next_id = self.get_option_target(option)
             if next_id is None:
                 # Warn for easier debugging but still append None so caller can decide
                 print(f"UIManager.create_buttons: option missing next-id keys for option: {option}")
             buttons.append((button, next_id, option))
         return buttons
 
+    @staticmethod
+    def get_option_target(option):
+        # Support multiple possible keys for the next scene id to be robust
+        return (
+            option.get('cena')
+            or option.get('proximo_id')
+            or option.get('proximo')
+            or option.get('next')
+            or option.get('scene')
+            or option.get('id')
+        )
+
     def draw_title(self, screen, title, y=50):
         title_surf = self.title_style.render(title)
         x = (self.screen_width - title_surf.get_width()) // 2
-        screen.blit(title_surf, (x, y))
+        return screen.blit(title_surf, (x, y))
 
     def draw_speaker_label(self, screen, name, color, box_x, box_y):
         # Draw a small labeled badge at top-left touching the top of the text box
         # Position it just above the text box (y coordinate will be adjusted to sit above box_y)
         font = self.title_style.font
-        name_surf = font.render(name, True, color)
+        name_surf = self.render_label(font, name, color)
         pad_x = 10
         pad_y = 6
         bg_w = name_surf.get_width() + pad_x * 2
@@ -92,18 +117,15 @@ class UIManager:
         pygame.draw.rect(screen, self.text_box_border_color, bg_rect, border_radius=6)
         # inner background (semi-transparent)
         inner = bg_rect.inflate(-4, -4)
-        surf = pygame.Surface((inner.width, inner.height), pygame.SRCALPHA)
-        # use same RGBA as text_box_color if available else fallback
-        try:
-            surf.fill(self.text_box_color)
-        except Exception:
-            surf.fill((50, 50, 50, 200))
+        surf = self.get_panel((inner.width, inner.height), self.text_box_color)
         screen.blit(surf, inner.topleft)
         # Blit name text
         text_pos = (inner.x + pad_x // 2, inner.y + pad_y // 2)
         screen.blit(name_surf, text_pos)
+        return bg_rect
 
-    def draw_dialogue(self, screen, text, text_processor, characters, x=50, y=None, max_width=None, skip_pressed=False):
+    def draw_dialogue(self, screen, text, text_processor, characters, x=50, y=None, max_width=None, skip_pressed=False,
+                      dialogue=None):
         if y is None:
             y = self.screen_height - 150
         # Usa o renderizador com quebra de linhas para garantir que o texto não saia da caixa
@@ -127,7 +149,8 @@ class UIManager:
             line_height,
             self.dialogue_style.color,
             characters,
-            skip_pressed
+            skip_pressed,
+            dialogue
         )
         
         return finished, has_slow_text
@@ -136,9 +159,10 @@ class UIManager:
         """
         Desenha uma notificação de item adicionado no topo esquerdo da tela.
         item deve ter 'nome' e 'quantidade'.
+        Retorna o retângulo ocupado pela notificação (ou None se não desenhou).
         """
         if not item:
-            return
+            return None
             
         # Posição no topo esquerdo
         margin_x = 20
@@ -156,7 +180,7 @@ class UIManager:
         
         # Renderizar texto
         font = self.dialogue_style.font
-        text_surf = font.render(notification_text, True, (218, 165, 32))  # Dourado
+        text_surf = self.render_label(font, notification_text, (218, 165, 32))  # Dourado
         
         # Dimensões da caixa de notificação
         pad_x = 15
@@ -173,11 +197,11 @@ class UIManager:
         
         # Fundo escuro semi-transparente
         inner_rect = notification_rect.inflate(-border_width * 2, -border_width * 2)
-        bg_surf = pygame.Surface((inner_rect.width, inner_rect.height), pygame.SRCALPHA)
-        bg_surf.fill((30, 30, 30, 220))  # Preto semi-transparente
+        bg_surf = self.get_panel((inner_rect.width, inner_rect.height), (30, 30, 30, 220))  # Preto semi-transparente
         screen.blit(bg_surf, inner_rect.topleft)
         
         # Desenhar texto centralizado
         text_x = notification_rect.x + pad_x
         text_y = notification_rect.y + pad_y
-        screen.blit(text_surf, (text_x, text_y))
\ No newline at end of file
+        screen.blit(text_surf, (text_x, text_y))
+        return notification_rect
\ No newline at end of file
@@ -47,10 +47,11 @@ def main():
 
     text_processor = TextProcessor()
 
-    renderer = Renderer(screen, font, title_font, SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, GRAY)
+    renderer = Renderer(screen, font, title_font, SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, GRAY, dirty_rects=True)
     setattr(renderer, "text_processor", text_processor)
 
-    game = Game(scenes, scenes_order, characters, player_name, player_data, renderer, clock, data_loader)
+    game = Game(scenes, scenes_order, characters, player_name, player_data, renderer, clock, data_loader,
+                character_loader.index)
     game.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""
+Parsers por regex da versão anterior ao script_lexer (SpriteCommandParser, TextProcessor,
+Renderer e Game da versão original), copiados sem alterações de comportamento.
+Servem só de referência para os testes de equivalência do lexer.
+"""
+
+import re
+
+
+def parse_sprite_command(text):
+    """SpriteCommandParser.parse_sprite_command original"""
+    commands = []
+
+    sprite_pattern = r'\{sprite:([^:}]+):([^:}]+)(?::([^:}]+))?\}'
+    for match in re.finditer(sprite_pattern, text):
+        char_name = match.group(1).strip()
+        position = match.group(2).strip()
+        expression = match.group(3).strip() if match.group(3) else ''
+        commands.append(('add', {
+            'character': char_name,
+            'position': position,
+            'expression': expression
+        }))
+
+    clear_pattern = r'\{sprite_clear:([^}]+)\}'
+    for match in re.finditer(clear_pattern, text):
+        target = match.group(1).strip()
+        if target == 'all':
+            commands.append(('clear_all', {}))
+        else:
+            commands.append(('remove', {'position': target}))
+
+    expr_pattern = r'\{expr:([^:}]+):([^}]+)\}'
+    for match in re.finditer(expr_pattern, text):
+        position = match.group(1).strip()
+        expression = match.group(2).strip()
+        commands.append(('expression', {
+            'position': position,
+            'expression': expression
+        }))
+
+    legacy_pattern = r'\{img_esquerda:([^}]*)\}'
+    for match in re.finditer(legacy_pattern, text):
+        char_name = match.group(1).strip()
+        if char_name:
+            commands.append(('add', {
+                'character': char_name,
+                'position': 'left',
+                'expression': ''
+            }))
+        else:
+            commands.append(('clear_all', {}))
+
+    if '{img_clear}' in text:
+        commands.append(('clear_all', {}))
+
+    return commands
+
+
+def is_command_only(text):
+    """Teste de linha só com comandos usado por Game._auto_skip_command_lines"""
+    return re.sub(r'\{[^}]+\}', '', text).strip() == ''
+
+
+def is_jump_only(text):
+    """Teste de linha que é só um @jump_text[N] usado por Game._auto_skip_command_lines"""
+    return re.match(r'^\s*@jump_text\[\d+\]\s*$', text) is not None
+
+
+def parse_tex_time(text):
+    """TextProcessor.parse_tex_time original"""
+    segments = []
+    pattern = r'@tex_time\[(\d+(?:\.\d+)?)\s*:\s*([^\]]+)\]'
+    if not re.search(pattern, text):
+        segments.append(('normal', text, 0))
+        return segments
+
+    current_pos = 0
+    for match in re.finditer(pattern, text):
+        if match.start() > current_pos:
+            normal_text = text[current_pos:match.start()]
+            if normal_text.strip():
+                segments.append(('normal', normal_text, 0))
+        delay = float(match.group(1))
+        slow_text = match.group(2).strip()
+        if slow_text:
+            segments.append(('slow', slow_text, delay))
+        current_pos = match.end()
+
+    if current_pos < len(text):
+        remaining = text[current_pos:]
+        if remaining.strip():
+            segments.append(('normal', remaining, 0))
+
+    if not segments:
+        segments.append(('normal', text, 0))
+    return segments
+
+
+def parse_jump_text(text):
+    """TextProcessor.parse_jump_text original"""
+    pattern = r'@jump_text\[(\d+)\]'
+    match = re.search(pattern, text)
+    if match:
+        return int(match.group(1)), re.sub(pattern, '', text)
+    return 0, text
+
+
+def replace_placeholders(text, player_name, characters):
+    """TextProcessor.replace_placeholders original"""
+    text = re.sub(r'\{img_esquerda:[^}]*\}', '', text)
+    text = re.sub(r'\{img_clear\}', '', text)
+    text = re.sub(r'\[nome_jogador\]', player_name, text, flags=re.IGNORECASE)
+
+    norm_map = {}
+    for name in characters:
+        norm = re.sub(r'[^a-z0-9]', '_', name.lower())
+        norm_map[norm] = name
+
+    def repl(match):
+        key = match.group(1)
+        norm = re.sub(r'[^a-z0-9]', '_', key.lower())
+        if norm in norm_map:
+            return f"<{norm_map[norm]}>"
+        return match.group(0)
+
+    text = re.sub(r'\[([^\]]+)\]', repl, text)
+    return text.replace(player_name, f"<{player_name}>")
+
+
+def resolve_dialogue(line, player_name, characters):
+    """
+    Caminho de uma linha até a tela na versão original (Renderer.display_scene e
+    TextProcessor.render_dialogue_with_effects)
+
+    Returns:
+        Tupla (falante, linhas do @jump_text, segmentos, texto exibido por completo)
+    """
+    replaced_line = replace_placeholders(line, player_name, characters)
+    speaker_name = None
+    m = re.match(r"^\{([^}=:]+)\}\s*:\s*(.*)$", replaced_line)
+    if m:
+        token = m.group(1)
+        if token.lower() in ('nome_jogador', 'nome_player', 'player_name'):
+            speaker_name = player_name
+        else:
+            norm = re.sub(r'[^a-z0-9]', '_', token.lower())
+            norm_map = {re.sub(r'[^a-z0-9]', '_', name.lower()): name for name in characters}
+            speaker_name = norm_map.get(norm)
+        replaced_line = m.group(2)
+
+    blank_lines, clean_text = parse_jump_text(replaced_line)
+    segments = parse_tex_time(clean_text)
+    if any(segment[0] == 'slow' for segment in segments):
+        shown = ''.join(segment[1] for segment in segments)
+    else:
+        shown = clean_text
+    return speaker_name, blank_lines, segments, shown
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Raiz do projeto no sys.path para importar Game (como em tools/)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
@@ -0,0 +1,144 @@
+"""
+Equivalência dos predicados compilados do ConditionEvaluator com o avaliador original
+(_check_condition): todas as formas de operador, operandos inválidos, personagens e campos
+inexistentes
+"""
+
+import copy
+import itertools
+
+import pytest
+
+from Game.system.condition_evaluator import ConditionEvaluator
+from Game.system.script_compiler import compile_condition, compile_scene
+
+from baseline_conditions import BaselineConditionEvaluator
+
+# Valores atuais (None = campo ausente)
+CURRENT_VALUES = [None, 0, 5, -5, 5.5, 10, True, False, '5', '5.0', ' Alto ', 'alto', 'abc', '', '3-7', [1, 2], {'a': 1}]
+
+# Valores esperados: cada operador, faixas, texto, números e operandos inválidos
+EXPECTED_VALUES = [
+    '<=5', '>=5', '<5', '>5', '<= 5', '>=-5', '<5.5', '>0',
+    '>abc', '<', '>=', '<=x', '>1-2',
+    '1-5', '5-10', '0-0', '10-5', '1.5-6', '1-', '1-2-3', '3-abc', 'abc-1', '-5', '-',
+    'alto', 'ALTO', ' alto ', '5', '5.0', '', 'True',
+    5, 5.0, 0, -5, 5.5, True, False,
+    None, [1, 2], {'a': 1},
+]
+
+MEMBERSHIP_VALUES = ['visto', '!visto', 'nunca', '!nunca', 'VISTO', '!', '']
+
+
+def make_state(current):
+    """Personagens e dados do jogador com `current` no campo 'valor' (ausente se None)"""
+    yuno = {'nome': 'Yuno', 'afeto': 5, 'humor_base': 'alto'}
+    player = {'nome': 'Thiago', 'forca': 15, 'flags': ['visto', 'porta'], 'memorias': ['visto']}
+    if current is not None:
+        yuno['valor'] = current
+        player['valor'] = current
+    return {'Yuno': yuno, 'Mestre Yuno': {'nome': 'Mestre Yuno', 'forca': 3}}, player
+
+
+def both_results(condition, current=None):
+    characters, player = make_state(current)
+    baseline = BaselineConditionEvaluator(copy.deepcopy(characters), copy.deepcopy(player))
+    evaluator = ConditionEvaluator(characters, player)
+    expected = baseline._evaluate_condition(condition)
+    compiled = evaluator.predicate(compile_condition(condition))()
+    uncompiled = evaluator.condition_predicate(condition)()
+    return expected, compiled, uncompiled
+
+
+@pytest.mark.parametrize('field', ['yuno_valor', 'YUNO_valor', 'valor'])
+@pytest.mark.parametrize('current, expected', list(itertools.product(CURRENT_VALUES, EXPECTED_VALUES)),
+                         ids=repr)
+def test_field_comparison_matches_check_condition(field, current, expected, capsys):
+    reference, compiled, uncompiled = both_results({field: expected}, current)
+    assert compiled == reference
+    assert uncompiled == reference
+
+
+@pytest.mark.parametrize('field', ['flag', 'FLAG', 'memoria', 'Memoria'])
+@pytest.mark.parametrize('value', MEMBERSHIP_VALUES)
+def test_membership_matches_check_condition(field, value, capsys):
+    reference, compiled, uncompiled = both_results({field: value})
+    assert compiled == reference
+    assert uncompiled == reference
+
+
+@pytest.mark.parametrize('condition', [
+    {'ninguem_afeto': 5},  # Personagem inexistente
+    {'ninguem_afeto': '>=0'},
+    {'yuno_inexistente': 5},  # Campo inexistente
+    {'yuno_inexistente': '!x'},
+    {'inexistente': 0},  # Campo do jogador inexistente
+    {'yuno_humor_base': 'ALTO'},  # Atributo com '_' depois do nome do personagem
+    {'mestre_yuno_forca': 3},  # Só a primeira parte é o personagem: 'mestre' não existe
+    {'forca': '>=15', 'yuno_afeto': '1-5', 'flag': 'visto', 'memoria': '!porta'},
+    {'forca': '>=15', 'yuno_afeto': '6-10'},
+    {'dev': 'só comentário', 'proximo_id': '7', 'texto': 'x', 'cena': 'y'},  # Sem verificações
+    {},
+])
+def test_condition_edge_cases_match_check_condition(condition, capsys):
+    reference, compiled, uncompiled = both_results(condition)
+    assert compiled == reference
+    assert uncompiled == reference
+
+
+def test_scene_conditions_and_options_match(capsys):
+    scene = {
+        'id': '1',
+        'condicao': [
+            {'yuno_afeto': '>10', 'proximo_id': 'a'},
+            {'flag': '!visto', 'proximo_id': 'b'},
+            {'yuno_afeto': '1-5', 'forca': 15, 'proximo_id': 'c'},
+            {'proximo_id': 'd'},
+        ],
+        'opcoes': [
+            {'texto': 'sem condição'},
+            {'texto': 'afeto alto', 'condicao': {'yuno_afeto': '>=6'}},
+            {'texto': 'viu', 'condicao': {'flag': 'visto'}},
+            {'texto': 'inválida', 'condicao': 'x'},
+            {'texto': 'ninguém', 'condicao': {'ninguem_x': 1}},
+        ],
+    }
+    characters, player = make_state(None)
+    baseline = BaselineConditionEvaluator(copy.deepcopy(characters), copy.deepcopy(player))
+    evaluator = ConditionEvaluator(characters, player)
+
+    for candidate in (copy.deepcopy(scene), compile_scene(copy.deepcopy(scene))):
+        assert evaluator.evaluate_scene_conditions(candidate) == baseline.evaluate_scene_conditions(scene) == 'c'
+        assert evaluator.filter_options_by_conditions(candidate['opcoes'], scene=candidate) == \
+            baseline.filter_options_by_conditions(scene['opcoes'])
+
+
+def test_invalid_scene_condition_fails_like_before(capsys):
+    # Item de 'condicao' que não é dicionário: a versão original também falhava
+    scene = {'id': '1', 'condicao': [{'flag': '!visto', 'proximo_id': 'b'}, 'inválida']}
+    characters, player = make_state(None)
+    baseline = BaselineConditionEvaluator(copy.deepcopy(characters), copy.deepcopy(player))
+    evaluator = ConditionEvaluator(characters, player)
+
+    with pytest.raises(AttributeError):
+        baseline.evaluate_scene_conditions(scene)
+    for candidate in (copy.deepcopy(scene), compile_scene(copy.deepcopy(scene))):
+        with pytest.raises(AttributeError):
+            evaluator.evaluate_scene_conditions(candidate)
+
+
+def test_predicates_follow_state_changes(capsys):
+    characters, player = make_state(None)
+    evaluator = ConditionEvaluator(characters, player)
+    needs_flag = evaluator.condition_predicate({'flag': 'nova', 'yuno_afeto': '>=7'})
+    assert not needs_flag()
+
+    evaluator.player_data.add_flag('nova')
+    characters['Yuno'] = dict(characters['Yuno'], afeto=7)  # StatusManager troca o dicionário
+    assert needs_flag()
+
+    # Personagem que só aparece depois de o predicado ser montado
+    late = evaluator.condition_predicate({'rei_forca': '>1'})
+    assert not late()
+    characters['Rei'] = {'nome': 'Rei', 'forca': 9}
+    assert late()
@@ -0,0 +1,141 @@
+"""Cache em disco do ScriptCompiler: ida e volta pelo JSON e descarte de caches velhos ou corrompidos"""
+
+import glob
+import json
+import os
+import shutil
+
+import pytest
+
+from Game.system import script_compiler
+from Game.system.script_compiler import CACHE_VERSION, ScriptCompiler, compile_scene
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_FILES = sorted(glob.glob(os.path.join(PROJECT_ROOT, 'Game', 'data', 'script', 'Cap', '*', '**', '*.json'),
+                             recursive=True))
+
+
+def same_structure(a, b) -> bool:
+    """Igualdade que também exige os mesmos tipos (tupla != lista, NamedTuple != tupla)"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same_structure(a[key], b[key]) for key in a)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(same_structure(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+@pytest.fixture
+def script(tmp_path):
+    """Cópia de EP_1.json em um diretório temporário, com o compilador usando outro diretório de cache"""
+    path = tmp_path / 'EP_1.json'
+    shutil.copy(os.path.join(PROJECT_ROOT, 'Game', 'data', 'script', 'Cap', 'Cap_1', 'EP_1.json'), path)
+    return str(path), ScriptCompiler(str(tmp_path / 'cache'))
+
+
+def compile_fresh(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    return {key: [compile_scene(scene) for scene in scenes]
+            for key, scenes in document.items() if isinstance(scenes, list)}
+
+
+@pytest.mark.parametrize('path', SCRIPT_FILES, ids=os.path.basename)
+def test_cache_round_trip_keeps_types(path, tmp_path):
+    compiler = ScriptCompiler(str(tmp_path))
+    first = compiler.load(path)
+    cached = compiler.load(path)
+    assert same_structure(first, compile_fresh(path))
+    assert same_structure(cached, first)
+
+
+def test_cache_file_is_json(script):
+    path, compiler = script
+    compiler.load(path)
+    with open(compiler._cache_path(path), 'r', encoding='utf-8') as f:
+        assert json.load(f)['version'] == CACHE_VERSION
+
+
+def test_editing_source_invalidates_cache(script):
+    path, compiler = script
+    compiler.load(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    key = next(iter(document))
+    document[key][0]['texto'][0] = 'Linha editada depois da compilação'
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False)
+
+    scene = compiler.load(path)[key][0]
+    assert scene['_compiled'].lines[0].text == 'Linha editada depois da compilação'
+    assert same_structure(compiler.load(path), compile_fresh(path))
+
+
+def test_same_size_edit_is_recompiled(script):
+    path, compiler = script
+    compiler.load(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    title = next(iter(json.loads(text).values()))[0]['titulo']
+    new_title = title[::-1] if title[::-1] != title else title.upper()
+    edited = text.replace(f'"{title}"', f'"{new_title}"', 1)
+    assert len(edited) == len(text) and edited != text
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(edited)
+
+    scenes = next(iter(compiler.load(path).values()))
+    assert scenes[0]['titulo'] == new_title
+
+
+def test_touched_source_reuses_compiled_data(script, capsys):
+    path, compiler = script
+    compiler.load(path)
+    capsys.readouterr()
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert same_structure(compiler.load(path), compile_fresh(path))
+    assert 'Compilado' not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('content', [
+    '',
+    '{"version": 6',
+    '[1, 2, 3]',
+    '{"version": %d}' % CACHE_VERSION,
+    '{"version": %d, "source_mtime_ns": 0, "source_size": 0, "source_sha1": "", '
+    '"data": {"EP_1": [{"id": "x", "_compiled": {"__type__": "os.system", "fields": ["echo"]}}]}}' % CACHE_VERSION,
+    '{"version": %d, "source_mtime_ns": 0, "source_size": 0, "source_sha1": "", '
+    '"data": {"EP_1": [{"id": "x", "_compiled": {"__type__": "CompiledScene", "fields": [1]}}]}}' % CACHE_VERSION,
+    '\x80\x04\x95 não é JSON',
+])
+def test_corrupted_cache_is_rejected(script, content, capsys):
+    path, compiler = script
+    cache_path = compiler._cache_path(path)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    assert compiler._read_cache(cache_path) is None
+    assert same_structure(compiler.load(path), compile_fresh(path))
+
+
+def test_other_version_is_rejected(script, monkeypatch):
+    path, compiler = script
+    compiler.load(path)
+    monkeypatch.setattr(script_compiler, 'CACHE_VERSION', CACHE_VERSION + 1)
+    assert compiler._read_cache(compiler._cache_path(path)) is None
+
+
+def test_script_dict_with_reserved_key_is_not_cached(script):
+    path, compiler = script
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    next(iter(document.values()))[0]['extra'] = {'__tuple__': [1, 2]}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f)
+
+    scenes = next(iter(compiler.load(path).values()))
+    assert scenes[0]['extra'] == {'__tuple__': [1, 2]}
+    assert not os.path.exists(compiler._cache_path(path))
@@ -0,0 +1,175 @@
+"""
+Equivalência do script_lexer com os parsers por regex que ele substituiu: as linhas reais dos
+roteiros e casos de borda passam pelos dois caminhos e devem gerar as mesmas ações de sprite e
+o mesmo texto exibido
+"""
+
+import glob
+import json
+import os
+
+import pytest
+
+from Game.system.script_compiler import compile_line
+from Game.system.script_lexer import lex_line
+from Game.system.text_processor import TextProcessor
+
+import baseline_parsers as baseline
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLAYER_NAME = 'Thiago'
+
+
+def load_characters():
+    characters = {}
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, 'Game', 'data', 'script', 'Base', '**', '*.json'),
+                                 recursive=True)):
+        if os.sep + 'config' + os.sep in path:
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        characters[data['nome']] = dict(data, color=tuple(map(int, data['cor'].split(','))))
+    return characters
+
+
+def script_lines():
+    lines = []
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, 'Game', 'data', 'script', 'Cap', '**', '*.json'),
+                                 recursive=True)):
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        for scenes in document.values():
+            if isinstance(scenes, list):
+                for scene in scenes:
+                    lines.extend(line for line in scene.get('texto', []) if line not in lines)
+    return lines
+
+
+CHARACTERS = load_characters()
+SCRIPT_LINES = script_lines()
+
+# Linhas escritas para cobrir cada comando e os casos de borda em que os dois parsers ainda concordam
+EDGE_LINES = [
+    '',
+    '   ',
+    'Texto sem comandos.',
+    '{sprite:Yuno:left}',
+    '{sprite:Yuno:center:happy} Olá!',
+    '{sprite: Yuno : right : sad }',
+    '{sprite_clear:left}{sprite_clear:all}',
+    '{expr:left:angry} Hmph.',
+    '{img_esquerda:Yuno}',
+    '{img_esquerda:}',
+    '{img_clear}',
+    '{img_clear} texto {img_clear}',
+    '{expr:left:sad}{sprite:Yuno:left}{img_esquerda:Rei}{sprite_clear:right}',
+    '{sprite:Yuno:left}{sprite:Rei:right}{sprite_clear:left}{sprite:Humanos:left}',
+    '{Yuno}: Olá, [nome_jogador]!',
+    '{nome_player}: Eu sou [NOME_JOGADOR].',
+    '{yuno}:sem espaço',
+    '{Desconhecido}: fala de alguém sem ficha',
+    '{Yuno} sem dois pontos',
+    '[Yuno] e [semi humana] e [Casa_shedow] e [ninguém]',
+    'Thiago fala o próprio nome',
+    '@jump_text[2]',
+    '  @jump_text[3]  ',
+    'Antes @jump_text[1] depois',
+    '@tex_time[3: devagar]',
+    'Normal @tex_time[2.5: lento] normal',
+    '@tex_time[1: um] @tex_time[4: dois]',
+    '@tex_time[2:   ]fim',
+    '{Yuno}: @tex_time[2: ola [nome_jogador]] fim',
+    '{Yuno}: **negrito** e <marcado>',
+    'Chaves {soltas e [colchetes',
+    '{} [] {:} [:]',
+    '@tex_time[x: inválido]',
+    '@jump_text[dois]',
+    '@outro[1] e email@exemplo.com',
+]
+
+
+def new_sprite_actions(line):
+    return list(compile_line(line).commands)
+
+
+def new_dialogue(line):
+    compiled = compile_line(line)
+    resolved = TextProcessor().resolve_dialogue(compiled, PLAYER_NAME, CHARACTERS)
+    segments = [tuple(segment) for segment in resolved.segments]
+    if any(segment[0] == 'slow' for segment in segments):
+        shown = ''.join(segment[1] for segment in segments)
+    else:
+        shown = resolved.text
+    return resolved.speaker, resolved.jump_lines, segments, shown
+
+
+def test_script_has_lines():
+    assert len(SCRIPT_LINES) > 100
+
+
+@pytest.mark.parametrize('line', SCRIPT_LINES + EDGE_LINES)
+def test_same_sprite_actions(line):
+    assert new_sprite_actions(line) == baseline.parse_sprite_command(line)
+
+
+@pytest.mark.parametrize('line', SCRIPT_LINES + EDGE_LINES)
+def test_same_line_kind(line):
+    compiled = compile_line(line)
+    assert compiled.command_only == baseline.is_command_only(line)
+    assert compiled.jump_only == baseline.is_jump_only(line)
+    assert compiled.has_tex_time == ('@tex_time[' in line)
+
+
+@pytest.mark.parametrize('line', SCRIPT_LINES + EDGE_LINES)
+def test_same_displayed_text(line):
+    assert new_dialogue(line) == baseline.resolve_dialogue(line, PLAYER_NAME, CHARACTERS)
+
+
+@pytest.mark.parametrize('line', SCRIPT_LINES + EDGE_LINES)
+def test_same_placeholders(line):
+    processor = TextProcessor()
+    assert processor.replace_placeholders(line, PLAYER_NAME, CHARACTERS) == \
+        baseline.replace_placeholders(line, PLAYER_NAME, CHARACTERS)
+
+
+# Casos em que o lexer diverge de propósito das regex (resultado esperado escrito à mão)
+@pytest.mark.parametrize('line, actions', [
+    # {img_clear} repetido gera uma única limpeza, como o antigo "'{img_clear}' in text"
+    ('{img_clear}{img_clear}{img_clear}', [('clear_all', {})]),
+    # '{' sem '}' é texto; o comando seguinte ainda vale (a regex também o achava)
+    ('{sprite:Yuno:left {sprite:Rei:right}', [('add', {'character': 'Rei', 'position': 'right', 'expression': ''})]),
+    # Argumentos a mais: inválido para os dois
+    ('{sprite:Yuno:left:happy:extra}', []),
+])
+def test_sprite_action_edge_cases(line, actions):
+    assert new_sprite_actions(line) == actions
+
+
+@pytest.mark.parametrize('line, errors', [
+    ('Chaves {soltas', ["'{' sem '}'"]),
+    ('@tex_time[2: sem fim', ["@tex_time[ sem ']'"]),
+    ('@tex_time[x: inválido]', ['@tex_time: esperado @tex_time[N: texto]']),
+    ('{sprite:Yuno}', ['{sprite}: esperado {sprite:nome:posição} ou {sprite:nome:posição:expressão}']),
+    ('{Yuno}: tudo certo', []),
+])
+def test_syntax_errors_are_reported(line, errors):
+    assert [error.message for error in lex_line(line).errors] == errors
+
+
+def test_innermost_brace_rule():
+    # A regex '\{[^}]+\}' engolia '{a{sprite:Yuno:left}' inteiro; no lexer só o comando interno
+    # é comando e '{a' fica visível, então a linha não é pulada como "só comandos"
+    compiled = compile_line('{a{sprite:Yuno:left}')
+    assert compiled.commands == (('add', {'character': 'Yuno', 'position': 'left', 'expression': ''}),)
+    assert not compiled.command_only
+    # Mesmo critério para marcações: '[a[Yuno]' troca só a marcação interna
+    assert TextProcessor().replace_placeholders('[a[Yuno]', PLAYER_NAME, CHARACTERS) == '[a<Yuno>'
+
+
+def test_placeholder_inside_slow_text_is_resolved():
+    # A regex de @tex_time parava no primeiro ']'; só funcionava porque [nome_jogador] era trocado
+    # antes. Uma marcação sem personagem ([ninguém]) quebrava o efeito; o lexer a mantém como texto.
+    speaker, _, segments, shown = new_dialogue('{Yuno}: @tex_time[2: oi [ninguém], [Yuno]] fim')
+    assert speaker == 'Yuno'
+    assert segments == [('slow', 'oi [ninguém], <Yuno>', 2.0), ('normal', ' fim', 0)]
+    assert shown == 'oi [ninguém], <Yuno> fim'
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Pré-escala as imagens do jogo em arquivos de pixels crus, carregados sem decodificar PNG.
+
+Uso:
+  python tools/bake_assets.py [--res 1920x1080] [--res 1280x720] [--images DIR] [--out DIR]
+
+Backgrounds são gerados no modo 'fit' usado pelo BackgroundManager e sprites
+(arquivos em NPC/) nas duas classes de tamanho usadas pelo SpriteManager
+('center' e 'side'). A saída vai para Game/data/baked/<LxA>/ junto com um
+manifest.json lido por Game.system.baked_assets.BakedAssetStore. Execuções
+seguintes (ex: outra --res) são somadas ao manifesto existente; arquivos .raw
+que não estão mais no manifesto são apagados. Variantes cujo PNG de origem
+mudou depois de geradas são ignoradas pelo jogo, que volta ao arquivo original.
+
+Código de retorno 0 em caso de sucesso, 1 se alguma imagem falhar.
+"""
+import argparse
+import json
+import os
+import sys
+
+# Add the project root to sys.path so we can import Game
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame  # noqa: E402
+
+from Game.system.background_manager import BackgroundManager  # noqa: E402
+from Game.system.baked_assets import BAKED_DIR, MANIFEST_NAME, MANIFEST_VERSION, make_key  # noqa: E402
+from Game.system.sprite_manager import Sprite  # noqa: E402
+
+IMAGES_DIR = os.path.join('Game', 'data', 'script', 'imgs')
+SPRITE_DIR = 'NPC'
+DEFAULT_RESOLUTIONS = ['800x600', '1280x720', '1920x1080']
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def parse_resolution(value: str):
+    try:
+        width, height = value.lower().split('x')
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"resolução inválida '{value}' (esperado LxA)")
+
+
+def iter_images(images_dir: str):
+    for root, _dirs, files in os.walk(images_dir):
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def is_sprite(path: str, images_dir: str) -> bool:
+    rel = os.path.relpath(path, images_dir)
+    return rel.split(os.sep)[0] == SPRITE_DIR
+
+
+def bake_image(path: str, sprite: bool, resolutions, out_dir: str, entries: dict) -> int:
+    """Gera todas as variantes de uma imagem; retorna a quantidade de arquivos escritos."""
+    source = pygame.image.load(path)
+    stat = os.stat(path)
+    rel_name = os.path.splitext(os.path.relpath(path, project_root))[0].replace(os.sep, '_')
+    written = 0
+
+    for width, height in resolutions:
+        if sprite:
+            variants = [
+                (size_class, pygame.transform.scale(
+                    source, Sprite.compute_scaled_size(source.get_size(), size_class, width, height)),
+                 (0, 0), 'RGBA')
+                for size_class in ('center', 'side')
+            ]
+        else:
+            new_size, position = BackgroundManager.compute_fit_size(source.get_size(), (width, height))
+            variants = [('fit', pygame.transform.scale(source, new_size), position, 'RGB')]
+
+        res_dir = f"{width}x{height}"
+        os.makedirs(os.path.join(out_dir, res_dir), exist_ok=True)
+        for variant, scaled, position, fmt in variants:
+            file_name = f"{res_dir}/{rel_name}.{variant}.raw"
+            with open(os.path.join(out_dir, file_name), 'wb') as f:
+                f.write(pygame.image.tobytes(scaled, fmt))
+            entries[make_key(os.path.relpath(path, project_root), variant, (width, height))] = {
+                'file': file_name,
+                'size': list(scaled.get_size()),
+                'format': fmt,
+                'position': list(position),
+                'source_mtime_ns': stat.st_mtime_ns,
+                'source_size': stat.st_size,
+            }
+            written += 1
+    return written
+
+
+def load_entries(out_dir: str) -> dict:
+    """Entradas do manifesto já existente em out_dir (vazio se não existir, for inválido ou de outra versão)."""
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[AVISO] Manifesto ignorado ({e}): {manifest_path}")
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('entries', {})
+
+
+def prune(out_dir: str, entries: dict) -> int:
+    """
+    Remove do manifesto as variantes cuja imagem de origem não existe mais e apaga
+    os arquivos .raw que nenhuma entrada referencia; retorna a quantidade de arquivos apagados.
+    """
+    for key in [key for key in entries if not os.path.exists(key.split('|', 1)[0])]:
+        del entries[key]
+
+    listed = {os.path.normpath(entry['file']) for entry in entries.values()}
+    removed = 0
+    for root, _dirs, files in os.walk(out_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith('.raw') and os.path.normpath(os.path.relpath(path, out_dir)) not in listed:
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pré-escala as imagens do jogo para carregamento rápido")
+    parser.add_argument('--res', action='append', type=parse_resolution,
+                        help="resolução alvo LxA (pode repetir, padrão: %s)" % ', '.join(DEFAULT_RESOLUTIONS))
+    parser.add_argument('--images', default=os.path.join(project_root, IMAGES_DIR),
+                        help="diretório das imagens de origem")
+    parser.add_argument('--out', default=os.path.join(project_root, BAKED_DIR), help="diretório de saída")
+    args = parser.parse_args(argv)
+    resolutions = args.res or [parse_resolution(r) for r in DEFAULT_RESOLUTIONS]
+
+    # Caminhos passados pelo usuário são relativos ao diretório atual (resolvidos antes do chdir)
+    images_dir = os.path.abspath(args.images)
+    out_dir = os.path.abspath(args.out)
+
+    # Caminhos no manifesto são relativos à raiz do projeto, como o jogo os usa
+    os.chdir(project_root)
+    if not os.path.isdir(images_dir):
+        print(f"[ERRO] Diretório de imagens não encontrado: {images_dir}")
+        return 1
+
+    pygame.init()
+    entries = load_entries(out_dir)
+    failures = 0
+    written = 0
+    for path in iter_images(images_dir):
+        try:
+            written += bake_image(path, is_sprite(path, images_dir), resolutions, out_dir, entries)
+            print(f"[OK] {path}")
+        except Exception as e:
+            failures += 1
+            print(f"[ERRO] {path}: {e}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    removed = prune(out_dir, entries)
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'entries': entries}, f, indent=2, ensure_ascii=False)
+    print(f"{written} variantes escritas em {out_dir}, {removed} órfãs apagadas ({failures} falhas)")
+    pygame.quit()
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
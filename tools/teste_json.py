@@ -73,7 +73,7 @@ class JsonValidator:
         
         # Tenta avaliar a condição com o sistema real
         try:
-            result = self.evaluator._evaluate_condition(cond)
+            result = self.evaluator.condition_predicate(cond)()
         except Exception as e:
             print(f"[{tipo} {scene_id}] [ERRO] Falha ao avaliar condição: {cond}")
             print("         ", e)